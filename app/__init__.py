@@ -1,14 +1,70 @@
-from .logic import gauss_jordan
-from .logic import resolver_cramer
-from .logic import gauss_jordan_pasos
-from .logic import comprobar_independencia_lineal
-from .logic import eliminacion_gaussiana
-from .logic import matriz_triangular, calcular_determinante
-from .logic import traspuesta
-from .logic import biseccion
-from .logic import falsa_posicion
-from .logic import operar_matrices
-from .web_utils import matriz_desde_formulario
-from .web_utils import generate_preview_plot_for_function
-from .web_utils import generar_grafico_por_defecto
-from .logic import newton_raphson
+"""
+Reexporta la lógica y las utilidades web; cada nombre se importa al primer acceso (ver
+app/logic/__init__.py) para que arrancar la aplicación no cargue SymPy, NumPy ni matplotlib.
+"""
+from importlib import import_module
+
+_EXPORTACIONES = {
+    'gauss_jordan': '.logic',
+    'resolver_cramer': '.logic',
+    'gauss_jordan_pasos': '.logic',
+    'comprobar_independencia_lineal': '.logic',
+    'eliminacion_gaussiana': '.logic',
+    'matriz_triangular': '.logic',
+    'calcular_determinante': '.logic',
+    'traspuesta': '.logic',
+    'biseccion': '.logic',
+    'brent': '.logic',
+    'falsa_posicion': '.logic',
+    'operar_matrices': '.logic',
+    'factorizar_lu': '.logic',
+    'estadisticas_cache_factorizaciones': '.logic',
+    'newton_raphson': '.logic',  # submódulo, como el antiguo `from .logic import newton_raphson`
+    'matriz_desde_formulario': '.web_utils',
+    'matriz_desde_texto': '.web_utils',
+    'generate_preview_plot_for_function': '.web_utils',
+    'etag_vista_previa': '.web_utils',
+    'MuestreoFuncion': '.web_utils',
+    'VENTANA_DETECCION': '.web_utils',
+    'MUESTRAS_DETECCION': '.web_utils',
+    'paginar_pasos': '.web_utils',
+    'pagina_pasos': '.web_utils',
+    'PASOS_POR_PAGINA': '.web_utils',
+}
+
+# módulos con dependencias pesadas, para precargarlos fuera del camino de la primera petición
+MODULOS_PESADOS = (
+    'app.logic.todas_las_raices',
+    'app.logic.cache_sympy',
+    'app.logic.newton_raphson',
+    'app.logic.evaluacion_vectorizada',
+    'matplotlib.pyplot',
+)
+
+__all__ = list(_EXPORTACIONES) + ['precargar_dependencias']
+
+
+def __getattr__(nombre):
+    modulo = _EXPORTACIONES.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    paquete = import_module(modulo, __name__)
+    try:
+        valor = getattr(paquete, nombre)
+    except AttributeError:
+        valor = import_module(f"{modulo}.{nombre}", __name__)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def precargar_dependencias():
+    """Importa los módulos pesados; pensado para ejecutarse en un hilo tras arrancar el servidor."""
+    for modulo in MODULOS_PESADOS:
+        if modulo == 'matplotlib.pyplot':
+            import matplotlib
+            matplotlib.use('Agg')
+        import_module(modulo)
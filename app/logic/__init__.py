@@ -1,10 +1,40 @@
-from .gauss_jordan import gauss_jordan
-from .cramer import resolver_cramer
-from .matriz_inversa import gauss_jordan_pasos
-from .independencia_lineal import comprobar_independencia_lineal
-from .eliminacion_gaussiana import eliminacion_gaussiana
-from .traspuesta import traspuesta
-from .determinante import calcular_determinante, matriz_triangular
-from .biseccion import biseccion
-from .falsa_posicion import falsa_posicion
-from .operaciones_matrices import operar_matrices
\ No newline at end of file
+"""
+Los módulos de lógica se importan al primer acceso (PEP 562): algunos arrastran dependencias
+pesadas (NumPy, SymPy) y las páginas que no las usan no deben pagar su importación.
+"""
+from importlib import import_module
+
+# nombre exportado -> submódulo que lo define
+_EXPORTACIONES = {
+    'gauss_jordan': '.gauss_jordan',
+    'resolver_cramer': '.cramer',
+    'gauss_jordan_pasos': '.matriz_inversa',
+    'comprobar_independencia_lineal': '.independencia_lineal',
+    'eliminacion_gaussiana': '.eliminacion_gaussiana',
+    'traspuesta': '.traspuesta',
+    'calcular_determinante': '.determinante',
+    'matriz_triangular': '.determinante',
+    'biseccion': '.biseccion',
+    'brent': '.brent',
+    'falsa_posicion': '.falsa_posicion',
+    'operar_matrices': '.operaciones_matrices',
+    'factorizar_lu': '.factorizacion_lu',
+    'obtener_factorizacion': '.cache_factorizaciones',
+    'estadisticas_cache_factorizaciones': '.cache_factorizaciones',
+    'NIVELES_DETALLE': '.registro_pasos',
+}
+
+__all__ = list(_EXPORTACIONES)
+
+
+def __getattr__(nombre):
+    modulo = _EXPORTACIONES.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,99 @@
+import math
+import sys
+from typing import Tuple
+from .utils import parse_input_number, compilar_funcion
+from .traza_iteraciones import TrazaIteraciones
+
+
+def brent(funcion: str, intervalo: Tuple[str, str], error: float = 0.0001, max_iter: int = 100):
+    """
+    Parametros: funcion: str, intervalo: tuple[str, str], error: float
+    Devuelve la aproximacion de la raiz usando el metodo de Brent (Brent-Dekker)
+    con la funcion dada en el intervalo dado hasta el error dado
+    0.0001 por defecto
+
+    En cada iteración intenta interpolación cuadrática inversa o secante y, si el paso
+    no es aceptable, cae a bisección; así converge de forma superlineal sin perder la
+    garantía de la bisección (la raíz siempre queda encerrada en [a, b]).
+    Retorna: (raiz, traza (TrazaIteraciones), iteraciones)
+    """
+    f = compilar_funcion(funcion)
+
+    pasos = TrazaIteraciones((("a", ".6f"), ("b", ".6f"), ("f(a)", ".6f"), ("f(b)", ".6f"), ("Paso", None)))
+    iteracion = 0
+    # Usar parse_input_number para convertir los extremos del intervalo
+    a = parse_input_number(intervalo[0])
+    b = parse_input_number(intervalo[1])
+    evaluacion_a = float(f(a))
+    evaluacion_b = float(f(b))
+    if evaluacion_a * evaluacion_b > 0:
+        raise ValueError("No es valido usar el metodo de Brent, ya que al evaluar la funcion en los extremos de los"
+                         " intervalos, los resultados deben tener distinto signo")
+
+    # c es el extremo opuesto a b (f(b) y f(c) con distinto signo); d y e guardan los dos pasos anteriores
+    c, evaluacion_c = a, evaluacion_a
+    d = e = b - a
+    while iteracion < max_iter:
+        if evaluacion_b * evaluacion_c > 0:
+            c, evaluacion_c = a, evaluacion_a
+            d = e = b - a
+        # b debe ser siempre la mejor aproximación
+        if abs(evaluacion_c) < abs(evaluacion_b):
+            a, b, c = b, c, b
+            evaluacion_a, evaluacion_b, evaluacion_c = evaluacion_b, evaluacion_c, evaluacion_b
+
+        tolerancia = 2.0 * sys.float_info.epsilon * abs(b) + 0.5 * error
+        m = 0.5 * (c - b)
+        if abs(m) <= tolerancia or evaluacion_b == 0 or abs(evaluacion_b) <= error:
+            break
+
+        tipo_paso = "Bisección"
+        if abs(e) >= tolerancia and abs(evaluacion_a) > abs(evaluacion_b):
+            s = evaluacion_b / evaluacion_a
+            if a == c:
+                # secante
+                p = 2.0 * m * s
+                q = 1.0 - s
+                tipo = "Secante"
+            else:
+                # interpolación cuadrática inversa
+                q = evaluacion_a / evaluacion_c
+                r = evaluacion_b / evaluacion_c
+                p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+                tipo = "Interpolación cuadrática inversa"
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            # aceptar la interpolación sólo si cae dentro del intervalo y reduce el paso lo suficiente
+            if 2.0 * p < min(3.0 * m * q - abs(tolerancia * q), abs(e * q)):
+                e = d
+                d = p / q
+                tipo_paso = tipo
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, evaluacion_a = b, evaluacion_b
+        if abs(d) > tolerancia:
+            b += d
+        else:
+            b += math.copysign(tolerancia, m)
+        evaluacion_b = float(f(b))
+        iteracion += 1
+        pasos.registrar(a, b, evaluacion_a, evaluacion_b, tipo_paso)
+
+    return b, pasos, iteracion
+
+
+if __name__ == "__main__":
+    funcion = "x^3 - x - 2"
+    intervalo = (1, 2)
+    raiz, traza, iteraciones = brent(funcion, intervalo)
+    print(f"Raíz aproximada: {raiz}")
+    print(f"Iteraciones: {iteraciones}")
+    print("Tabla de pasos:")
+    for fila in traza.filas_formateadas():
+        print(*fila, sep="\t")
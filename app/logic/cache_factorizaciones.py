@@ -0,0 +1,241 @@
+"""
+Cache de factorizaciones compartida por las rutas de álgebra lineal.
+
+La clave es un hash (sha256) de la matriz normalizada a racionales exactos, así que la misma
+matriz escrita como 0.5, 1/2 o Fraction(1, 2) cae en la misma entrada. La normalización debe
+ser la misma conversión que hace la función cacheada (ver `convertir` en cache_por_matriz):
+si no, dos entradas que dan resultados distintos compartirían clave. Cada entrada guarda lo
+que sirve a varias rutas a la vez (factorización LU, forma escalonada, columnas pivote, rango
+y determinante) y, además, el resultado completo (con pasos) de cada función ya ejecutada.
+Expulsión LRU por número de entradas y por tamaño aproximado en memoria.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from functools import wraps
+
+from .eliminacion import eliminar
+from .matriz_racional import MatrizRacional
+
+_MAX_ENTRADAS = 128
+_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _a_fraccion(x):
+    return x if isinstance(x, Fraction) else Fraction(str(x))
+
+
+def _normalizar(matriz, convertir=_a_fraccion):
+    return [[convertir(x) for x in fila] for fila in matriz]
+
+
+def clave_matriz(matriz) -> str:
+    """Hash canónico de la matriz racional normalizada (incluye sus dimensiones)."""
+    filas = _normalizar(matriz)
+    columnas = len(filas[0]) if filas else 0
+    texto = f"{len(filas)}x{columnas}:" + ";".join(
+        ",".join(f"{x.numerator}/{x.denominator}" for x in fila) for fila in filas)
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+def _tamano_aproximado(objeto, vistos=None) -> int:
+    """Estimación barata de la memoria usada por resultados; los objetos compartidos cuentan una vez."""
+    if vistos is None:
+        vistos = set()
+    if id(objeto) in vistos:
+        return 0
+    vistos.add(id(objeto))
+    if isinstance(objeto, Fraction):
+        return 64 + (objeto.numerator.bit_length() + objeto.denominator.bit_length()) // 8
+    if isinstance(objeto, (list, tuple)):
+        return sys.getsizeof(objeto) + sum(_tamano_aproximado(x, vistos) for x in objeto)
+    if isinstance(objeto, dict):
+        return sys.getsizeof(objeto) + sum(_tamano_aproximado(k, vistos) + _tamano_aproximado(v, vistos)
+                                           for k, v in objeto.items())
+    if hasattr(objeto, '__slots__'):
+        return sum(_tamano_aproximado(getattr(objeto, s, None), vistos) for s in objeto.__slots__)
+    return sys.getsizeof(objeto)
+
+
+def forma_escalonada(matriz):
+    """Forma escalonada por filas exacta. Devuelve (escalonada, columnas_pivote)."""
+    A = MatrizRacional.desde_filas(_normalizar(matriz))
+    columnas = len(matriz[0]) if matriz else 0
+    # sin observadores: no se registra ni se formatea ningún paso
+    columnas_pivote = eliminar(A, range(columnas), normalizar=False, reducida=False)
+    return A.a_fracciones(), columnas_pivote
+
+
+class EntradaFactorizacion:
+    """Datos exactos de una matriz; lo costoso se calcula al primer acceso y queda guardado."""
+    __slots__ = ('clave', 'matriz', '_lu', '_escalonada', '_columnas_pivote', '_determinante',
+                 'resultados', 'tamano')
+
+    def __init__(self, clave, matriz):
+        self.clave = clave
+        self.matriz = matriz
+        self._lu = None
+        self._escalonada = None
+        self._columnas_pivote = None
+        self._determinante = None
+        self.resultados = {}
+        self.tamano = _tamano_aproximado(matriz)
+
+    @property
+    def es_cuadrada(self):
+        return bool(self.matriz) and len(self.matriz) == len(self.matriz[0])
+
+    @property
+    def lu(self):
+        """Factorización PA = LU (sólo matrices cuadradas)."""
+        if self._lu is None:
+            from .factorizacion_lu import factorizar_lu
+            # pasa por la cache: el mismo objeto que devuelve factorizar_lu(A)
+            self._lu, _ = factorizar_lu(self.matriz)
+            _cache.actualizar_tamano(self)
+        return self._lu
+
+    @property
+    def escalonada(self):
+        if self._escalonada is None:
+            self._escalonada, self._columnas_pivote = forma_escalonada(self.matriz)
+            _cache.actualizar_tamano(self)
+        return self._escalonada
+
+    @property
+    def columnas_pivote(self):
+        if self._columnas_pivote is None:
+            self.escalonada
+        return self._columnas_pivote
+
+    @property
+    def rango(self):
+        return len(self.columnas_pivote)
+
+    @property
+    def determinante(self) -> Fraction:
+        if self._determinante is None:
+            if not self.es_cuadrada:
+                raise ValueError("La matriz debe ser cuadrada.")
+            self._determinante = self.lu.determinante()
+        return self._determinante
+
+    @determinante.setter
+    def determinante(self, valor):
+        self._determinante = Fraction(valor)
+
+    @property
+    def determinante_conocido(self):
+        return self._determinante is not None or self._lu is not None
+
+
+class CacheFactorizaciones:
+    """LRU de EntradaFactorizacion con límite de entradas y de bytes (aproximados)."""
+
+    def __init__(self, max_entradas=_MAX_ENTRADAS, max_bytes=_MAX_BYTES):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obtener(self, matriz, convertir=_a_fraccion) -> EntradaFactorizacion:
+        normalizada = _normalizar(matriz, convertir)
+        clave = clave_matriz(normalizada)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.hits += 1
+                return entrada
+            self.misses += 1
+            entrada = EntradaFactorizacion(clave, normalizada)
+            self._entradas[clave] = entrada
+            self._bytes += entrada.tamano
+            self._expulsar()
+            return entrada
+
+    def actualizar_tamano(self, entrada):
+        nuevo = _tamano_aproximado(entrada)
+        with self._lock:
+            if self._entradas.get(entrada.clave) is entrada:
+                self._bytes += nuevo - entrada.tamano
+            entrada.tamano = nuevo
+            self._expulsar(conservar=entrada.clave)
+
+    def _expulsar(self, conservar=None):
+        while self._entradas and (len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes):
+            clave, entrada = next(iter(self._entradas.items()))
+            if clave == conservar and len(self._entradas) == 1:
+                break
+            if clave == conservar:
+                self._entradas.move_to_end(clave)
+                continue
+            del self._entradas[clave]
+            self._bytes -= entrada.tamano
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entradas": len(self._entradas),
+                    "bytes": self._bytes, "max_entradas": self.max_entradas, "max_bytes": self.max_bytes}
+
+
+_cache = CacheFactorizaciones()
+
+
+def obtener_factorizacion(matriz) -> EntradaFactorizacion:
+    """Entrada de la cache para la matriz (se crea vacía si no existe)."""
+    return _cache.obtener(matriz)
+
+
+def estadisticas_cache_factorizaciones() -> dict:
+    return _cache.estadisticas()
+
+
+def _congelar(valor):
+    # argumentos extra de la función como parte hashable de la clave (listas -> tuplas de racionales)
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return Fraction(str(valor))
+    return valor
+
+
+def cache_por_matriz(nombre, al_calcular=None, convertir=_a_fraccion):
+    """
+    Decorador para funciones f(matriz, *args) deterministas: el resultado se guarda en la entrada
+    de `matriz` bajo (nombre, args). Los resultados cacheados se comparten: no deben modificarse.
+    Las excepciones no se cachean; si la matriz no se puede normalizar se calcula sin cache.
+    al_calcular(entrada, resultado) permite volcar en la entrada datos útiles para otras rutas.
+    convertir(x) -> Fraction: la conversión de elementos que usa la función (por defecto exacta,
+    Fraction(str(x))); la clave se calcula con ella.
+    """
+    def decorador(fn):
+        @wraps(fn)
+        def envoltura(matriz, *args, **kwargs):
+            try:
+                entrada = _cache.obtener(matriz, convertir)
+                clave = (nombre, _congelar(args), _congelar(tuple(sorted(kwargs.items()))))
+                hash(clave)
+            except (ValueError, TypeError, ZeroDivisionError, IndexError):
+                return fn(matriz, *args, **kwargs)
+            if clave in entrada.resultados:
+                return entrada.resultados[clave]
+            resultado = fn(matriz, *args, **kwargs)
+            entrada.resultados[clave] = resultado
+            if al_calcular is not None:
+                al_calcular(entrada, resultado)
+            _cache.actualizar_tamano(entrada)
+            return resultado
+        envoltura.sin_cache = fn
+        return envoltura
+    return decorador
@@ -0,0 +1,121 @@
+"""
+Cache de artefactos de SymPy (expresión parseada, derivadas y funciones lambdify) para los
+métodos que necesitan derivadas simbólicas.
+
+Nivel 1: LRU en memoria, clave = expresión ya transformada con `transformar_sintaxis`.
+Nivel 2 (opcional): SQLite en disco, activado con la variable de entorno ALGEBRAX_CACHE_SYMPY
+(ruta del archivo); guarda las expresiones con `srepr`, de modo que un reinicio del proceso no
+vuelve a pagar parse_expr + diff.
+"""
+import os
+import sqlite3
+from functools import lru_cache
+
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+_X = sp.symbols('x')
+# permitir que el usuario use 'e', 'pi' y 'ln' en la entrada (ej: e^x, ln(x))
+_LOCAL_DICT = {'e': sp.E, 'pi': sp.pi, 'ln': sp.log}
+
+_MAX_ARTEFACTOS = 128
+_VARIABLE_RUTA_DISCO = 'ALGEBRAX_CACHE_SYMPY'
+
+
+class ArtefactosSympy:
+    """Expresión y derivadas simbólicas de f; las funciones numéricas se generan al primer uso."""
+    __slots__ = ('expresion', 'derivada', 'segunda_derivada', '_f', '_df', '_d2f')
+
+    def __init__(self, expresion, derivada, segunda_derivada):
+        self.expresion = expresion
+        self.derivada = derivada
+        self.segunda_derivada = segunda_derivada
+        self._f = None
+        self._df = None
+        self._d2f = None
+
+    @property
+    def f(self):
+        if self._f is None:
+            self._f = sp.lambdify(_X, self.expresion, modules=["math"])
+        return self._f
+
+    @property
+    def df(self):
+        if self._df is None:
+            self._df = sp.lambdify(_X, self.derivada, modules=["math"])
+        return self._df
+
+    @property
+    def d2f(self):
+        if self._d2f is None:
+            self._d2f = sp.lambdify(_X, self.segunda_derivada, modules=["math"])
+        return self._d2f
+
+
+def _ruta_disco():
+    return os.environ.get(_VARIABLE_RUTA_DISCO) or None
+
+
+def _conectar(ruta):
+    con = sqlite3.connect(ruta, timeout=5)
+    con.execute("CREATE TABLE IF NOT EXISTS artefactos ("
+                "clave TEXT PRIMARY KEY, expresion TEXT, derivada TEXT, segunda_derivada TEXT)")
+    return con
+
+
+def _leer_disco(clave):
+    ruta = _ruta_disco()
+    if ruta is None:
+        return None
+    try:
+        con = _conectar(ruta)
+        try:
+            fila = con.execute("SELECT expresion, derivada, segunda_derivada FROM artefactos WHERE clave = ?",
+                               (clave,)).fetchone()
+        finally:
+            con.close()
+        if fila is None:
+            return None
+        return ArtefactosSympy(*(sp.sympify(texto) for texto in fila))
+    except Exception:
+        # la cache en disco es opcional: ante cualquier problema se recalcula
+        return None
+
+
+def _guardar_disco(clave, artefactos):
+    ruta = _ruta_disco()
+    if ruta is None:
+        return
+    try:
+        con = _conectar(ruta)
+        try:
+            with con:
+                con.execute("INSERT OR REPLACE INTO artefactos VALUES (?, ?, ?, ?)",
+                            (clave, sp.srepr(artefactos.expresion), sp.srepr(artefactos.derivada),
+                             sp.srepr(artefactos.segunda_derivada)))
+        finally:
+            con.close()
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=_MAX_ARTEFACTOS)
+def obtener_artefactos(expresion_transformada: str) -> ArtefactosSympy:
+    """
+    Devuelve los artefactos de SymPy para la expresión (ya transformada).
+    Lanza la excepción de SymPy si la expresión no se puede parsear.
+    """
+    artefactos = _leer_disco(expresion_transformada)
+    if artefactos is None:
+        expresion = parse_expr(expresion_transformada, local_dict=_LOCAL_DICT)
+        derivada = sp.diff(expresion, _X)
+        artefactos = ArtefactosSympy(expresion, derivada, sp.diff(derivada, _X))
+        _guardar_disco(expresion_transformada, artefactos)
+    return artefactos
+
+
+def estadisticas_cache_sympy() -> dict:
+    info = obtener_artefactos.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "maxsize": info.maxsize, "currsize": info.currsize,
+            "disco": _ruta_disco()}
@@ -1,6 +1,7 @@
-from .determinante import calcular_determinante, validar_matriz
+from .cache_factorizaciones import cache_por_matriz, obtener_factorizacion
 from fractions import Fraction
-from .utils import subindice, fraccion_str
+from .registro_pasos import validar_detalle
+from .utils import subindice, fraccion_str, validar_matriz
 
 def reemplazar_columnas(matriz, vector_independientes, columna):
     columna = columna - 1
@@ -11,30 +12,45 @@ def reemplazar_columnas(matriz, vector_independientes, columna):
     return sustituida
 
 
-def resolver_cramer(A, B):
+@cache_por_matriz('cramer')
+def resolver_cramer(A, B, con_pasos=True, detalle="completo"):
+    """
+    Regla de Cramer: xᵢ = det(Aᵢ) / det(A).
+    Se usa la factorización LU de A de la cache (la misma que usa /lu);
+    cada det(Aᵢ) = det(A)·xᵢ sale de esa misma resolución, y las matrices sustituidas sólo se
+    construyen con detalle="completo". detalle="resumen" deja sólo det(A) y una línea por
+    incógnita; "ninguno" (o con_pasos=False) no genera pasos.
+    Devuelve: (soluciones_str, det_A_str, determinantes_str, pasos)
+    """
+    validar_detalle(detalle)
+    if not con_pasos:
+        detalle = "ninguno"
     A_fraccion = [[Fraction(str(x)) for x in fila] for fila in A]
     B_fraccion = [Fraction(str(x)) for x in B]
     validar_matriz(A_fraccion)
     n = len(A_fraccion)
-    # Calcular determinante principal
-    determinante_A, _ = calcular_determinante(A_fraccion)
+    if any(len(fila) != n for fila in A_fraccion):
+        raise ValueError("La matriz debe ser cuadrada.")
+    if len(B_fraccion) != n:
+        raise ValueError("El vector de independientes debe tener una entrada por ecuación.")
+    entrada = obtener_factorizacion(A_fraccion)
+    determinante_A = entrada.determinante
     if determinante_A == 0:
         raise ValueError('El sistema no tiene solución única (determinante cero)')
-    determinantes_sustituidos = []
-    soluciones = []
+    soluciones = entrada.lu.resolver(B_fraccion)
+    determinantes_sustituidos = [determinante_A * x for x in soluciones]
     pasos = []
-    pasos.append((f"Determinante principal: Det(A) = {fraccion_str(determinante_A)}", None))
-    for i in range(1, n + 1):
-        matriz_sustituida = reemplazar_columnas(A_fraccion, B_fraccion, i)
-        validar_matriz(matriz_sustituida)
-        determinante_sustituida, _ = calcular_determinante(matriz_sustituida)
-        determinantes_sustituidos.append(determinante_sustituida)
-        solucion = determinante_sustituida / determinante_A
-        matriz_sustituida_str = [[fraccion_str(x) for x in fila] for fila in matriz_sustituida]
-        pasos.append((f"Reemplazamos la columna {i} de A por el vector de independientes B para calcular A{subindice(i)}:", matriz_sustituida_str))
-        pasos.append((f"Calculamos el determinante: Det(A{subindice(i)}) = {fraccion_str(determinante_sustituida)}", None))
-        pasos.append((f"Calculamos la solución: x{subindice(i)} = Det(A{subindice(i)}) / Det(A) = {fraccion_str(determinante_sustituida)} / {fraccion_str(determinante_A)} = {fraccion_str(solucion)}", None))
-        soluciones.append(solucion)
+    if detalle != "ninguno":
+        pasos.append((f"Determinante principal: Det(A) = {fraccion_str(determinante_A)}", None))
+        for i in range(1, n + 1):
+            determinante_sustituida = determinantes_sustituidos[i - 1]
+            solucion = soluciones[i - 1]
+            if detalle == "completo":
+                matriz_sustituida = reemplazar_columnas(A_fraccion, B_fraccion, i)
+                matriz_sustituida_str = [[fraccion_str(x) for x in fila] for fila in matriz_sustituida]
+                pasos.append((f"Reemplazamos la columna {i} de A por el vector de independientes B para calcular A{subindice(i)}:", matriz_sustituida_str))
+                pasos.append((f"Calculamos el determinante: Det(A{subindice(i)}) = {fraccion_str(determinante_sustituida)}", None))
+            pasos.append((f"Calculamos la solución: x{subindice(i)} = Det(A{subindice(i)}) / Det(A) = {fraccion_str(determinante_sustituida)} / {fraccion_str(determinante_A)} = {fraccion_str(solucion)}", None))
     soluciones_str = [fraccion_str(sol) for sol in soluciones]
     determinantes_str = [fraccion_str(det) for det in determinantes_sustituidos]
     return soluciones_str, fraccion_str(determinante_A), determinantes_str, pasos
@@ -1,13 +1,28 @@
+from app.logic.cache_factorizaciones import cache_por_matriz
+from app.logic.eliminacion import ObservadorEliminacion, eliminar, observadores_pasos
+from app.logic.matriz_racional import MatrizRacional
+from app.logic.registro_pasos import InstantaneasFilas, RegistroPasos, validar_detalle
 from app.logic.utils import matriz_a_str, subindice, validar_matriz, fraccion_str
 from fractions import Fraction
+import math
 
+METODOS_DETERMINANTE = ("auto", "bareiss", "gauss")
 
-def _eliminacion_con_pivoteo(matriz):
+
+class _ContadorIntercambios(ObservadorEliminacion):
+    def __init__(self):
+        self.total = 0
+
+    def intercambio(self, A, i, j):
+        self.total += 1
+
+
+def _eliminacion_con_pivoteo(matriz, detalle="completo"):
     """
     Realiza eliminación gaussiana con pivoteo parcial sobre una matriz cuadrada.
     Devuelve una tupla: (matriz_trabajo, pasos, swap_count, es_singular)
-    - matriz_trabajo: matriz triangular en Fraction
-    - pasos: lista de tuplas (descripcion, matriz_en_string)
+    - matriz_trabajo: matriz triangular (MatrizRacional)
+    - pasos: RegistroPasos (secuencia de tuplas (descripcion, matriz_en_string))
     - swap_count: número de intercambios de filas realizados
     - es_singular: True si se detectó singularidad (pivote 0 en columna)
     """
@@ -16,39 +31,118 @@ def _eliminacion_con_pivoteo(matriz):
     if any(len(fila) != n for fila in matriz):
         raise ValueError("La matriz debe ser cuadrada.")
 
-    trabajo = [[Fraction(str(elem)) for elem in fila] for fila in matriz]
-    pasos = [("Matriz original", matriz_a_str(trabajo))]
+    trabajo = MatrizRacional.desde_filas(matriz, lambda elem: Fraction(str(elem)))
+    registro = RegistroPasos()
+    if detalle != "ninguno":
+        registro.iniciar("Matriz original", trabajo.a_str())
+    # sin normalizar: el determinante es el producto de la diagonal (con el signo de los intercambios)
+    intercambios = _ContadorIntercambios()
+    observadores = observadores_pasos(registro, detalle, " (pivoteo parcial)") + [intercambios]
+    columnas_pivote = eliminar(trabajo, range(n), pivoteo="parcial", normalizar=False, reducida=False,
+                               detener_sin_pivote=True, observadores=observadores)
+    if len(columnas_pivote) < n:
+        # columna completa de ceros => singular
+        return trabajo, registro, intercambios.total, True
+
+    if detalle != "ninguno":
+        registro.estado("Matriz triangular superior")
+    return trabajo, registro, intercambios.total, False
+
+
+def _eliminacion_bareiss(matriz, detalle="completo"):
+    """
+    Eliminación de Bareiss (sin fracciones) sobre una matriz cuadrada de enteros o racionales.
+    Cada fila con denominadores se multiplica primero por su mcm; después todas las divisiones
+    son exactas entre enteros y cada entrada intermedia es un menor de la matriz, así que su
+    tamaño queda acotado por la cota de Hadamard.
+    Devuelve una tupla: (matriz_trabajo, pasos, swap_count, es_singular, escala)
+    - matriz_trabajo: matriz triangular de enteros; el último pivote es ±det · escala
+    - escala: producto de los factores usados para quitar denominadores
+    """
+    validar_matriz(matriz)
+    n = len(matriz)
+    if any(len(fila) != n for fila in matriz):
+        raise ValueError("La matriz debe ser cuadrada.")
+
+    fracciones = [[Fraction(str(elem)) for elem in fila] for fila in matriz]
+    pasos = RegistroPasos()
+    if detalle != "ninguno":
+        pasos.iniciar("Matriz original", matriz_a_str(fracciones))
+    escala = 1
+    trabajo = []
+    for i, fila in enumerate(fracciones):
+        factor = math.lcm(*(val.denominator for val in fila))
+        if factor != 1:
+            escala *= factor
+        trabajo.append([int(val * factor) for val in fila])
+        if factor != 1 and detalle == "completo":
+            pasos.fila(f"F{subindice(i+1)} → {factor} × F{subindice(i+1)} (se eliminan denominadores)",
+                       i, [str(x) for x in trabajo[i]])
+    swap_count, es_singular = bareiss_enteros(trabajo, n, pasos if detalle != "ninguno" else None, detalle)
+    if not es_singular and detalle != "ninguno":
+        pasos.estado("Matriz triangular superior")
+    return trabajo, pasos, swap_count, es_singular, escala
+
+
+def bareiss_enteros(trabajo, n, pasos=None, detalle="completo"):
+    """
+    Núcleo de Bareiss in situ sobre filas de enteros: elimina las primeras n columnas; las
+    columnas extra (p. ej. el vector b de un sistema aumentado) se transforman igual.
+    Si se pasa `pasos` (RegistroPasos cuya matriz de trabajo es `trabajo`), se anota cada
+    operación con la fila que cambia, o sólo la matriz al terminar cada columna si
+    detalle="resumen".
+    Devuelve (swap_count, es_singular).
+    """
+    m = len(trabajo[0]) if trabajo else 0
     swap_count = 0
+    pivote_anterior = 1
+    if pasos is not None and detalle == "resumen":
+        instantaneas = InstantaneasFilas(lambda fila, _: [str(x) for x in fila])
 
     for i in range(n):
-        # pivoteo parcial: seleccionar fila con mayor valor absoluto en columna i
-        max_row = max(range(i, n), key=lambda r: abs(trabajo[r][i]))
-        if trabajo[max_row][i] == 0:
-            # columna completa de ceros => singular
-            return trabajo, pasos, swap_count, True
-        if max_row != i:
-            trabajo[i], trabajo[max_row] = trabajo[max_row], trabajo[i]
+        if trabajo[i][i] == 0:
+            # basta un pivote no nulo: la aritmética es exacta
+            fila_pivote = next((r for r in range(i+1, n) if trabajo[r][i] != 0), None)
+            if fila_pivote is None:
+                return swap_count, True
+            trabajo[i], trabajo[fila_pivote] = trabajo[fila_pivote], trabajo[i]
             swap_count += 1
-            pasos.append((f"F{subindice(i+1)} ↔ F{subindice(max_row+1)} (pivoteo parcial)", matriz_a_str(trabajo)))
+            if pasos is not None and detalle == "completo":
+                pasos.intercambio(f"F{subindice(i+1)} ↔ F{subindice(fila_pivote+1)} (pivote no nulo)", i, fila_pivote)
 
         pivote = trabajo[i][i]
-        # eliminar debajo del pivote
+        fila_i = trabajo[i]
         for j in range(i+1, n):
-            factor = trabajo[j][i] / pivote
-            if factor != 0:
-                descripcion = f"F{subindice(j+1)} → F{subindice(j+1)} − {fraccion_str(factor)} × F{subindice(i+1)}"
-                trabajo[j] = [trabajo[j][k] - factor * trabajo[i][k] for k in range(n)]
-                pasos.append((descripcion, matriz_a_str(trabajo)))
+            fila_j = trabajo[j]
+            factor = fila_j[i]
+            # F_j → (pivote·F_j − a_ji·F_i) / pivote anterior; la división siempre es exacta
+            trabajo[j] = [0] * (i+1) + [(pivote * fila_j[k] - factor * fila_i[k]) // pivote_anterior
+                                        for k in range(i+1, m)]
+            if pasos is not None and detalle == "completo":
+                divisor = f" / {pivote_anterior}" if pivote_anterior != 1 else ""
+                descripcion = (f"F{subindice(j+1)} → ({pivote} × F{subindice(j+1)} − {factor} × F{subindice(i+1)})"
+                               f"{divisor}")
+                pasos.fila(descripcion, j, [str(x) for x in trabajo[j]])
+        if pasos is not None and detalle == "resumen" and i + 1 < n:
+            pasos.iniciar(f"Columna {i+1}: pivote {pivote} en F{subindice(i+1)}", instantaneas(trabajo))
+        pivote_anterior = pivote
+
+    return swap_count, False
 
-    pasos.append(("Matriz triangular superior", matriz_a_str(trabajo)))
-    return trabajo, pasos, swap_count, False
 
+def _es_entera(matriz):
+    try:
+        return all(Fraction(str(elem)).denominator == 1 for fila in matriz for elem in fila)
+    except (ValueError, TypeError, ZeroDivisionError):
+        return False
 
+
+@cache_por_matriz('triangular')
 def matriz_triangular(matriz):
     """
     Convierte una matriz cuadrada en su forma triangular superior mostrando todos los pasos.
     Devuelve: (matriz_triangular_str, pasos)
-    pasos: lista de tuplas (descripcion, matriz_en_strings)
+    pasos: RegistroPasos, secuencia de tuplas (descripcion, matriz_en_strings)
 
     Nota: ahora devuelve la triangular parcial y los pasos incluso si la matriz es singular
     (no lanza excepción) para permitir mostrar el proceso en la interfaz.
@@ -56,37 +150,73 @@ def matriz_triangular(matriz):
     trabajo, pasos, swap_count, es_singular = _eliminacion_con_pivoteo(matriz)
     if es_singular:
         # Añadir un paso informativo pero devolver la matriz tal como quedó
-        pasos.append(("No se pudo triangularizar completamente: la matriz es singular.", matriz_a_str(trabajo)))
-    return matriz_a_str(trabajo), pasos
+        pasos.estado("No se pudo triangularizar completamente: la matriz es singular.")
+    return trabajo.a_str(), pasos
+
+
+def _guardar_determinante(entrada, resultado):
+    entrada.determinante = resultado[0]
 
 
-def calcular_determinante(matriz):
+@cache_por_matriz('determinante', al_calcular=_guardar_determinante)
+def calcular_determinante(matriz, metodo="auto", detalle="completo"):
     """
-    Calcula el determinante usando eliminación gaussiana con pivoteo parcial.
+    Calcula el determinante por eliminación.
+    metodo: "bareiss" (sin fracciones), "gauss" (pivoteo parcial con Fraction) o "auto",
+    que usa Bareiss cuando todas las entradas son enteras.
+    detalle: "completo", "resumen" (un paso por columna pivote) o "ninguno" (sin pasos).
     Devuelve: (determinante (Fraction), pasos)
     """
-    trabajo, pasos_elim, swap_count, es_singular = _eliminacion_con_pivoteo(matriz)
+    if metodo not in METODOS_DETERMINANTE:
+        raise ValueError(f"Método de determinante no válido: {metodo}")
+    validar_detalle(detalle)
+    if metodo == "bareiss" or (metodo == "auto" and _es_entera(matriz)):
+        return _determinante_bareiss(matriz, detalle)
+
+    trabajo, pasos_elim, swap_count, es_singular = _eliminacion_con_pivoteo(matriz, detalle)
     if es_singular:
         descripcion = "La matriz es singular, determinante = 0"
         # Devolver también los pasos realizados hasta detectar la singularidad
-        pasos = pasos_elim + [(descripcion, matriz_a_str(trabajo))]
-        return Fraction(0, 1), pasos
+        if detalle != "ninguno":
+            pasos_elim.estado(descripcion)
+        return Fraction(0, 1), pasos_elim
 
-    n = len(trabajo)
-    diagonal = [trabajo[i][i] for i in range(n)]
+    n = trabajo.filas
+    diagonal = [trabajo.valor(i, i) for i in range(n)]
     det = Fraction(1, 1)
     for val in diagonal:
         det *= val
     # cada intercambio de filas cambia el signo del determinante
     if swap_count % 2 == 1:
         det *= -1
+    if detalle == "ninguno":
+        return det, pasos_elim
 
     multiplicacion = " × ".join([fraccion_str(val) for val in diagonal])
     signo_swaps = f" (se aplicó {swap_count} intercambio(s) de filas → cambio de signo)" if swap_count else ""
     descripcion = f"Determinante = {multiplicacion}{signo_swaps} = {fraccion_str(det)}"
-    pasos_determinante = [(descripcion, None)]
-    pasos = pasos_elim + pasos_determinante
-    return det, pasos
+    pasos_elim.anotar(descripcion)
+    return det, pasos_elim
+
+
+def _determinante_bareiss(matriz, detalle="completo"):
+    trabajo, pasos_elim, swap_count, es_singular, escala = _eliminacion_bareiss(matriz, detalle)
+    if es_singular:
+        if detalle != "ninguno":
+            pasos_elim.estado("La matriz es singular, determinante = 0")
+        return Fraction(0, 1), pasos_elim
+
+    # en Bareiss el último pivote ya es el determinante (salvo signo y escala)
+    ultimo_pivote = trabajo[-1][-1]
+    det = Fraction(-ultimo_pivote if swap_count % 2 == 1 else ultimo_pivote, escala)
+    if detalle == "ninguno":
+        return det, pasos_elim
+
+    signo_swaps = f" (se aplicó {swap_count} intercambio(s) de filas → cambio de signo)" if swap_count else ""
+    division = f" / {escala} (factores usados para quitar denominadores)" if escala != 1 else ""
+    descripcion = f"Determinante = último pivote {ultimo_pivote}{signo_swaps}{division} = {fraccion_str(det)}"
+    pasos_elim.anotar(descripcion)
+    return det, pasos_elim
 
 
 if __name__ == "__main__":
@@ -0,0 +1,232 @@
+"""
+Determinante exacto por vía multimodular: det(A) mod p para varios primos de ~62 bits (cada
+uno es una eliminación independiente, repartida entre procesos) y reconstrucción con el
+Teorema Chino del Resto. No genera pasos; pensado para matrices enteras grandes.
+
+El número de primos lo decide la cota de Hadamard |det(A)| <= prod ||fila_i||; con
+terminación temprana se para antes si la reconstrucción no cambia al añadir primos.
+
+En serie es más lento que Bareiss (cada primo es una eliminación n³ completa, y Bareiss
+cuesta del orden de _COSTE_BAREISS eliminaciones modulares por primo de la cota), así que
+con motor="auto" sólo se usa cuando los procesos disponibles reparten los primos en menos
+lotes de lo que costaría Bareiss; si no, se calcula con Bareiss sin pasos.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+
+from .cache_factorizaciones import cache_por_matriz, obtener_factorizacion
+from .utils import validar_matriz
+
+_BITS_PRIMO = 62
+# bases que hacen determinista Miller-Rabin para n < 3.3·10^24
+_BASES_MILLER_RABIN = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+# por debajo de este tamaño repartir en procesos cuesta más que eliminar en serie
+_N_MINIMO_PARALELO = 40
+# primos seguidos sin que cambie la reconstrucción para aceptar el resultado antes de la cota
+_PRIMOS_ESTABLES = 2
+# coste medido de Bareiss sin pasos, en eliminaciones módulo un primo por cada primo de la cota
+# (0.13-0.5 entre 20×20 y 150×150 con entradas de 1 a 15 dígitos; se toma el extremo bajo)
+_COSTE_BAREISS = 0.15
+MOTORES_DETERMINANTE = ("auto", "modular", "bareiss")
+
+
+def _es_primo(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in _BASES_MILLER_RABIN:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _BASES_MILLER_RABIN:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def primos_modulares(cantidad: int) -> tuple:
+    """Los `cantidad` mayores primos por debajo de 2^62, de mayor a menor."""
+    primos = []
+    candidato = (1 << _BITS_PRIMO) - 1
+    while len(primos) < cantidad:
+        if _es_primo(candidato):
+            primos.append(candidato)
+        candidato -= 2
+    return tuple(primos)
+
+
+def _determinante_mod(matriz, p: int) -> int:
+    """det(matriz) mod p por eliminación gaussiana en Z/pZ."""
+    filas = [[a % p for a in fila] for fila in matriz]
+    det = 1
+    while filas:
+        # las filas se van recortando: la columna 0 de cada fila es la columna del pivote
+        indice = next((r for r, fila in enumerate(filas) if fila[0]), None)
+        if indice is None:
+            return 0
+        if indice:
+            filas[0], filas[indice] = filas[indice], filas[0]
+            det = -det
+        fila_pivote = filas[0]
+        pivote = fila_pivote[0]
+        det = det * pivote % p
+        inverso = pow(pivote, -1, p)
+        resto = fila_pivote[1:]
+        nuevas = []
+        for fila in filas[1:]:
+            factor = fila[0] * inverso % p
+            if factor:
+                nuevas.append([(a - factor * b) % p for a, b in zip(fila[1:], resto)])
+            else:
+                nuevas.append(fila[1:])
+        filas = nuevas
+    return det % p
+
+
+def _tarea_determinante_mod(argumentos):
+    matriz, p = argumentos
+    return p, _determinante_mod(matriz, p)
+
+
+def _a_enteros(matriz):
+    """Pasa cada fila a enteros multiplicando por el mcm de sus denominadores; devuelve (filas, escala)."""
+    enteros = []
+    escala = 1
+    for fila in matriz:
+        fracciones = [Fraction(str(elem)) for elem in fila]
+        factor = math.lcm(*(val.denominator for val in fracciones))
+        escala *= factor
+        enteros.append([int(val * factor) for val in fracciones])
+    return enteros, escala
+
+
+def bits_hadamard(matriz) -> float:
+    """log2 de la cota de Hadamard prod_i ||fila_i||₂ (matriz de enteros)."""
+    bits = 0.0
+    for fila in matriz:
+        norma2 = sum(a * a for a in fila)
+        if norma2 == 0:
+            return 0.0
+        # log2 de enteros grandes sin pasar por float
+        bits += 0.5 * (norma2.bit_length() + math.log2(norma2 / (1 << norma2.bit_length())))
+    return bits
+
+
+def _crt(residuo: int, modulo: int, r: int, p: int):
+    """Combina x ≡ residuo (mod modulo) y x ≡ r (mod p)."""
+    t = (r - residuo) * pow(modulo, -1, p) % p
+    return residuo + modulo * t, modulo * p
+
+
+def _simetrico(residuo: int, modulo: int) -> int:
+    return residuo - modulo if residuo > modulo // 2 else residuo
+
+
+def _guardar_determinante(entrada, resultado):
+    entrada.determinante = resultado[0]
+
+
+def _modular_compensa(primos_cota, procesos) -> bool:
+    """Si repartir los primos en `procesos` lotes paralelos cuesta menos que Bareiss en serie."""
+    return procesos > 1 and math.ceil(primos_cota / procesos) < _COSTE_BAREISS * primos_cota
+
+
+@cache_por_matriz('determinante_modular', al_calcular=_guardar_determinante)
+def determinante_modular(matriz, procesos=None, terminacion_temprana=True, motor="auto"):
+    """
+    Calcula det(matriz) exacto sin pasos: con aritmética modular y CRT o, si no compensa, Bareiss.
+    procesos: número de procesos (None = núcleos disponibles; 1 = en serie).
+    motor: "modular", "bareiss" o "auto" (modular sólo si los procesos lo hacen más rápido).
+    Devuelve: (determinante (Fraction), info) con info = {'motor', 'primos', 'primos_cota',
+    'bits_hadamard', 'procesos', 'reutilizado'}; reutilizado=True si otra ruta ya había
+    calculado el determinante.
+    """
+    if motor not in MOTORES_DETERMINANTE:
+        raise ValueError(f"Motor de determinante no válido: {motor}")
+    validar_matriz(matriz)
+    n = len(matriz)
+    if any(len(fila) != n for fila in matriz):
+        raise ValueError("La matriz debe ser cuadrada.")
+
+    enteros, escala = _a_enteros(matriz)
+    bits = bits_hadamard(enteros)
+    # el producto de primos debe superar 2·cota para distinguir el signo
+    primos_cota = max(1, math.ceil((bits + 2) / (_BITS_PRIMO - 1)))
+    entrada = obtener_factorizacion(matriz)
+    if entrada.determinante_conocido:
+        info = {'motor': None, 'primos': 0, 'primos_cota': primos_cota, 'bits_hadamard': bits, 'procesos': 0,
+                'reutilizado': True}
+        return entrada.determinante, info
+
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    procesos = max(1, min(procesos, primos_cota))
+    if n < _N_MINIMO_PARALELO:
+        procesos = 1
+    if motor == "bareiss" or (motor == "auto" and not _modular_compensa(primos_cota, procesos)):
+        from .determinante import calcular_determinante
+        determinante, _ = calcular_determinante(matriz, "bareiss", "ninguno")
+        info = {'motor': 'bareiss', 'primos': 0, 'primos_cota': primos_cota, 'bits_hadamard': bits,
+                'procesos': 1, 'reutilizado': False}
+        return determinante, info
+    primos = primos_modulares(primos_cota)
+
+    residuo, modulo = 0, 1
+    valor_anterior = None
+    estables = 0
+    usados = 0
+    # en lotes de `procesos` primos, para poder cortar en cuanto la reconstrucción se estabiliza
+    ejecutor = None
+    try:
+        if procesos > 1:
+            try:
+                ejecutor = ProcessPoolExecutor(max_workers=procesos)
+            except (OSError, NotImplementedError):
+                ejecutor, procesos = None, 1
+        for inicio in range(0, primos_cota, procesos):
+            lote = primos[inicio:inicio + procesos]
+            if ejecutor is not None:
+                resultados = list(ejecutor.map(_tarea_determinante_mod, [(enteros, p) for p in lote]))
+            else:
+                resultados = [_tarea_determinante_mod((enteros, p)) for p in lote]
+            for p, r in resultados:
+                residuo, modulo = _crt(residuo, modulo, r, p)
+                usados += 1
+                valor = _simetrico(residuo, modulo)
+                estables = estables + 1 if valor == valor_anterior else 0
+                valor_anterior = valor
+            if terminacion_temprana and estables >= _PRIMOS_ESTABLES:
+                break
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown()
+
+    info = {'motor': 'modular', 'primos': usados, 'primos_cota': primos_cota, 'bits_hadamard': bits,
+            'procesos': procesos, 'reutilizado': False}
+    return Fraction(_simetrico(residuo, modulo), escala), info
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    n = 100
+    A = [[random.randint(-99, 99) for _ in range(n)] for _ in range(n)]
+    for motor in ("modular", "bareiss"):
+        inicio = time.perf_counter()
+        det, info = determinante_modular.sin_cache(A, motor=motor)
+        print(f"{n}x{n} ({motor}): {time.perf_counter() - inicio:.2f} s, {info}")
+    print(f"det tiene {len(str(abs(det.numerator)))} dígitos")
@@ -0,0 +1,246 @@
+"""
+Diferenciación automática en modo hacia adelante (números duales) sobre el AST validado.
+
+La expresión se compila con `compilar_lambda`, como `compilar_funcion`, pero el entorno asigna a
+cada nombre de math una versión que acepta números duales, así que una sola evaluación devuelve
+f(x) y f'(x) sin pasar por SymPy. Las funciones sin regla analítica (frexp, ulp, ...) usan diferencias
+centrales como respaldo.
+"""
+import math
+from typing import Callable, Tuple
+
+from .utils import NOMBRES_MATH, compilar_lambda
+
+
+class Dual:
+    """Número dual valor + derivada·ε con ε² = 0."""
+    __slots__ = ('valor', 'derivada')
+
+    def __init__(self, valor, derivada=0.0):
+        self.valor = valor
+        self.derivada = derivada
+
+    def __repr__(self):
+        return f"Dual({self.valor!r}, {self.derivada!r})"
+
+    def __float__(self):
+        return float(self.valor)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return Dual(-self.valor, -self.derivada)
+
+    def __add__(self, otro):
+        otro = _a_dual(otro)
+        return Dual(self.valor + otro.valor, self.derivada + otro.derivada)
+
+    __radd__ = __add__
+
+    def __sub__(self, otro):
+        otro = _a_dual(otro)
+        return Dual(self.valor - otro.valor, self.derivada - otro.derivada)
+
+    def __rsub__(self, otro):
+        return _a_dual(otro) - self
+
+    def __mul__(self, otro):
+        otro = _a_dual(otro)
+        return Dual(self.valor * otro.valor, self.derivada * otro.valor + self.valor * otro.derivada)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, otro):
+        otro = _a_dual(otro)
+        valor = self.valor / otro.valor
+        return Dual(valor, (self.derivada - valor * otro.derivada) / otro.valor)
+
+    def __rtruediv__(self, otro):
+        return _a_dual(otro) / self
+
+    def __pow__(self, otro):
+        return _potencia(self, otro)
+
+    def __rpow__(self, otro):
+        return _potencia(otro, self)
+
+    def __mod__(self, otro):
+        otro = _a_dual(otro)
+        # a % b = a - b·floor(a/b); floor es constante a trozos
+        cociente = math.floor(self.valor / otro.valor)
+        return Dual(self.valor % otro.valor, self.derivada - cociente * otro.derivada)
+
+    def __rmod__(self, otro):
+        return _a_dual(otro) % self
+
+    def __floordiv__(self, otro):
+        otro = _a_dual(otro)
+        return Dual(self.valor // otro.valor, 0.0)
+
+    def __rfloordiv__(self, otro):
+        return _a_dual(otro) // self
+
+
+def _a_dual(valor) -> Dual:
+    return valor if isinstance(valor, Dual) else Dual(valor, 0.0)
+
+
+def _valor(v):
+    return v.valor if isinstance(v, Dual) else v
+
+
+def _real(valor):
+    # mismo comportamiento que evaluar: una potencia compleja no es un resultado válido
+    if isinstance(valor, complex):
+        raise ValueError("La función toma valores complejos en este punto")
+    return valor
+
+
+def _potencia(base, exponente):
+    if not isinstance(exponente, Dual):
+        # u^c -> c·u^(c-1)·u'
+        valor = _real(base.valor ** exponente)
+        if exponente == 0:
+            return Dual(valor, 0.0)
+        return Dual(valor, exponente * _real(base.valor ** (exponente - 1)) * base.derivada)
+    base = _a_dual(base)
+    valor = _real(base.valor ** exponente.valor)
+    derivada = 0.0
+    if exponente.derivada:
+        # c^v -> c^v·ln(c)·v'
+        if base.valor == 0:
+            derivada = 0.0
+        else:
+            derivada = valor * math.log(base.valor) * exponente.derivada
+    if base.derivada:
+        derivada += exponente.valor * _real(base.valor ** (exponente.valor - 1)) * base.derivada
+    return Dual(valor, derivada)
+
+
+def _digamma(x: float) -> float:
+    """Función digamma ψ(x) = Γ'(x)/Γ(x) (derivada de lgamma)."""
+    if x <= 0 and x == math.floor(x):
+        raise ValueError("digamma no definida en enteros no positivos")
+    if x < 0:
+        # reflexión: ψ(x) = ψ(1 - x) - π / tan(πx)
+        return _digamma(1 - x) - math.pi / math.tan(math.pi * x)
+    resultado = 0.0
+    while x < 6:
+        resultado -= 1 / x
+        x += 1
+    inv = 1 / x
+    inv2 = inv * inv
+    return (resultado + math.log(x) - 0.5 * inv
+            - inv2 * (1 / 12 - inv2 * (1 / 120 - inv2 * (1 / 252 - inv2 * (1 / 240 - inv2 / 132)))))
+
+
+def _signo(v):
+    return math.copysign(1.0, v)
+
+
+# derivadas parciales de cada función de math respecto de cada argumento (en los valores reales)
+_PARCIALES = {
+    'acos': lambda v: (-1 / math.sqrt(1 - v * v),),
+    'acosh': lambda v: (1 / math.sqrt(v * v - 1),),
+    'asin': lambda v: (1 / math.sqrt(1 - v * v),),
+    'asinh': lambda v: (1 / math.sqrt(v * v + 1),),
+    'atan': lambda v: (1 / (1 + v * v),),
+    'atan2': lambda y, x: (x / (x * x + y * y), -y / (x * x + y * y)),
+    'atanh': lambda v: (1 / (1 - v * v),),
+    'cbrt': lambda v: (1 / (3 * math.cbrt(v) ** 2),),
+    'copysign': lambda a, b: (_signo(a) * _signo(b), 0.0),
+    'cos': lambda v: (-math.sin(v),),
+    'cosh': lambda v: (math.sinh(v),),
+    'degrees': lambda v: (180 / math.pi,),
+    'erf': lambda v: (2 / math.sqrt(math.pi) * math.exp(-v * v),),
+    'erfc': lambda v: (-2 / math.sqrt(math.pi) * math.exp(-v * v),),
+    'exp': lambda v: (math.exp(v),),
+    'exp2': lambda v: (math.exp2(v) * math.log(2),),
+    'expm1': lambda v: (math.exp(v),),
+    'fabs': lambda v: (_signo(v),),
+    'fmod': lambda a, b: (1.0, -math.trunc(a / b)),
+    'gamma': lambda v: (math.gamma(v) * _digamma(v),),
+    'hypot': lambda *vs: tuple(v / math.hypot(*vs) for v in vs),
+    'ldexp': lambda a, i: (2.0 ** i, 0.0),
+    'lgamma': lambda v: (_digamma(v),),
+    'log': lambda v, base=None: ((1 / v,) if base is None
+                                 else (1 / (v * math.log(base)), -math.log(v) / (base * math.log(base) ** 2))),
+    'log10': lambda v: (1 / (v * math.log(10)),),
+    'log1p': lambda v: (1 / (1 + v),),
+    'log2': lambda v: (1 / (v * math.log(2)),),
+    'nextafter': lambda a, b: (1.0, 0.0),
+    'pow': lambda a, b: (b * a ** (b - 1), a ** b * math.log(a) if a > 0 else 0.0),
+    'radians': lambda v: (math.pi / 180,),
+    'remainder': lambda a, b: (1.0, -float(round(a / b))),
+    'sin': lambda v: (math.cos(v),),
+    'sinh': lambda v: (math.cosh(v),),
+    'sqrt': lambda v: (1 / (2 * math.sqrt(v)),),
+    'tan': lambda v: (1 + math.tan(v) ** 2,),
+    'tanh': lambda v: (1 - math.tanh(v) ** 2,),
+}
+
+# constantes a trozos, de valores enteros o predicados: derivada 0 donde existe
+_DERIVADA_NULA = {'ceil', 'floor', 'trunc', 'factorial', 'comb', 'perm', 'gcd', 'lcm', 'isqrt',
+                  'isclose', 'isfinite', 'isinf', 'isnan', 'ulp'}
+
+
+def _diferencia_central(fn, valores, i):
+    h = 1e-6 * max(1.0, abs(valores[i]))
+    arriba = list(valores)
+    abajo = list(valores)
+    arriba[i] += h
+    abajo[i] -= h
+    return (fn(*arriba) - fn(*abajo)) / (2 * h)
+
+
+def _envolver(nombre: str) -> Callable:
+    fn = getattr(math, nombre)
+    parciales = _PARCIALES.get(nombre)
+
+    def envoltura(*args):
+        if not any(isinstance(arg, Dual) for arg in args):
+            return fn(*args)
+        valores = [_valor(arg) for arg in args]
+        valor = fn(*valores)
+        if isinstance(valor, tuple):
+            raise ValueError(f"La función '{nombre}' no devuelve un número y no se puede derivar")
+        if nombre in _DERIVADA_NULA:
+            return Dual(valor, 0.0)
+        derivada = 0.0
+        derivadas_parciales = parciales(*valores) if parciales else None
+        for i, arg in enumerate(args):
+            if isinstance(arg, Dual) and arg.derivada:
+                parcial = derivadas_parciales[i] if derivadas_parciales else _diferencia_central(fn, valores, i)
+                derivada += parcial * arg.derivada
+        return Dual(valor, derivada)
+    return envoltura
+
+
+def _construir_entorno() -> dict:
+    entorno = {"__builtins__": None}
+    for nombre in NOMBRES_MATH:
+        valor = getattr(math, nombre)
+        entorno[nombre] = _envolver(nombre) if callable(valor) else valor
+    return entorno
+
+
+_ENTORNO_DUAL = _construir_entorno()
+
+
+def compilar_funcion_y_derivada(funcion: str) -> Callable[[float], Tuple[float, float]]:
+    """Devuelve g(x) -> (f(x), f'(x)) calculados en una sola pasada."""
+    f = compilar_lambda(funcion, _ENTORNO_DUAL)
+
+    def f_y_derivada(x):
+        resultado = f(Dual(float(x), 1.0))
+        if isinstance(resultado, Dual):
+            return float(resultado.valor), float(resultado.derivada)
+        # expresión constante
+        return float(resultado), 0.0
+    return f_y_derivada
+
+
+def evaluar_con_derivada(funcion: str, x: float) -> Tuple[float, float]:
+    """Evalúa f(x) y f'(x) con diferenciación automática."""
+    return compilar_funcion_y_derivada(funcion)(x)
@@ -0,0 +1,186 @@
+"""
+Resolución exacta de Ax = b (A cuadrada, solución única) por levantamiento p-ádico de Dixon.
+
+A se factoriza una sola vez módulo un primo p (LU en Z/pZ); después cada iteración resuelve
+A·x_i ≡ r (mod p) con sustitución hacia adelante/atrás y actualiza r ← (r − A·x_i) / p con
+productos enteros exactos, de modo que x ≡ Σ x_i·p^i (mod p^k). Las fracciones se recuperan
+con reconstrucción racional y el resultado se verifica con A·x = b. No genera pasos.
+"""
+import math
+from fractions import Fraction
+from operator import mul
+
+from .cache_factorizaciones import cache_por_matriz
+from .determinante_modular import bits_hadamard, primos_modulares
+from .utils import validar_matriz
+
+# primos a probar antes de concluir que A es singular (un primo "malo" divide a det(A))
+_INTENTOS_PRIMO = 3
+
+
+def _a_enteros(A, b):
+    """Multiplica cada ecuación por el mcm de sus denominadores (no cambia la solución)."""
+    A_int, b_int = [], []
+    for fila, bi in zip(A, b):
+        fracciones = [Fraction(str(a)) for a in fila] + [Fraction(str(bi))]
+        factor = math.lcm(*(v.denominator for v in fracciones))
+        enteros = [int(v * factor) for v in fracciones]
+        A_int.append(enteros[:-1])
+        b_int.append(enteros[-1])
+    return A_int, b_int
+
+
+def _lu_mod(A, p):
+    """
+    Factorización PA = LU en Z/pZ (L con diagonal 1, guardada bajo la diagonal).
+    Devuelve (filas, permutacion) o None si A es singular módulo p.
+    """
+    filas = [[a % p for a in fila] for fila in A]
+    n = len(filas)
+    permutacion = list(range(n))
+    for k in range(n):
+        indice = next((r for r in range(k, n) if filas[r][k]), None)
+        if indice is None:
+            return None
+        if indice != k:
+            filas[k], filas[indice] = filas[indice], filas[k]
+            permutacion[k], permutacion[indice] = permutacion[indice], permutacion[k]
+        inverso = pow(filas[k][k], -1, p)
+        resto_pivote = filas[k][k + 1:]
+        for i in range(k + 1, n):
+            fila = filas[i]
+            factor = fila[k] * inverso % p
+            fila[k] = factor
+            if factor:
+                fila[k + 1:] = [(a - factor * c) % p for a, c in zip(fila[k + 1:], resto_pivote)]
+    return filas, permutacion
+
+
+class _FactorizacionModular:
+    """LU de A módulo p preparada para resolver muchos lados derechos."""
+
+    def __init__(self, filas, permutacion, p):
+        n = len(filas)
+        self.p = p
+        self.permutacion = permutacion
+        self.L = [filas[i][:i] for i in range(n)]
+        self.U = [filas[i][i + 1:] for i in range(n)]
+        self.inversos_diagonal = [pow(filas[i][i], -1, p) for i in range(n)]
+
+    def resolver(self, r):
+        p = self.p
+        y = []
+        for i, fila_l in enumerate(self.L):
+            y.append((r[self.permutacion[i]] - sum(map(mul, fila_l, y))) % p)
+        n = len(y)
+        x = [0] * n
+        for i in range(n - 1, -1, -1):
+            x[i] = (y[i] - sum(map(mul, self.U[i], x[i + 1:]))) * self.inversos_diagonal[i] % p
+        return x
+
+
+def reconstruccion_racional(a: int, m: int, cota: int):
+    """Fracción n/d con |n|, d <= cota y n ≡ a·d (mod m), o None si no existe."""
+    r0, r1 = m, a % m
+    t0, t1 = 0, 1
+    while r1 > cota:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        t0, t1 = t1, t0 - q * t1
+    if t1 == 0 or abs(t1) > cota or math.gcd(r1, abs(t1)) != 1:
+        return None
+    return Fraction(r1, t1)
+
+
+def _reconstruir_vector(xs, m):
+    """Reconstruye todas las componentes acumulando un denominador común (casi siempre sin Euclides)."""
+    cota = math.isqrt(m // 2)
+    denominador = 1
+    soluciones = []
+    for a in xs:
+        c = a * denominador % m
+        if c > m // 2:
+            c -= m
+        if abs(c) <= cota:
+            soluciones.append(Fraction(c, denominador))
+            continue
+        fraccion = reconstruccion_racional(c, m, cota)
+        if fraccion is None:
+            return None
+        denominador *= fraccion.denominator
+        if denominador > cota:
+            return None
+        soluciones.append(fraccion / (denominador // fraccion.denominator))
+    return soluciones
+
+
+def _verificar(A, b, soluciones):
+    denominador = math.lcm(*(x.denominator for x in soluciones))
+    numeradores = [int(x * denominador) for x in soluciones]
+    return all(sum(map(mul, fila, numeradores)) == bi * denominador for fila, bi in zip(A, b))
+
+
+@cache_por_matriz('dixon')
+def resolver_dixon(A, b):
+    """
+    Resuelve Ax = b exactamente por levantamiento p-ádico.
+    Devuelve (soluciones (lista de Fraction), info) con info = {'primo', 'iteraciones', 'iteraciones_cota'}.
+    Lanza ValueError si A no es cuadrada o el sistema no tiene solución única.
+    """
+    validar_matriz(A)
+    n = len(A)
+    if any(len(fila) != n for fila in A) or len(b) != n:
+        raise ValueError("La matriz de coeficientes debe ser cuadrada (n ecuaciones, n incógnitas).")
+
+    A_int, b_int = _a_enteros(A, b)
+
+    factorizacion = None
+    for p in primos_modulares(_INTENTOS_PRIMO):
+        lu = _lu_mod(A_int, p)
+        if lu is not None:
+            factorizacion = _FactorizacionModular(*lu, p)
+            break
+    if factorizacion is None:
+        raise ValueError("El sistema no tiene solución única (matriz singular).")
+    p = factorizacion.p
+
+    # Cramer + Hadamard: |numeradores| <= N = cota([A|b]) y denominador <= D = cota(A);
+    # la reconstrucción necesita p^k > 2·max(N, D)²
+    bits = 2 * max(bits_hadamard(A_int), bits_hadamard([fila + [bi] for fila, bi in zip(A_int, b_int)]))
+    iteraciones_cota = max(1, math.ceil((bits + 2) / (p.bit_length() - 1)))
+
+    r = list(b_int)
+    acumulado = [0] * n
+    modulo = 1
+    proximo_intento = 2
+    for iteracion in range(1, iteraciones_cota + 1):
+        x_i = factorizacion.resolver(r)
+        acumulado = [a + modulo * xi for a, xi in zip(acumulado, x_i)]
+        modulo *= p
+        # r − A·x_i es divisible por p por construcción
+        r = [(ri - sum(map(mul, fila, x_i))) // p for ri, fila in zip(r, A_int)]
+        # r = 0: la solución es exactamente el entero acumulado
+        terminado = not any(r)
+        if terminado or iteracion == proximo_intento or iteracion == iteraciones_cota:
+            # la cota de Hadamard suele ser pesimista: intentar reconstruir antes y verificar
+            proximo_intento *= 2
+            soluciones = _reconstruir_vector(acumulado, modulo)
+            if soluciones is not None and _verificar(A_int, b_int, soluciones):
+                return soluciones, {'primo': p, 'iteraciones': iteracion, 'iteraciones_cota': iteraciones_cota}
+            if terminado:
+                break
+
+    # con p^k por encima de la cota, la reconstrucción sólo falla si A es singular sobre Q
+    raise ValueError("El sistema no tiene solución única (matriz singular).")
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    n = 200
+    A = [[random.randint(-99, 99) for _ in range(n)] for _ in range(n)]
+    b = [random.randint(-99, 99) for _ in range(n)]
+    inicio = time.perf_counter()
+    x, info = resolver_dixon(A, b)
+    print(f"{n}x{n}: {time.perf_counter() - inicio:.2f} s, {info}")
@@ -0,0 +1,147 @@
+"""
+Núcleo común de eliminación por filas sobre MatrizRacional.
+
+Gauss-Jordan, RREF, eliminación gaussiana, determinante, inversa e independencia lineal sólo
+difieren en qué columnas recorren, cómo eligen el pivote, si normalizan la fila pivote, si
+eliminan también por encima de ella y qué hacen cuando una columna no tiene pivote. Todo eso
+son parámetros de `eliminar`. Los pasos para la interfaz los anota un observador sobre un
+RegistroPasos (ObservadorPasos, uno por operación; ObservadorResumen, uno por columna pivote);
+sin observadores no se calcula ni se formatea nada para mostrar.
+"""
+from .matriz_racional import numeradores_str
+from .registro_pasos import InstantaneasFilas
+from .utils import fraccion_str, subindice
+
+
+def pivote_primer_no_nulo(A, columna, desde):
+    """Primera fila con entrada no nula (suficiente con aritmética exacta)."""
+    return A.primera_no_nula(columna, desde)
+
+
+def pivote_parcial(A, columna, desde):
+    """Fila de mayor valor absoluto en la columna (pivoteo parcial)."""
+    fila = A.fila_maxima(columna, desde)
+    return None if A.es_nulo(fila, columna) else fila
+
+
+# nombre -> función (A, columna, desde) -> fila pivote o None si la columna es nula desde `desde`
+PIVOTEOS = {
+    "primer_no_nulo": pivote_primer_no_nulo,
+    "parcial": pivote_parcial,
+}
+
+
+class ObservadorEliminacion:
+    """Interfaz de observadores de `eliminar`: cada método se llama después de la operación."""
+
+    def intercambio(self, A, i, j):
+        pass
+
+    def normalizacion(self, A, i, columna, pivote):
+        pass
+
+    def eliminacion(self, A, r, p, columna, factor):
+        pass
+
+    def columna(self, A, fila, columna):
+        """Columna pivote terminada; el pivote quedó en la fila `fila`."""
+        pass
+
+
+class ObservadorPasos(ObservadorEliminacion):
+    """Anota cada operación en un RegistroPasos (sólo la fila que cambia) con la notación de la interfaz."""
+
+    def __init__(self, registro, sufijo_intercambio=""):
+        self.registro = registro
+        self.sufijo_intercambio = sufijo_intercambio
+
+    def intercambio(self, A, i, j):
+        self.registro.intercambio(f"F{subindice(i+1)} ↔ F{subindice(j+1)}{self.sufijo_intercambio}", i, j)
+
+    def normalizacion(self, A, i, columna, pivote):
+        self.registro.fila(f"F{subindice(i+1)} → F{subindice(i+1)} ÷ {fraccion_str(pivote)}", i, A.fila_str(i))
+
+    def eliminacion(self, A, r, p, columna, factor):
+        self.registro.fila(f"F{subindice(r+1)} → F{subindice(r+1)} − {fraccion_str(factor)} × F{subindice(p+1)}",
+                           r, A.fila_str(r))
+
+
+class ObservadorResumen(ObservadorEliminacion):
+    """Un paso con la matriz completa por columna pivote que cambia la matriz, en lugar de uno por operación."""
+
+    def __init__(self, registro):
+        self.registro = registro
+        self.cambios = False
+        self.instantaneas = InstantaneasFilas(numeradores_str)
+
+    def intercambio(self, A, i, j):
+        self.cambios = True
+
+    def normalizacion(self, A, i, columna, pivote):
+        self.cambios = self.cambios or pivote != 1
+
+    def eliminacion(self, A, r, p, columna, factor):
+        self.cambios = True
+
+    def columna(self, A, fila, columna):
+        if self.cambios:
+            self.registro.iniciar(f"Columna {columna+1}: pivote en F{subindice(fila+1)}",
+                                  self.instantaneas(A.numeradores, A.denominadores))
+            self.cambios = False
+
+
+def observadores_pasos(registro, detalle, sufijo_intercambio=""):
+    """Observadores de `eliminar` para un nivel de NIVELES_DETALLE."""
+    if detalle == "completo":
+        return [ObservadorPasos(registro, sufijo_intercambio)]
+    if detalle == "resumen":
+        return [ObservadorResumen(registro)]
+    return []
+
+
+def eliminar(A, columnas, pivoteo="primer_no_nulo", normalizar=True, reducida=True,
+             detener_sin_pivote=False, observadores=()):
+    """
+    Eliminación in situ sobre la MatrizRacional A, buscando pivote en `columnas` (en orden).
+    - pivoteo: nombre de PIVOTEOS o función (A, columna, desde) -> fila o None
+    - normalizar: dividir la fila pivote para dejar un 1 en el pivote
+    - reducida: eliminar en todas las demás filas (Gauss-Jordan) o sólo debajo (Gauss)
+    - detener_sin_pivote: terminar en la primera columna sin pivote en vez de saltarla
+    - observadores: ObservadorEliminacion a los que se notifica cada operación
+    Devuelve las columnas pivote; la fila pivote k queda en la posición k.
+    """
+    elegir = PIVOTEOS[pivoteo] if isinstance(pivoteo, str) else pivoteo
+    n = A.filas
+    fila = 0
+    columnas_pivote = []
+    for col in columnas:
+        if fila >= n:
+            break
+        p = elegir(A, col, fila)
+        if p is None:
+            if detener_sin_pivote:
+                break
+            continue
+        if p != fila:
+            A.intercambiar(fila, p)
+            for observador in observadores:
+                observador.intercambio(A, fila, p)
+
+        if normalizar:
+            pivote = A.valor(fila, col) if observadores else None
+            A.normalizar_fila(fila, col)
+            for observador in observadores:
+                observador.normalizacion(A, fila, col, pivote)
+
+        for r in (range(n) if reducida else range(fila + 1, n)):
+            if r != fila and not A.es_nulo(r, col):
+                factor = A.factor(r, fila, col) if observadores else None
+                A.eliminar(r, fila, col)
+                for observador in observadores:
+                    observador.eliminacion(A, r, fila, col, factor)
+
+        for observador in observadores:
+            observador.columna(A, fila, col)
+        columnas_pivote.append(col)
+        fila += 1
+    return columnas_pivote
@@ -1,57 +1,54 @@
-from .utils import validar_matriz, subindice, fraccion_str, matriz_a_str
+from .cache_factorizaciones import cache_por_matriz
+from .eliminacion import eliminar, observadores_pasos
+from .matriz_racional import MatrizRacional
+from .registro_pasos import RegistroPasos, validar_detalle
+from .utils import validar_matriz, subindice, fraccion_str
 from fractions import Fraction
 
 
-def eliminacion_gaussiana(matriz):
+@cache_por_matriz('eliminacion_gaussiana')
+def eliminacion_gaussiana(matriz, detalle="completo"):
     """
     Eliminación de Gauss (metodo de eliminacion hacia atras) para la matriz aumentada.
     Devuelve: (matriz_triangular_str, soluciones_str, pasos_str)
-    pasos_str es lista de tuplas: (descripcion_str, matriz_en_strings)
+    pasos_str es un RegistroPasos: secuencia de tuplas (descripcion_str, matriz_en_strings)
     Las descripciones usan notacion matemática (subindices, flechas, operaciones con filas)
+    detalle: "completo", "resumen" (un paso por columna pivote y el valor de cada incógnita)
+    o "ninguno" (sin pasos).
     """
     # Validar entrada si existe esa función en utils
     try:
         validar_matriz(matriz)
     except Exception:
         pass
+    validar_detalle(detalle)
 
-    # Conversión a Fraction para cálculos internos
-    matriz_trabajo = [[Fraction(str(elemento)) for elemento in fila] for fila in matriz]
-
-    n = len(matriz_trabajo)
+    n = len(matriz)
     if n == 0:
         raise ValueError("La matriz debe tener al menos una fila")
-    m = len(matriz_trabajo[0])
+    # filas de enteros con un denominador cada una; Fraction sólo al leer entradas
+    trabajo = MatrizRacional.desde_filas(matriz, lambda elemento: Fraction(str(elemento)))
+    m = len(matriz[0])
     if m != n + 1:
         raise ValueError("La matriz debe ser aumentada con n+1 columnas.")
 
-    pasos = []
-    # Usar matriz_a_str para mostrar la matriz aumentada inicial
-    pasos.append(("Matriz aumentada inicial", matriz_a_str(matriz_trabajo)))
-
+    registro = RegistroPasos()
+    if detalle != "ninguno":
+        registro.iniciar("Matriz aumentada inicial", trabajo.a_str())
     # Eliminación hacia adelante con pivoteo parcial
-    for i in range(n):
-        fila_max = max(range(i, n), key=lambda r: abs(matriz_trabajo[r][i]))
-        if matriz_trabajo[fila_max][i] == 0:
-            raise ValueError("El sistema no tiene solución única (columna nula o pivote cero).")
-        if fila_max != i:
-            matriz_trabajo[i], matriz_trabajo[fila_max] = matriz_trabajo[fila_max], matriz_trabajo[i]
-            pasos.append((f"F{subindice(i+1)} ↔ F{subindice(fila_max+1)}", matriz_a_str(matriz_trabajo)))
-
-        pivote = matriz_trabajo[i][i]
-        matriz_trabajo[i] = [elemento / pivote for elemento in matriz_trabajo[i]]
-        pasos.append((f"F{subindice(i+1)} → F{subindice(i+1)} ÷ {fraccion_str(pivote)}", matriz_a_str(matriz_trabajo)))
-
-        for r in range(i+1, n):
-            factor = matriz_trabajo[r][i]
-            if factor != 0:
-                matriz_trabajo[r] = [matriz_trabajo[r][k] - factor * matriz_trabajo[i][k] for k in range(m)]
-                pasos.append((f"F{subindice(r+1)} → F{subindice(r+1)} − {fraccion_str(factor)} × F{subindice(i+1)}", matriz_a_str(matriz_trabajo)))
-
-    # Usar matriz_a_str para mostrar la matriz triangular superior
-    pasos.append(("Matriz triangular superior", matriz_a_str(matriz_trabajo)))
+    if len(eliminar(trabajo, range(n), pivoteo="parcial", reducida=False, detener_sin_pivote=True,
+                    observadores=observadores_pasos(registro, detalle))) < n:
+        raise ValueError("El sistema no tiene solución única (columna nula o pivote cero).")
+
+    matriz_triangular_str = trabajo.a_str()
+    if detalle != "ninguno":
+        registro.anotar("Matriz triangular superior", matriz_triangular_str)
+    pasos = registro
+    matriz_trabajo = trabajo.a_fracciones()
 
     soluciones = [Fraction(0) for _ in range(n)]
+    # cada solución se formatea una vez y se reutiliza en las ecuaciones de las filas de arriba
+    soluciones_str = [None] * n
 
     # Sustitución regresiva: solo mostrar una ecuación por variable
     for i in range(n - 1, -1, -1):
@@ -65,28 +62,33 @@ def eliminacion_gaussiana(matriz):
         for j in range(i + 1, n):
             coef = matriz_trabajo[i][j]
             if coef != 0:
-                suma_ecuacion.append(f"{fraccion_str(coef)}×{fraccion_str(soluciones[j])}")
+                if detalle == "completo":
+                    suma_ecuacion.append(f"{fraccion_str(coef)}×{soluciones_str[j]}")
                 suma_valor += coef * soluciones[j]
 
+        numerador = matriz_trabajo[i][-1] - suma_valor
+        solucion_i = numerador / matriz_trabajo[i][i]
+        soluciones[i] = solucion_i
+        soluciones_str[i] = fraccion_str(solucion_i)
+        if detalle == "resumen":
+            pasos.anotar(f"Resultado: x{subindice(i+1)} = {soluciones_str[i]}")
+        if detalle != "completo":
+            continue
+
         if suma_ecuacion:
             ecuacion = f"x{subindice(i+1)} = ({fraccion_str(matriz_trabajo[i][-1])} − ({' + '.join(suma_ecuacion)})) ÷ {fraccion_str(matriz_trabajo[i][i])}"
         else:
             ecuacion = f"x{subindice(i+1)} = {fraccion_str(matriz_trabajo[i][-1])} ÷ {fraccion_str(matriz_trabajo[i][i])}"
 
-        numerador = matriz_trabajo[i][-1] - suma_valor
-        solucion_i = numerador / matriz_trabajo[i][i]
-        soluciones[i] = solucion_i
         # Mostrar la ecuación final sin división si el pivote es 1
         if matriz_trabajo[i][i] == 1:
-            ecuacion_final = f"x{subindice(i+1)} = {fraccion_str(solucion_i)}"
+            ecuacion_final = f"x{subindice(i+1)} = {soluciones_str[i]}"
         else:
-            ecuacion_final = f"x{subindice(i+1)} = {fraccion_str(numerador)} ÷ {fraccion_str(matriz_trabajo[i][i])} = {fraccion_str(solucion_i)}"
+            ecuacion_final = f"x{subindice(i+1)} = {fraccion_str(numerador)} ÷ {fraccion_str(matriz_trabajo[i][i])} = {soluciones_str[i]}"
 
-        pasos.append((f"Sustitución hacia atrás: {ecuacion}", None))
-        pasos.append((f"Resultado: {ecuacion_final}", None))
+        pasos.anotar(f"Sustitución hacia atrás: {ecuacion}")
+        pasos.anotar(f"Resultado: {ecuacion_final}")
 
-    matriz_triangular_str = matriz_a_str(matriz_trabajo)
-    soluciones_str = [fraccion_str(valor) for valor in soluciones]
     pasos_str = pasos
 
     return matriz_triangular_str, soluciones_str, pasos_str
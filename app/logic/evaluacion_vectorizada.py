@@ -0,0 +1,119 @@
+"""
+Evaluación vectorizada (NumPy) de las funciones que escribe el usuario.
+
+Usa el mismo AST validado que `evaluar`, pero el entorno asigna a cada nombre de math
+su ufunc de NumPy, de forma que un arreglo completo de x se evalúa en una sola llamada.
+Los puntos fuera del dominio (log de negativos, divisiones entre cero, desbordes...) se
+devuelven como NaN en lugar de lanzar excepciones.
+"""
+import math
+from typing import Any, Callable
+
+import numpy as np
+
+from .utils import NOMBRES_MATH, compilar_funcion, compilar_lambda
+
+
+def _por_elemento(fn: Callable) -> Callable:
+    """Adapta una función escalar de math para arreglos; los errores se convierten en NaN."""
+    def segura(*valores):
+        try:
+            return float(fn(*valores))
+        except Exception:
+            return math.nan
+
+    def envoltura(*args):
+        return np.frompyfunc(segura, len(args), 1)(*args).astype(float)
+    return envoltura
+
+
+def _log(x, base=None):
+    # math.log acepta base opcional; np.log no
+    if base is None:
+        return np.log(x)
+    return np.log(x) / np.log(base)
+
+
+# nombres de math con una ufunc equivalente en NumPy (misma semántica para floats)
+_EQUIVALENTES_NUMPY = {
+    'acos': np.arccos, 'acosh': np.arccosh, 'asin': np.arcsin, 'asinh': np.arcsinh,
+    'atan': np.arctan, 'atan2': np.arctan2, 'atanh': np.arctanh, 'cbrt': np.cbrt,
+    'ceil': np.ceil, 'copysign': np.copysign, 'cos': np.cos, 'cosh': np.cosh,
+    'degrees': np.degrees, 'exp': np.exp, 'exp2': np.exp2, 'expm1': np.expm1,
+    'fabs': np.fabs, 'floor': np.floor, 'fmod': np.fmod, 'hypot': np.hypot,
+    'isfinite': np.isfinite, 'isinf': np.isinf, 'isnan': np.isnan, 'ldexp': np.ldexp,
+    'log': _log, 'log10': np.log10, 'log1p': np.log1p, 'log2': np.log2,
+    'nextafter': np.nextafter, 'pow': np.power, 'radians': np.radians, 'sin': np.sin,
+    'sinh': np.sinh, 'sqrt': np.sqrt, 'tan': np.tan, 'tanh': np.tanh, 'trunc': np.trunc,
+}
+
+
+def _construir_entorno() -> dict:
+    entorno = {"__builtins__": None}
+    for nombre in NOMBRES_MATH:
+        valor = getattr(math, nombre)
+        if not callable(valor):
+            entorno[nombre] = valor  # constantes: pi, e, tau, inf, nan
+        elif nombre in _EQUIVALENTES_NUMPY:
+            entorno[nombre] = _EQUIVALENTES_NUMPY[nombre]
+        else:
+            # erf, gamma, factorial, remainder, ... sin ufunc equivalente
+            entorno[nombre] = _por_elemento(valor)
+    return entorno
+
+
+_ENTORNO_NUMPY = _construir_entorno()
+
+
+def compilar_funcion_vectorizada(funcion: str) -> Callable[[Any], Any]:
+    """Función compilada que acepta un arreglo de NumPy en lugar de un único x."""
+    return compilar_lambda(funcion, _ENTORNO_NUMPY)
+
+
+def evaluar_vectorizado(funcion: str, xs) -> np.ndarray:
+    """
+    Evalúa la función en todos los puntos de `xs` de una sola vez.
+    Devuelve un arreglo float con NaN donde la función no está definida o no es finita.
+    """
+    xs = np.asarray(xs, dtype=float)
+    f = compilar_funcion_vectorizada(funcion)
+    try:
+        with np.errstate(all='ignore'):
+            ys = np.asarray(f(xs), dtype=float)
+        if ys.shape != xs.shape:
+            # expresiones constantes (sin x) devuelven un escalar
+            ys = np.broadcast_to(ys, xs.shape).copy()
+    except Exception:
+        # respaldo: evaluación punto a punto con la función escalar
+        f_escalar = compilar_funcion(funcion)
+        ys = np.empty_like(xs)
+        for i, x in enumerate(xs.tolist()):
+            try:
+                ys[i] = float(f_escalar(x))
+            except Exception:
+                ys[i] = np.nan
+    ys[~np.isfinite(ys)] = np.nan
+    return ys
+
+
+def cambios_de_signo(ys) -> np.ndarray:
+    """
+    Índices i tales que f cambia de signo (o se anula) entre ys[i] y ys[i+1].
+    Un cero exacto en la malla se cuenta una sola vez (en el intervalo que empieza en él).
+    """
+    ys = np.asarray(ys, dtype=float)
+    if ys.size < 2:
+        return np.empty(0, dtype=int)
+    with np.errstate(invalid='ignore'):
+        mascara = (ys[:-1] * ys[1:] < 0) | (ys[:-1] == 0)
+    mascara[-1] |= ys[-1] == 0
+    mascara &= np.isfinite(ys[:-1]) & np.isfinite(ys[1:])
+    return np.flatnonzero(mascara)
+
+
+def estimar_cruce(xs, ys, i: int) -> float:
+    """Interpolación lineal del cero dentro del intervalo [xs[i], xs[i+1]]."""
+    y1 = abs(float(ys[i]))
+    y2 = abs(float(ys[i + 1]))
+    frac = y1 / (y1 + y2) if (y1 + y2) != 0 else 0.5
+    return float(xs[i] + (xs[i + 1] - xs[i]) * frac)
@@ -0,0 +1,163 @@
+"""
+Factorización exacta PA = LU (Fraction) que se calcula una vez y se aplica muchas veces:
+resolver AX = B para todas las columnas de B a la vez (O(n²) por lado derecho) y obtener la
+inversa como el caso B = I, en lugar de reducir de nuevo [A | b] o [A | I].
+"""
+from fractions import Fraction
+
+from .cache_factorizaciones import cache_por_matriz
+from .registro_pasos import RegistroPasos
+from .utils import crear_matriz_identidad, fraccion_str, matriz_a_str, subindice, validar_matriz
+
+
+class FactorizacionLU:
+    """
+    PA = LU con L triangular inferior de diagonal 1 y U triangular superior.
+    permutacion[i] es la fila de A que quedó en la posición i.
+    """
+    __slots__ = ('permutacion', 'L', 'U', 'intercambios')
+
+    def __init__(self, permutacion, L, U, intercambios):
+        self.permutacion = permutacion
+        self.L = L
+        self.U = U
+        self.intercambios = intercambios
+
+    @property
+    def n(self):
+        return len(self.U)
+
+    @property
+    def P(self):
+        n = self.n
+        return [[1 if self.permutacion[i] == j else 0 for j in range(n)] for i in range(n)]
+
+    @property
+    def es_singular(self):
+        return any(self.U[i][i] == 0 for i in range(self.n))
+
+    def determinante(self) -> Fraction:
+        det = Fraction(-1 if self.intercambios % 2 else 1)
+        for i in range(self.n):
+            det *= self.U[i][i]
+        return det
+
+    def resolver(self, B):
+        """
+        Resuelve AX = B. B puede ser un vector (lista de números) o una matriz n×k (k lados
+        derechos, uno por columna); el resultado tiene la misma forma.
+        """
+        if self.es_singular:
+            raise ValueError("La matriz es singular: el sistema no tiene solución única.")
+        n = self.n
+        if len(B) != n:
+            raise ValueError(f"El lado derecho debe tener {n} filas.")
+        es_vector = not isinstance(B[0], (list, tuple))
+        filas = [[Fraction(str(B[i]))] if es_vector else [Fraction(str(x)) for x in B[i]] for i in range(n)]
+        k = len(filas[0])
+        if any(len(fila) != k for fila in filas):
+            raise ValueError("Todas las filas del lado derecho deben tener la misma longitud.")
+
+        # Ly = PB, todas las columnas a la vez
+        Y = []
+        for i in range(n):
+            fila = filas[self.permutacion[i]][:]
+            for j, l in enumerate(self.L[i][:i]):
+                if l:
+                    fila = [a - l * y for a, y in zip(fila, Y[j])]
+            Y.append(fila)
+        # UX = Y
+        X = [None] * n
+        for i in range(n - 1, -1, -1):
+            fila = Y[i]
+            for j in range(i + 1, n):
+                u = self.U[i][j]
+                if u:
+                    fila = [a - u * x for a, x in zip(fila, X[j])]
+            pivote = self.U[i][i]
+            X[i] = [a / pivote for a in fila]
+        return [fila[0] for fila in X] if es_vector else X
+
+    def inversa(self):
+        """A⁻¹ como la solución de AX = I."""
+        return self.resolver(crear_matriz_identidad(self.n))
+
+
+@cache_por_matriz('lu')
+def factorizar_lu(A, con_pasos=False):
+    """
+    Factoriza PA = LU con aritmética exacta (pivote: primer elemento no nulo de la columna,
+    así P = I siempre que A admita LU sin intercambios).
+    Devuelve: (FactorizacionLU, pasos); pasos es un RegistroPasos, vacío si con_pasos=False.
+    El resultado queda en la cache de factorizaciones y se comparte: no modificar L ni U.
+    """
+    validar_matriz(A)
+    n = len(A)
+    if any(len(fila) != n for fila in A):
+        raise ValueError("La matriz debe ser cuadrada.")
+
+    U = [[Fraction(str(x)) for x in fila] for fila in A]
+    L = [[Fraction(0)] * n for _ in range(n)]
+    permutacion = list(range(n))
+    intercambios = 0
+    pasos = RegistroPasos()
+    if con_pasos:
+        pasos.iniciar("Matriz original A", matriz_a_str(U))
+
+    for i in range(n):
+        fila_pivote = next((r for r in range(i, n) if U[r][i] != 0), None)
+        if fila_pivote is None:
+            # columna nula: U queda con un cero en la diagonal (A singular), se sigue con la siguiente
+            continue
+        if fila_pivote != i:
+            U[i], U[fila_pivote] = U[fila_pivote], U[i]
+            L[i], L[fila_pivote] = L[fila_pivote], L[i]
+            permutacion[i], permutacion[fila_pivote] = permutacion[fila_pivote], permutacion[i]
+            intercambios += 1
+            if con_pasos:
+                pasos.intercambio(f"F{subindice(i+1)} ↔ F{subindice(fila_pivote+1)} (se registra en P)", i, fila_pivote)
+        pivote = U[i][i]
+        for j in range(i + 1, n):
+            factor = U[j][i] / pivote
+            if factor != 0:
+                L[j][i] = factor
+                U[j] = [a - factor * b for a, b in zip(U[j], U[i])]
+                if con_pasos:
+                    pasos.fila(f"F{subindice(j+1)} → F{subindice(j+1)} − {fraccion_str(factor)} × F{subindice(i+1)}"
+                               f"  (l{subindice(f'{j+1}{i+1}')} = {fraccion_str(factor)})", j, [fraccion_str(x) for x in U[j]])
+    for i in range(n):
+        L[i][i] = Fraction(1)
+
+    factorizacion = FactorizacionLU(permutacion, L, U, intercambios)
+    if con_pasos:
+        pasos.estado("Matriz triangular superior U")
+        pasos.anotar("Matriz triangular inferior L (multiplicadores)", matriz_a_str(L))
+    return factorizacion, pasos
+
+
+def resolver_lu(A, B):
+    """Resuelve AX = B (uno o varios lados derechos) factorizando A una sola vez."""
+    factorizacion, _ = factorizar_lu(A)
+    return factorizacion.resolver(B)
+
+
+def inversa_lu(A):
+    """Inversa exacta de A como resolución con B = I sobre su factorización LU."""
+    factorizacion, _ = factorizar_lu(A)
+    if factorizacion.es_singular:
+        raise ValueError("La matriz no tiene inversa.")
+    return factorizacion.inversa()
+
+
+if __name__ == "__main__":
+    A = [[2, -1, 3],
+         [1, 0, 2],
+         [4, 1, 8]]
+    lu, pasos = factorizar_lu(A, con_pasos=True)
+    for descripcion, matriz in pasos:
+        print(descripcion)
+        for fila in matriz:
+            print("\t".join(fila))
+    print("det(A) =", fraccion_str(lu.determinante()))
+    print("x =", [fraccion_str(x) for x in lu.resolver([5, 3, 11])])
+    print("A⁻¹ =", matriz_a_str(lu.inversa()))
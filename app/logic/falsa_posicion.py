@@ -1,64 +1,92 @@
-import ast
 import math
 from typing import Any, Tuple
-from .utils import transformar_sintaxis, parse_input_number, validar_nodo, evaluar
-from tabulate import tabulate
+from .utils import parse_input_number, compilar_funcion
+from .traza_iteraciones import TrazaIteraciones
 
 # nombres de math permitidos para que no se pueda acceder a ningun builtin peligroso
 _NOMBRES_MATH = {name for name in dir(math) if not name.startswith("_")}
 _NOMBRES_PERMITIDOS = _NOMBRES_MATH | {"x"}
 
-def falsa_posicion(funcion: str, intervalo: Tuple[str, str], error : float = 0.0001, max_iter: int = 100):
+# variantes disponibles: regula falsi clásica y las modificadas que evitan que un extremo se estanque
+MODOS_FALSA_POSICION = ("clasico", "illinois", "anderson_bjorck")
+
+
+def falsa_posicion(funcion: str, intervalo: Tuple[str, str], error : float = 0.0001, max_iter: int = 100,
+                   modo: str = "clasico", error_intervalo: float = None):
     """
     Parametros: funcion: str, intervalo: tuple[str, str], error: float
     Devuelve la aproximacion de la raiz usando el metodo de falsa posicion
     con la funcion dada en el intervalo dado hasta el error dado
     0.0001 por defecto
+
+    modo: "clasico", "illinois" o "anderson_bjorck". En las variantes modificadas, si el mismo
+    extremo se conserva dos iteraciones seguidas se reduce el valor de f que se usa para él en la
+    fórmula (a la mitad en Illinois, por m = 1 - f(c)/f(extremo movido) en Anderson-Björck), lo que
+    evita el estancamiento en funciones convexas.
+    Se detiene cuando |f(c)| <= error o cuando el ancho de [a, b] es <= error_intervalo
+    (por defecto igual a error).
+    Retorna: (raiz, traza (TrazaIteraciones), iteraciones)
     """
-    arbol_funcion = transformar_sintaxis(funcion)
-    arbol_funcion = ast.parse(arbol_funcion, mode="eval")
-    try:
-        validar_nodo(arbol_funcion)
-    except ValueError:
-        print("Revise la funcion ingresada, tuvo un error al ser validada")
+    if modo not in MODOS_FALSA_POSICION:
+        raise ValueError(f"Modo de falsa posicion no valido: {modo}")
+    if error_intervalo is None:
+        error_intervalo = error
 
-    pasos = [["Iteración", "a", "b", "c", "f(a)", "f(b)", "f(c)"]]
+    # la expresión se parsea y valida una sola vez (cache compartida con evaluar y las vistas previas)
+    f = compilar_funcion(funcion)
+
+    pasos = TrazaIteraciones((("a", ".6f"), ("b", ".6f"), ("c", ".6f"),
+                              ("f(a)", ".6f"), ("f(b)", ".6f"), ("f(c)", ".6f")))
     iteracion = 0
     # Usar parse_input_number para convertir los extremos del intervalo
     a = parse_input_number(intervalo[0])
     b = parse_input_number(intervalo[1])
-    evaluacion_a = evaluar(funcion, a)
-    evaluacion_b = evaluar(funcion, b)
+    evaluacion_a = float(f(a))
+    evaluacion_b = float(f(b))
     if evaluacion_a * evaluacion_b > 0:
         raise ValueError("No es valido usar falsa posicion, ya que al evaluar la funcion en los extremos de los"
                          " intervalos, los resultados deben tener distinto signo")
-    c = b - (evaluacion_b * (b- a)) / (evaluacion_b - evaluacion_a)
-    evaluacion_c = evaluar(funcion, c)
-    while abs(evaluacion_c) > error and iteracion < max_iter:
+    # valores de f que entran en la fórmula (las variantes modificadas los escalan)
+    peso_a, peso_b = evaluacion_a, evaluacion_b
+    extremo_movido = None
+    c = b - (peso_b * (b - a)) / (peso_b - peso_a)
+    evaluacion_c = float(f(c))
+    while abs(evaluacion_c) > error and abs(b - a) > error_intervalo and iteracion < max_iter:
         if evaluacion_a * evaluacion_c > 0:
+            # c reemplaza a 'a'; si 'b' ya se había conservado en la iteración anterior se reduce su peso
+            if extremo_movido == "a":
+                peso_b *= _factor_modificacion(modo, evaluacion_c, evaluacion_a)
             a = c
-            evaluacion_a = evaluar(funcion, a)
-            c = b - (evaluacion_b * (b - a)) / (evaluacion_b - evaluacion_a)
-            evaluacion_c = evaluar(funcion, c)
-            iteracion += 1
-            paso = [iteracion, a, b, c, evaluacion_a, evaluacion_b, evaluacion_c]
-            pasos.append(paso)
+            evaluacion_a = peso_a = evaluacion_c
+            extremo_movido = "a"
         else:
+            if extremo_movido == "b":
+                peso_a *= _factor_modificacion(modo, evaluacion_c, evaluacion_b)
             b = c
-            evaluacion_b = evaluar(funcion, b)
-            c = b - (evaluacion_b * (b - a)) / (evaluacion_b - evaluacion_a)
-            evaluacion_c = evaluar(funcion, c)
-            iteracion += 1
-            paso = [iteracion, a, b, c, evaluacion_a, evaluacion_b, evaluacion_c]
-            pasos.append(paso)
-    tabla = tabulate(pasos, headers="firstrow", floatfmt=".6f", tablefmt="html")
-    return c, tabla, iteracion
+            evaluacion_b = peso_b = evaluacion_c
+            extremo_movido = "b"
+        c = b - (peso_b * (b - a)) / (peso_b - peso_a)
+        evaluacion_c = float(f(c))
+        iteracion += 1
+        pasos.registrar(a, b, c, evaluacion_a, evaluacion_b, evaluacion_c)
+    return c, pasos, iteracion
+
+
+def _factor_modificacion(modo: str, evaluacion_c: float, evaluacion_movido: float) -> float:
+    """Factor por el que se multiplica el peso del extremo que se conserva."""
+    if modo == "illinois":
+        return 0.5
+    if modo == "anderson_bjorck":
+        m = 1.0 - evaluacion_c / evaluacion_movido
+        return m if m > 0 else 0.5
+    return 1.0
 
 if __name__ == "__main__":
     funcion = "cos(x)-x"
     intervalo = (0, 1)
-    raiz, tabla, iteraciones = falsa_posicion(funcion, intervalo)
+    raiz, traza, iteraciones = falsa_posicion(funcion, intervalo)
     print(f"Raíz aproximada: {raiz}")
     print(f"Iteraciones: {iteraciones}")
     print("Tabla de pasos:")
-    print(tabla)
+    for fila in traza.filas_formateadas():
+        print(*fila, sep="\t")
@@ -1,35 +1,11 @@
-from app.logic.utils import validar_matriz, subindice, fraccion_str
+from app.logic.cache_factorizaciones import cache_por_matriz
+from app.logic.eliminacion_dispersa import (a_densa, a_filas_dispersas, dispersa_a_str, gauss_jordan_disperso,
+                                            nota_dispersa, usar_dispersa)
+from app.logic.eliminacion import eliminar, observadores_pasos
+from app.logic.matriz_racional import MatrizRacional
+from app.logic.registro_pasos import RegistroPasos, validar_detalle
+from app.logic.utils import validar_matriz, fraccion_str
 from fractions import Fraction
-import math
-
-def _simplify_row(row):
-    """Reduce a una representación equivalente con enteros más pequeños.
-    Convierte la fila de Fraction a numeradores enteros sobre un denominador común L,
-    calcula d = gcd(N1,N2,...,L) y devuelve la fila como [Fraction(Ni//d, L//d)].
-    Esto evita que los numeradores/denominadores crezcan innecesariamente.
-    """
-    if not row:
-        return row
-    # obtener denominadores
-    dens = [f.denominator for f in row]
-    # lcm de denominadores
-    L = 1
-    for d in dens:
-        if d:
-            L = math.lcm(L, d)
-    # convertir a numeradores sobre L
-    Ns = [f.numerator * (L // f.denominator) for f in row]
-    # gcd de todos los numeradores y L
-    g = abs(L)
-    for n in Ns:
-        g = math.gcd(g, n)
-    if g == 0:
-        # todo ceros -> devolver ceros
-        return [Fraction(0, 1) for _ in row]
-    # crear nueva fila simplificada
-    new_den = L // g
-    new_row = [Fraction(n // g, new_den) for n in Ns]
-    return new_row
 
 def _to_fraction(x, max_den=10**6):
     """Convertir un valor a Fraction de forma segura.
@@ -54,70 +30,11 @@ def _to_fraction(x, max_den=10**6):
             # fallback
             return Fraction(0, 1)
 
-def gauss_jordan(matriz):
+def _soluciones(A, n, m, pivot_cols):
     """
-    Resuelve un sistema de ecuaciones lineales usando el metodo de Gauss-Jordan
-    La matriz debe ser aumentada (coeficientes + terminos independientes)
-    Devuelve la matriz reducida (como strings), la solucion (lista de strings, con parámetros si corresponde)
-    y el paso a paso.
+    Construye la solución (lista de strings, con parámetros t1, t2, ... para las variables
+    libres) a partir de la matriz ya reducida. Lanza ValueError si el sistema es incompatible.
     """
-    try:
-        validar_matriz(matriz)
-    except Exception:
-        pass
-
-    n = len(matriz)
-    m = len(matriz[0])  # columnas totales (variables + 1)
-    A = [[_to_fraction(elem) for elem in fila] for fila in matriz]
-    pasos = [("Matriz inicial", [fila.copy() for fila in A])]
-
-    row = 0
-    pivot_cols = []
-
-    # RREF sobre las columnas de coeficientes (sin la última columna de términos independientes)
-    for col in range(m - 1):
-        if row >= n:
-            break
-        # buscar un pivot (elemento no nulo) en la columna desde 'row' hacia abajo
-        pivot_row = None
-        for r in range(row, n):
-            if A[r][col] != 0:
-                pivot_row = r
-                break
-        if pivot_row is None:
-            # columna de coeficientes completamente nula -> variable potencialmente libre
-            continue
-
-        # intercambiar filas si es necesario
-        if pivot_row != row:
-            A[row], A[pivot_row] = A[pivot_row], A[row]
-            # simplificar filas afectadas
-            A[row] = _simplify_row(A[row])
-            A[pivot_row] = _simplify_row(A[pivot_row])
-            pasos.append((f"F{subindice(row+1)} ↔ F{subindice(pivot_row+1)}", [fila.copy() for fila in A]))
-
-        # normalizar la fila pivot
-        pivote = A[row][col]
-        A[row] = [elem / pivote for elem in A[row]]
-        # simplificar fila
-        A[row] = _simplify_row(A[row])
-        pasos.append((f"F{subindice(row+1)} → F{subindice(row+1)} ÷ {fraccion_str(pivote)}", [fila.copy() for fila in A]))
-
-        # eliminar la columna en todas las otras filas
-        for r in range(n):
-            if r != row:
-                factor = A[r][col]
-                if factor != 0:
-                    A[r] = [A[r][k] - factor * A[row][k] for k in range(m)]
-                    # simplificar fila resultante
-                    A[r] = _simplify_row(A[r])
-                    pasos.append((f"F{subindice(r+1)} → F{subindice(r+1)} − {fraccion_str(factor)} × F{subindice(row+1)}", [fila.copy() for fila in A]))
-
-        pivot_cols.append(col)
-        row += 1
-
-    pasos.append(("Matriz reducida final", [fila.copy() for fila in A]))
-
     # Verificar inconsistencia: fila de ceros en coeficientes y término independiente distinto de cero
     for r in range(n):
         if all(A[r][c] == 0 for c in range(m - 1)) and A[r][-1] != 0:
@@ -163,16 +80,56 @@ def gauss_jordan(matriz):
     for i in range(num_vars):
         if soluciones_expr[i] is None:
             soluciones_expr[i] = "0"
+    return soluciones_expr
+
+def _gauss_jordan_disperso(matriz, n, m, detalle):
+    filas = a_filas_dispersas(matriz, _to_fraction)
+    # sin copias de la matriz por operación: en sistemas grandes dominarían el coste
+    pasos = RegistroPasos()
+    if detalle != "ninguno":
+        pasos.iniciar("Matriz inicial", dispersa_a_str(filas, m))
+        pasos.anotar(nota_dispersa(matriz))
+    filas, pivot_cols = gauss_jordan_disperso(filas, range(m - 1), pasos if detalle == "completo" else None)
+    matriz_reducida = dispersa_a_str(filas, m)
+    if detalle != "ninguno":
+        pasos.anotar("Matriz reducida final", matriz_reducida)
+    return matriz_reducida, _soluciones(a_densa(filas, m), n, m, pivot_cols), pasos
+
+@cache_por_matriz('gauss_jordan', convertir=_to_fraction)
+def gauss_jordan(matriz, metodo="auto", detalle="completo"):
+    """
+    Resuelve un sistema de ecuaciones lineales usando el metodo de Gauss-Jordan
+    La matriz debe ser aumentada (coeficientes + terminos independientes)
+    metodo: "densa", "dispersa" (filas dispersas, pivote de Markowitz) o "auto", que usa la
+    dispersa en sistemas grandes con pocos no nulos.
+    detalle: "completo", "resumen" (un paso por columna pivote) o "ninguno" (sin pasos).
+    Devuelve la matriz reducida (como strings), la solucion (lista de strings, con parámetros si corresponde)
+    y el paso a paso.
+    """
+    try:
+        validar_matriz(matriz)
+    except Exception:
+        pass
+    validar_detalle(detalle)
 
-    # Convertir matriz reducida a strings y pasos a strings
-    matriz_reducida = [[fraccion_str(A[i][j]) for j in range(m)] for i in range(n)]
-    soluciones_str = [sol for sol in soluciones_expr]
-    pasos_str = []
-    for descripcion, matriz_paso in pasos:
-        matriz_paso_str = [[fraccion_str(elem) for elem in fila] for fila in matriz_paso]
-        pasos_str.append((descripcion, matriz_paso_str))
-
-    return matriz_reducida, soluciones_str, pasos_str
+    n = len(matriz)
+    m = len(matriz[0])  # columnas totales (variables + 1)
+    if usar_dispersa(matriz, metodo):
+        return _gauss_jordan_disperso(matriz, n, m, detalle)
+    # filas de enteros con un denominador cada una: las operaciones no crean Fraction por elemento
+    A = MatrizRacional.desde_filas(matriz, _to_fraction)
+    registro = RegistroPasos()
+    if detalle != "ninguno":
+        registro.iniciar("Matriz inicial", A.a_str())
+    # RREF sobre las columnas de coeficientes (sin la última columna de términos independientes);
+    # una columna sin pivote corresponde a una variable libre
+    pivot_cols = eliminar(A, range(m - 1), observadores=observadores_pasos(registro, detalle))
+
+    matriz_reducida = A.a_str()
+    if detalle != "ninguno":
+        registro.anotar("Matriz reducida final", matriz_reducida)
+    soluciones_str = _soluciones(A.a_fracciones(), n, m, pivot_cols)
+    return matriz_reducida, soluciones_str, registro
 
 
 # prueba del modulo en consola
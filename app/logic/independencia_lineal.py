@@ -1,16 +1,23 @@
-from .utils import validar_matriz, subindice, fraccion_str
+from .cache_factorizaciones import cache_por_matriz
+from .eliminacion import eliminar, observadores_pasos
+from .matriz_racional import MatrizRacional
+from .registro_pasos import RegistroPasos, validar_detalle
+from .utils import validar_matriz, subindice
 from fractions import Fraction
 
 
-def comprobar_independencia_lineal(matriz):
+@cache_por_matriz('independencia_lineal', convertir=Fraction)
+def comprobar_independencia_lineal(matriz, detalle="completo"):
     """
     Comprueba la independencia lineal de los vectores dados como *columnas* de la matriz.
     Devuelve:
       - matriz_reducida_str: matriz en RREF con elementos como cadenas (fracciones)
       - resultado_str: lista de cadenas con resumen (independiente/ dependiente y explicación)
       - pasos_str: lista de tuplas (descripción, matriz_en_cadenas) con los pasos intermedios
+    detalle: "completo", "resumen" (un paso por columna pivote) o "ninguno" (sin pasos).
     """
     validar_matriz(matriz)
+    validar_detalle(detalle)
     filas = len(matriz)
     columnas = len(matriz[0])
 
@@ -21,42 +28,17 @@ def comprobar_independencia_lineal(matriz):
             "Hay más vectores que entradas (dimensión), por tanto existen relaciones lineales no triviales entre ellos, es decir, son dependientes."
         ], []
 
-    # trabajar con Fracciones
-    matriz_fracciones = [[Fraction(elem) for elem in fila] for fila in matriz]
-    pasos = [("Matriz inicial", [fila.copy() for fila in matriz_fracciones])]
-
-    # algoritmo RREF recorriendo columnas (permite más columnas que filas)
-    fila_actual = 0
-    pivotes = []
-    matriz_trabajo = [fila.copy() for fila in matriz_fracciones]
-
-    for columna in range(columnas):
-        if fila_actual >= filas:
-            break
-        # encontrar fila con máximo en valor absoluto en esta columna desde 'fila_actual'
-        fila_maxima = max(range(fila_actual, filas), key=lambda r: abs(matriz_trabajo[r][columna]))
-        if matriz_trabajo[fila_maxima][columna] == 0:
-            continue  # no pivote en esta columna
-        if fila_maxima != fila_actual:
-            matriz_trabajo[fila_actual], matriz_trabajo[fila_maxima] = matriz_trabajo[fila_maxima], matriz_trabajo[fila_actual]
-            pasos.append((f"F{subindice(fila_actual+1)} ↔ F{subindice(fila_maxima+1)}", [[fraccion_str(el) for el in f] for f in matriz_trabajo]))
-        pivote = matriz_trabajo[fila_actual][columna]
-
-        # normalizar fila pivote
-        matriz_trabajo[fila_actual] = [elem / pivote for elem in matriz_trabajo[fila_actual]]
-        pasos.append((f"F{subindice(fila_actual+1)} → F{subindice(fila_actual+1)} ÷ {fraccion_str(pivote)}", [[fraccion_str(el) for el in f] for f in matriz_trabajo]))
-        # eliminar en todas las demás filas
-        for r in range(filas):
-            if r != fila_actual and matriz_trabajo[r][columna] != 0:
-                factor = matriz_trabajo[r][columna]
-                matriz_trabajo[r] = [matriz_trabajo[r][k] - factor * matriz_trabajo[fila_actual][k] for k in range(columnas)]
-                pasos.append((f"F{subindice(r+1)} → F{subindice(r+1)} − {fraccion_str(factor)} × F{subindice(fila_actual+1)}", [[fraccion_str(el) for el in f] for f in matriz_trabajo]))
-        pivotes.append((fila_actual, columna))
-        fila_actual += 1
+    # filas de enteros con un denominador cada una (sin una Fraction por elemento en cada paso)
+    matriz_trabajo = MatrizRacional.desde_filas(matriz, Fraction)
+    registro = RegistroPasos()
+    if detalle != "ninguno":
+        registro.iniciar("Matriz inicial", matriz_trabajo.a_str())
+    # RREF recorriendo columnas con pivoteo parcial (permite más columnas que filas)
+    independientes = eliminar(matriz_trabajo, range(columnas), pivoteo="parcial",
+                              observadores=observadores_pasos(registro, detalle))
 
     # preparar resultados
-    rango = len(pivotes)
-    independientes = [col for (_, col) in pivotes]
+    rango = len(independientes)
     es_independiente = (rango == columnas)
     vectores_independientes = [subindice(c+1) for c in independientes]  # 1-based con subíndices
 
@@ -82,8 +64,10 @@ def comprobar_independencia_lineal(matriz):
         razon = "Existe una combinación lineal no trivial que anula los vectores, por lo que son linealmente dependientes (hay soluciones no triviales de A·x=0)."
         resultado_str = [estado, razon, "Vectores pivote (columnas independientes identificadas): [" + ", ".join(vectores_independientes) + "]"]
 
-    matriz_reducida_str = [[fraccion_str(matriz_trabajo[i][j]) for j in range(columnas)] for i in range(filas)]
-    pasos_str = pasos + [("Matriz en forma reducida (RREF)", [[fraccion_str(el) for el in f] for f in matriz_trabajo])]
+    matriz_reducida_str = matriz_trabajo.a_str()
+    if detalle != "ninguno":
+        registro.anotar("Matriz en forma reducida (RREF)", matriz_reducida_str)
+    pasos_str = registro
 
     return matriz_reducida_str, resultado_str, pasos_str
 
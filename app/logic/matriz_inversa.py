@@ -1,38 +1,33 @@
-from .utils import crear_matriz_identidad, fraccion_str, subindice
+from .cache_factorizaciones import cache_por_matriz
+from .eliminacion import eliminar, observadores_pasos
+from .matriz_racional import MatrizRacional
+from .registro_pasos import RegistroPasos, validar_detalle
+from .utils import crear_matriz_identidad
 from fractions import Fraction
 
-def gauss_jordan_pasos(A):
+@cache_por_matriz('inversa')
+def gauss_jordan_pasos(A, detalle="completo"):
+    """
+    Inversa de A por Gauss-Jordan sobre [A | I].
+    detalle: "completo", "resumen" (un paso por columna pivote) o "ninguno" (sin pasos).
+    Devuelve: (inversa_str, pasos)
+    """
+    validar_detalle(detalle)
     n = len(A)
-    # Convertir todos los elementos a Fraction
-    A_frac = [[Fraction(str(x)) for x in fila] for fila in A]
-    I = crear_matriz_identidad(n)
-    I_frac = [[Fraction(str(x)) for x in fila] for fila in I]
-    aumentada = [A_frac[i] + I_frac[i] for i in range(n)]
-    pasos = [("Matriz aumentada inicial [Matriz | I]", [[fraccion_str(x) for x in fila] for fila in aumentada])]
-
-    for i in range(n):
-        pivote = aumentada[i][i]
-        if pivote == 0:
-            for k in range(i + 1, n):
-                if aumentada[k][i] != 0:
-                    aumentada[i], aumentada[k] = aumentada[k], aumentada[i]
-                    pivote = aumentada[i][i]
-                    pasos.append((f"F{subindice(i+1)} ↔ F{subindice(k+1)}", [[fraccion_str(x) for x in fila] for fila in aumentada]))
-                    break
-            else:
-                raise ValueError("La matriz no tiene inversa.")
-        aumentada[i] = [x / pivote for x in aumentada[i]]
-        pasos.append((f"F{subindice(i+1)} → F{subindice(i+1)} ÷ {fraccion_str(pivote)}", [[fraccion_str(x) for x in fila] for fila in aumentada]))
-        for j in range(n):
-            if j != i:
-                factor = aumentada[j][i]
-                if factor != 0:
-                    aumentada[j] = [a - factor * b for a, b in zip(aumentada[j], aumentada[i])]
-                    pasos.append((f"F{subindice(j+1)} → F{subindice(j+1)} − {fraccion_str(factor)} × F{subindice(i+1)}", [[fraccion_str(x) for x in fila] for fila in aumentada]))
-    inversa = [fila[n:] for fila in aumentada]
-    inversa_str = [[fraccion_str(x) for x in fila] for fila in inversa]
-    pasos.append(("Matriz inversa obtenida", inversa_str))
-    return inversa_str, pasos
+    # [A | I] con filas de enteros y un denominador por fila
+    identidad = crear_matriz_identidad(n)
+    aumentada = MatrizRacional.desde_filas((list(A[i]) + identidad[i] for i in range(n)),
+                                           lambda x: Fraction(str(x)))
+    registro = RegistroPasos()
+    if detalle != "ninguno":
+        registro.iniciar("Matriz aumentada inicial [Matriz | I]", aumentada.a_str())
+    if len(eliminar(aumentada, range(n), detener_sin_pivote=True,
+                    observadores=observadores_pasos(registro, detalle))) < n:
+        raise ValueError("La matriz no tiene inversa.")
+    inversa_str = [fila[n:] for fila in aumentada.a_str()]
+    if detalle != "ninguno":
+        registro.anotar("Matriz inversa obtenida", inversa_str)
+    return inversa_str, registro
 
 if __name__ == "__main__":
     matriz = [
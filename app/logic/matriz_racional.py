@@ -0,0 +1,126 @@
+"""
+Matriz racional compacta para la eliminación por filas: cada fila es una lista de enteros
+(numeradores) con un único denominador positivo, en forma reducida (mcd de la fila y su
+denominador igual a 1).
+
+Las operaciones elementales se hacen sólo con enteros, sin crear una Fraction por elemento
+en cada paso; las Fraction (y sus strings) aparecen únicamente al leer una entrada o al
+mostrar la matriz.
+"""
+import math
+from fractions import Fraction
+
+
+def numeradores_str(numeradores, d):
+    """Strings de los valores x/d (d > 0), con el mismo formato que fraccion_str."""
+    if d == 1:
+        return [str(x) for x in numeradores]
+    valores = []
+    for x in numeradores:
+        g = math.gcd(x, d)
+        valores.append(str(x // g) if g == d else f"{x // g}/{d // g}")
+    return valores
+
+
+class MatrizRacional:
+    """Filas de numeradores enteros con un denominador por fila."""
+    __slots__ = ('numeradores', 'denominadores', 'columnas')
+
+    def __init__(self, numeradores, denominadores, columnas):
+        self.numeradores = numeradores
+        self.denominadores = denominadores
+        self.columnas = columnas
+
+    @classmethod
+    def desde_filas(cls, filas, convertir=Fraction):
+        """Construye la matriz aplicando `convertir` (-> Fraction o int) a cada elemento."""
+        numeradores, denominadores = [], []
+        columnas = 0
+        for fila in filas:
+            valores = [convertir(x) for x in fila]
+            columnas = len(valores)
+            denominador = math.lcm(*(x.denominator for x in valores)) if valores else 1
+            numeradores.append([x.numerator * (denominador // x.denominator) for x in valores])
+            denominadores.append(denominador)
+        matriz = cls(numeradores, denominadores, columnas)
+        for i in range(len(numeradores)):
+            matriz._reducir(i)
+        return matriz
+
+    @property
+    def filas(self):
+        return len(self.numeradores)
+
+    def _reducir(self, i):
+        fila = self.numeradores[i]
+        denominador = self.denominadores[i]
+        if denominador < 0:
+            fila = [-x for x in fila]
+            denominador = -denominador
+        g = math.gcd(denominador, *fila)
+        if not any(fila):
+            fila, denominador = [0] * len(fila), 1
+        elif g != 1:
+            fila = [x // g for x in fila]
+            denominador //= g
+        self.numeradores[i] = fila
+        self.denominadores[i] = denominador
+
+    def valor(self, i, j) -> Fraction:
+        return Fraction(self.numeradores[i][j], self.denominadores[i])
+
+    def es_nulo(self, i, j) -> bool:
+        return self.numeradores[i][j] == 0
+
+    def primera_no_nula(self, columna, desde=0):
+        """Primera fila (desde `desde`) con entrada no nula en `columna`, o None."""
+        return next((r for r in range(desde, self.filas) if self.numeradores[r][columna]), None)
+
+    def fila_maxima(self, columna, desde=0):
+        """Fila (desde `desde`) de mayor valor absoluto en `columna`; ante empates, la primera."""
+        mejor = desde
+        num_mejor, den_mejor = abs(self.numeradores[desde][columna]), self.denominadores[desde]
+        for r in range(desde + 1, self.filas):
+            num = abs(self.numeradores[r][columna])
+            # |a/b| > |c/d|  <=>  a·d > c·b (denominadores positivos)
+            if num * den_mejor > num_mejor * self.denominadores[r]:
+                mejor, num_mejor, den_mejor = r, num, self.denominadores[r]
+        return mejor
+
+    def intercambiar(self, i, j):
+        self.numeradores[i], self.numeradores[j] = self.numeradores[j], self.numeradores[i]
+        self.denominadores[i], self.denominadores[j] = self.denominadores[j], self.denominadores[i]
+
+    def normalizar_fila(self, i, columna):
+        """F_i → F_i ÷ a_i,columna (la entrada queda en 1)."""
+        # (N/d) ÷ (N_c/d) = N / N_c
+        self.denominadores[i] = self.numeradores[i][columna]
+        self._reducir(i)
+
+    def factor(self, r, p, columna) -> Fraction:
+        """a_r,columna / a_p,columna: el múltiplo de F_p que eliminar(r, p, columna) resta a F_r."""
+        return Fraction(self.numeradores[r][columna] * self.denominadores[p],
+                        self.numeradores[p][columna] * self.denominadores[r])
+
+    def eliminar(self, r, p, columna):
+        """F_r → F_r − (a_r,columna / a_p,columna)·F_p, que anula la entrada (r, columna)."""
+        fila_r, fila_p = self.numeradores[r], self.numeradores[p]
+        a, b = fila_r[columna], fila_p[columna]
+        # N_r/d_r − (a/b)·N_p/d_r = (b·N_r − a·N_p) / (b·d_r); d_p se cancela
+        self.numeradores[r] = [b * x - a * y for x, y in zip(fila_r, fila_p)]
+        self.denominadores[r] *= b
+        self._reducir(r)
+
+    def fila_fracciones(self, i):
+        d = self.denominadores[i]
+        return [Fraction(x, d) for x in self.numeradores[i]]
+
+    def a_fracciones(self):
+        return [self.fila_fracciones(i) for i in range(self.filas)]
+
+    def fila_str(self, i):
+        """Fila i como strings, con el mismo formato que fraccion_str."""
+        return numeradores_str(self.numeradores[i], self.denominadores[i])
+
+    def a_str(self):
+        return [self.fila_str(i) for i in range(self.filas)]
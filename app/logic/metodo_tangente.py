@@ -1,9 +1,6 @@
-import ast
 from typing import Any
-from app.logic.utils import transformar_sintaxis, parse_input_number, validar_nodo
-from tabulate import tabulate
-import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr
+from app.logic.utils import parse_input_number, compilar_funcion
+from app.logic.traza_iteraciones import TrazaIteraciones
 
 
 def metodo_tangente(funcion: str, a_input: Any, b_input: Any, tolerancia: float = 0.0001, max_iteraciones: int = 100):
@@ -11,15 +8,15 @@ def metodo_tangente(funcion: str, a_input: Any, b_input: Any, tolerancia: float
     Implementación del método de la tangente/secante usando:
         c = b - f(b)*(b-a)/(f(b)-f(a))
 
-    Retorna: (raiz_encontrada, tabla_html, iteraciones_usadas, f_en_raiz)
-    Tabla columnas: Iteración | a | b | f(a) | f(b) | c | f(c)
+    Retorna: (raiz_encontrada, traza (TrazaIteraciones), iteraciones_usadas, f_en_raiz)
+    f_en_raiz es un float (NaN si f no se pudo evaluar); la plantilla lo muestra con 3 decimales.
+    Columnas de la traza: Iteración | a | b | f(a) | f(b) | c | f(c)
     """
     if funcion is None or str(funcion).strip() == "":
         raise ValueError("Función vacía")
 
-    expresion_transformada = transformar_sintaxis(funcion)
-    arbol = ast.parse(expresion_transformada, mode="eval")
-    validar_nodo(arbol)
+    # la secante sólo necesita evaluar f: se usa la función compilada y validada una sola vez
+    f_num = compilar_funcion(funcion)
 
     try:
         a = float(parse_input_number(a_input))
@@ -27,26 +24,9 @@ def metodo_tangente(funcion: str, a_input: Any, b_input: Any, tolerancia: float
     except Exception as e:
         raise ValueError(f"Intervalo inválido: {e}")
 
-    x_sym = sp.symbols('x')
-    try:
-        local_dict = {'e': sp.E, 'pi': sp.pi, 'ln': sp.log}
-        sympy_expr = parse_expr(expresion_transformada, local_dict=local_dict)
-        sympy_deriv = sp.diff(sympy_expr, x_sym)  # no usado pero útil si se necesita
-        f_num = sp.lambdify(x_sym, sympy_expr, modules=["math"])
-    except Exception as e:
-        raise ValueError("No se pudo procesar la expresión con SymPy. Revise la sintaxis de la función. Detalle: " + str(e))
-
     # Cabecera: Iteración | a | b | f(a) | f(b) | c | f(c)
-    tabla_pasos = [["Iteración", "a", "b", "f(a)", "f(b)", "c", "f(c)"]]
-
-    def formatear_num(v, decimales=6):
-        try:
-            n = float(v)
-        except Exception:
-            return str(v)
-        if n != n:
-            return 'NaN'
-        return f"{n:.{decimales}f}"
+    tabla_pasos = TrazaIteraciones((("a", ".6f"), ("b", ".6f"), ("f(a)", ".6f"), ("f(b)", ".6f"),
+                                    ("c", ".6f"), ("f(c)", ".6f")))
 
     iteracion = 0
 
@@ -78,18 +58,14 @@ def metodo_tangente(funcion: str, a_input: Any, b_input: Any, tolerancia: float
             fc = float('nan')
 
         # registrar paso
-        fila = [str(iteracion + 1), formatear_num(a), formatear_num(b), formatear_num(fa), formatear_num(fb), formatear_num(c), formatear_num(fc)]
-        tabla_pasos.append(fila)
+        tabla_pasos.registrar(a, b, fa, fb, c, fc)
 
         iteracion += 1
 
         # condición de paro: |f(c)| pequeño o cambio en c respecto a b pequeño
         if (isinstance(fc, float) and abs(fc) <= float(tolerancia)) or abs(c - b) <= float(tolerancia):
             raiz = c
-            try:
-                f_en_raiz = format(float(fc) if isinstance(fc, (int, float)) else float('nan'), '.3f')
-            except Exception:
-                f_en_raiz = str(float('nan'))
+            f_en_raiz = fc
             break
 
         # actualizar para siguiente iteración: secante actualiza (a,b) -> (b,c)
@@ -99,16 +75,11 @@ def metodo_tangente(funcion: str, a_input: Any, b_input: Any, tolerancia: float
     if raiz is None:
         # si no convergió, tomar última aproximación b
         raiz = b
-        try:
-            f_en_raiz = format(float(fb) if isinstance(fb, (int, float)) else float('nan'), '.3f')
-        except Exception:
-            f_en_raiz = str(float('nan'))
-
-    tabla_html = tabulate(tabla_pasos, headers="firstrow", tablefmt="html")
+        f_en_raiz = fb
 
-    return raiz, tabla_html, iteracion, f_en_raiz
+    return raiz, tabla_pasos, iteracion, f_en_raiz
 
 
 if __name__ == "__main__":
-    raiz, tabla, it, fc = metodo_tangente("x**3 - x - 2", 1.0, 2.0)
+    raiz, traza, it, fc = metodo_tangente("x**3 - x - 2", 1.0, 2.0)
     print(raiz, it, fc)
@@ -0,0 +1,139 @@
+"""
+Motor de multiplicación de matrices (listas de listas) en Python puro.
+
+B se transpone una sola vez y cada entrada es el producto escalar de dos filas con
+sum(map(mul, ...)), que recorre listas contiguas en C en lugar de indexar B[k][j] columna a
+columna. Con entradas racionales, A y B se escalan a enteros (mcm de denominadores por fila
+de A y por columna de B) y sólo se divide al final: las Fraction aparecen m·p veces, no m·k·p.
+En matrices grandes se recorren bloques de columnas de B para reutilizarlas mientras siguen
+en caché y, por encima de un umbral, se usa la recursión de Strassen sobre enteros
+(7 productos de medio tamaño en lugar de 8).
+"""
+import math
+from fractions import Fraction
+from operator import add, mul, sub
+
+METODOS_MULTIPLICACION = ("auto", "filas", "bloques", "strassen")
+# columnas de B (filas de Bᵀ) por bloque
+_TAMANO_BLOQUE = 64
+# "auto": bloques a partir de este número de columnas de B...
+_UMBRAL_BLOQUES = 128
+# ...y Strassen (sólo entradas exactas) cuando las tres dimensiones llegan a este tamaño
+_UMBRAL_STRASSEN = 256
+# tamaño en el que la recursión de Strassen pasa a bloques (medido con scripts/benchmark_multiplicacion.py)
+_CORTE_STRASSEN = 128
+
+
+def _transponer(B):
+    return [list(columna) for columna in zip(*B)]
+
+
+def _producto_filas(A, Bt):
+    return [[sum(map(mul, fila, columna)) for columna in Bt] for fila in A]
+
+
+def _producto_bloques(A, Bt, bloque=_TAMANO_BLOQUE):
+    resultado = [[] for _ in A]
+    for inicio in range(0, len(Bt), bloque):
+        # el bloque de columnas se reutiliza con todas las filas de A antes de pasar al siguiente
+        columnas = Bt[inicio:inicio + bloque]
+        for fila, fila_resultado in zip(A, resultado):
+            fila_resultado.extend([sum(map(mul, fila, columna)) for columna in columnas])
+    return resultado
+
+
+def _sumar(X, Y):
+    return [list(map(add, x, y)) for x, y in zip(X, Y)]
+
+
+def _restar(X, Y):
+    return [list(map(sub, x, y)) for x, y in zip(X, Y)]
+
+
+def _rellenar(X, filas, columnas):
+    relleno = [fila + [0] * (columnas - len(fila)) for fila in X]
+    return relleno + [[0] * columnas for _ in range(filas - len(X))]
+
+
+def _strassen(A, B, umbral=_CORTE_STRASSEN):
+    m, k, p = len(A), len(B), len(B[0])
+    if min(m, k, p) < umbral:
+        return _producto_bloques(A, _transponer(B))
+    if m % 2 or k % 2 or p % 2:
+        # dimensiones impares: una fila/columna de ceros y se recorta el resultado
+        C = _strassen(_rellenar(A, m + m % 2, k + k % 2), _rellenar(B, k + k % 2, p + p % 2), umbral)
+        return [fila[:p] for fila in C[:m]]
+    h, q, r = m // 2, k // 2, p // 2
+    A11, A12 = [f[:q] for f in A[:h]], [f[q:] for f in A[:h]]
+    A21, A22 = [f[:q] for f in A[h:]], [f[q:] for f in A[h:]]
+    B11, B12 = [f[:r] for f in B[:q]], [f[r:] for f in B[:q]]
+    B21, B22 = [f[:r] for f in B[q:]], [f[r:] for f in B[q:]]
+
+    M1 = _strassen(_sumar(A11, A22), _sumar(B11, B22), umbral)
+    M2 = _strassen(_sumar(A21, A22), B11, umbral)
+    M3 = _strassen(A11, _restar(B12, B22), umbral)
+    M4 = _strassen(A22, _restar(B21, B11), umbral)
+    M5 = _strassen(_sumar(A11, A12), B22, umbral)
+    M6 = _strassen(_restar(A21, A11), _sumar(B11, B12), umbral)
+    M7 = _strassen(_restar(A12, A22), _sumar(B21, B22), umbral)
+
+    C11 = _sumar(_restar(_sumar(M1, M4), M5), M7)
+    C12 = _sumar(M3, M5)
+    C21 = _sumar(M2, M4)
+    C22 = _sumar(_sumar(_restar(M1, M2), M3), M6)
+    return [x + y for x, y in zip(C11, C12)] + [x + y for x, y in zip(C21, C22)]
+
+
+def _a_enteros(A, B):
+    """
+    (A_int, B_int, escala_filas, escala_columnas) si todas las entradas son int o Fraction,
+    o None si hay floats u otros tipos (entonces se multiplica tal cual).
+    """
+    tipos = {type(x) for X in (A, B) for fila in X for x in fila}
+    if not tipos <= {int, Fraction}:
+        return None
+    if Fraction not in tipos:
+        return A, B, None, None
+    escala_filas = [math.lcm(*(x.denominator for x in fila)) for fila in A]
+    escala_columnas = [math.lcm(*(x.denominator for x in columna)) for columna in zip(*B)]
+    A_int = [[int(x * e) if type(x) is Fraction else x * e for x in fila] for fila, e in zip(A, escala_filas)]
+    B_int = [[int(x * e) if type(x) is Fraction else x * e for x, e in zip(fila, escala_columnas)] for fila in B]
+    return A_int, B_int, escala_filas, escala_columnas
+
+
+def elegir_metodo(m, k, p, exacta=True) -> str:
+    """Método de "auto" para A (m×k) · B (k×p)."""
+    if exacta and min(m, k, p) >= _UMBRAL_STRASSEN:
+        return "strassen"
+    return "bloques" if p >= _UMBRAL_BLOQUES else "filas"
+
+
+def multiplicar(A, B, metodo="auto"):
+    """
+    Producto A·B. metodo: "filas" (Bᵀ + productos escalares), "bloques", "strassen" o "auto",
+    que elige según el tamaño. Devuelve enteros si A y B son enteras, Fraction si alguna
+    entrada es Fraction y floats si hay floats.
+    """
+    if metodo not in METODOS_MULTIPLICACION:
+        raise ValueError(f"Método de multiplicación no válido: {metodo}")
+    if len(A[0]) != len(B):
+        raise ValueError("El número de columnas de A debe ser igual al número de filas de B")
+
+    enteros = _a_enteros(A, B)
+    if enteros is not None:
+        A_calculo, B_calculo, escala_filas, escala_columnas = enteros
+    else:
+        A_calculo, B_calculo = A, B
+    if metodo == "auto":
+        metodo = elegir_metodo(len(A), len(B), len(B[0]), exacta=enteros is not None)
+
+    if metodo == "strassen":
+        C = _strassen(A_calculo, B_calculo)
+    elif metodo == "bloques":
+        C = _producto_bloques(A_calculo, _transponer(B_calculo))
+    else:
+        C = _producto_filas(A_calculo, _transponer(B_calculo))
+
+    if enteros is None or escala_filas is None:
+        return C
+    return [[Fraction(c, ea * eb) for c, eb in zip(fila, escala_columnas)] for fila, ea in zip(C, escala_filas)]
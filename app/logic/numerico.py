@@ -0,0 +1,149 @@
+"""
+Modo numérico (float64) para matrices grandes sin pasos: resolver, determinante, inversa y
+rango con LAPACK vía NumPy.
+
+Antes de aceptar un resultado en coma flotante se mide el número de condición κ₂ (valores
+singulares); si el problema está mal condicionado, el determinante se sale del rango de
+float64 o la decisión de rango es dudosa, se calcula con el motor exacto (Fraction).
+Cada función devuelve (valor, info) con info['precision'] = 'float64' o 'exacta'.
+"""
+import math
+from fractions import Fraction
+
+from decimal import Context, Decimal
+
+import numpy as np
+
+from .utils import fraccion_str, validar_matriz
+
+PRECISIONES = ("float64", "exacta")
+# con κ₂ > 1e12 float64 deja menos de ~4 dígitos fiables: se pasa a aritmética exacta
+CONDICION_MAXIMA = 1e12
+# valores singulares por encima del umbral de rango, pero a menos de este factor, lo hacen dudoso
+_MARGEN_RANGO = 1e3
+_EPS = float(np.finfo(np.float64).eps)
+# logs del mayor float64 finito y del menor float64 normal (por debajo se pierden dígitos o es 0.0)
+_LOG_MAXIMO = math.log(float(np.finfo(np.float64).max))
+_LOG_MINIMO = math.log(float(np.finfo(np.float64).tiny))
+_CONTEXTO_DECIMAL = Context(prec=17)
+
+
+def _a_float(matriz):
+    validar_matriz(matriz)
+    return np.array([[float(Fraction(str(x))) for x in fila] for fila in matriz], dtype=np.float64)
+
+
+def _comprobar_cuadrada(M):
+    if M.shape[0] != M.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada.")
+
+
+def _condicion(valores_singulares) -> float:
+    if valores_singulares.size == 0:
+        return 1.0
+    menor = valores_singulares[-1]
+    return float(valores_singulares[0] / menor) if menor > 0 else math.inf
+
+
+def _info(precision, condicion, motivo=None, error_relativo=0.0):
+    """`error_relativo`: error de redondeo propio del cálculo, que se suma al de κ₂·eps."""
+    digitos = None
+    if precision == "float64":
+        digitos = max(0, int(-math.log10(max(condicion, 1.0) * _EPS + error_relativo)))
+    return {'precision': precision, 'condicion': condicion, 'digitos': digitos, 'motivo': motivo}
+
+
+def _motivo_condicion(condicion):
+    if math.isinf(condicion):
+        return "la matriz es singular en float64"
+    return f"la matriz está mal condicionada (κ₂ ≈ {condicion:.1e})"
+
+
+def resolver_numerico(A, b, condicion_maxima=CONDICION_MAXIMA):
+    """
+    Resuelve Ax = b (A cuadrada) con numpy.linalg.solve; si κ₂(A) > condicion_maxima se
+    resuelve de forma exacta (Dixon), que lanza ValueError si no hay solución única.
+    Devuelve (soluciones (floats o Fraction), info).
+    """
+    M = _a_float(A)
+    _comprobar_cuadrada(M)
+    if len(b) != M.shape[0]:
+        raise ValueError("El vector de independientes debe tener una entrada por ecuación.")
+    condicion = _condicion(np.linalg.svd(M, compute_uv=False))
+    if condicion <= condicion_maxima:
+        v = np.array([float(Fraction(str(x))) for x in b], dtype=np.float64)
+        return np.linalg.solve(M, v).tolist(), _info("float64", condicion)
+    from .dixon import resolver_dixon
+    soluciones, _ = resolver_dixon(A, b)
+    return soluciones, _info("exacta", condicion, _motivo_condicion(condicion))
+
+
+def determinante_numerico(A, condicion_maxima=CONDICION_MAXIMA):
+    """
+    det(A) con LAPACK (slogdet); exacto (multimodular) si A está mal condicionada. Si |det| no
+    cabe en un float64 normal (desborda o se va a subnormal/0.0) se devuelve como Decimal, con
+    la misma precisión pero exponente ilimitado. exp(log|det|) amplifica el error absoluto del
+    logaritmo (una suma de n logaritmos, ~n·eps·|log|det||) en error relativo del determinante,
+    así que los dígitos fiables tienen en cuenta también ese término.
+    """
+    M = _a_float(A)
+    _comprobar_cuadrada(M)
+    condicion = _condicion(np.linalg.svd(M, compute_uv=False))
+    if condicion > condicion_maxima:
+        from .determinante_modular import determinante_modular
+        determinante, _ = determinante_modular(A)
+        return determinante, _info("exacta", condicion, _motivo_condicion(condicion))
+    signo, logaritmo = np.linalg.slogdet(M)
+    if signo == 0:
+        return 0.0, _info("float64", condicion)
+    logaritmo = float(logaritmo)
+    info = _info("float64", condicion, error_relativo=M.shape[0] * _EPS * abs(logaritmo))
+    if _LOG_MINIMO <= logaritmo < _LOG_MAXIMO:
+        return float(signo * math.exp(logaritmo)), info
+    return Decimal(float(signo)) * Decimal(logaritmo).exp(_CONTEXTO_DECIMAL), info
+
+
+def inversa_numerica(A, condicion_maxima=CONDICION_MAXIMA):
+    """A⁻¹ con numpy.linalg.inv; exacta (LU con Fraction) si A está mal condicionada."""
+    M = _a_float(A)
+    _comprobar_cuadrada(M)
+    condicion = _condicion(np.linalg.svd(M, compute_uv=False))
+    if condicion <= condicion_maxima:
+        return np.linalg.inv(M).tolist(), _info("float64", condicion)
+    from .factorizacion_lu import inversa_lu
+    return inversa_lu(A), _info("exacta", condicion, _motivo_condicion(condicion))
+
+
+def rango_numerico(A):
+    """
+    Rango por valores singulares con el umbral de NumPy σ₁·max(m, n)·eps. Los valores por debajo
+    son ruido de redondeo; si alguno queda apenas por encima (a menos de un factor _MARGEN_RANGO)
+    no se sabe si es un cero perturbado y el rango se calcula exacto.
+    """
+    M = _a_float(A)
+    valores = np.linalg.svd(M, compute_uv=False)
+    if valores.size == 0 or valores[0] == 0:
+        return 0, _info("float64", 1.0)
+    umbral = valores[0] * max(M.shape) * _EPS
+    if np.any((valores > umbral) & (valores < umbral * _MARGEN_RANGO)):
+        from .cache_factorizaciones import obtener_factorizacion
+        return obtener_factorizacion(A).rango, _info("exacta", _condicion(valores),
+                                                     "la decisión de rango es ambigua en float64")
+    rango = int(np.count_nonzero(valores > umbral))
+    # condición de la parte no nula: lo que cuesta distinguir σ_r de cero
+    return rango, _info("float64", _condicion(valores[:rango]))
+
+
+def numero_str(valor) -> str:
+    """Fraction con fraccion_str; float/Decimal con 12 cifras significativas."""
+    if isinstance(valor, Fraction):
+        return fraccion_str(valor)
+    return f"{valor:.12g}"
+
+
+def etiqueta_precision(info) -> str:
+    """Texto para la interfaz con la precisión del resultado."""
+    if info['precision'] == "float64":
+        return (f"Precisión: float64 (LAPACK), κ₂ ≈ {info['condicion']:.2e}, "
+                f"~{info['digitos']} dígitos significativos fiables.")
+    return f"Precisión: exacta (racional); se descartó float64 porque {info['motivo']}."
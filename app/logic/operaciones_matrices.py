@@ -1,19 +1,33 @@
 from fractions import Fraction
+from .registro_pasos import validar_detalle
 from .utils import (
     validar_matriz,
+    multiplicar_matrices,
     multiplicar_matrices_pasos,
     multiplicar_matriz_escalar,
+    restar_matrices,
+    sumar_matrices,
     sumar_matrices_pasos,
     restar_matrices_pasos,
     matriz_a_str
 )
 
-def operar_matrices(A, B, escalar_a=None, escalar_b=None, operacion='suma'):
+# operacion -> (sin pasos, con pasos por fila, descripción)
+_OPERACIONES = {
+    'suma': (sumar_matrices, sumar_matrices_pasos, "Se suman las matrices A y B"),
+    'resta': (restar_matrices, restar_matrices_pasos, "Se resta la matriz B de la matriz A"),
+    'multiplicacion': (multiplicar_matrices, multiplicar_matrices_pasos, "Se multiplica la matriz A por la matriz B"),
+}
+
+def operar_matrices(A, B, escalar_a=None, escalar_b=None, operacion='suma', detalle="completo"):
     """
     Realiza la operación entre dos matrices (suma, resta, multiplicación),
     considerando escalares opcionales para cada matriz.
+    detalle: "completo" (cada entrada del resultado desarrollada), "resumen" (sólo las
+    operaciones realizadas) o "ninguno" (sin pasos).
     Devuelve la matriz resultado y los pasos realizados.
     """
+    validar_detalle(detalle)
     pasos = []
     validar_matriz(A)
     validar_matriz(B)
@@ -23,31 +37,31 @@ def operar_matrices(A, B, escalar_a=None, escalar_b=None, operacion='suma'):
         except Exception:
             raise ValueError("Escalar A inválido")
         A = multiplicar_matriz_escalar(A, escalar_a)
-        pasos.append(f"Se multiplica Matriz A por escalar {matriz_a_str([[escalar_a]])[0][0]}")
-        pasos.append(f"Matriz A tras multiplicar por escalar: {matriz_a_str(A)}")
+        if detalle != "ninguno":
+            pasos.append(f"Se multiplica Matriz A por escalar {matriz_a_str([[escalar_a]])[0][0]}")
+        if detalle == "completo":
+            pasos.append(f"Matriz A tras multiplicar por escalar: {matriz_a_str(A)}")
     if escalar_b is not None and escalar_b != '':
         try:
             escalar_b = Fraction(escalar_b)
         except Exception:
             raise ValueError("Escalar B inválido")
         B = multiplicar_matriz_escalar(B, escalar_b)
-        pasos.append(f"Se multiplica Matriz B por escalar {matriz_a_str([[escalar_b]])[0][0]}")
-        pasos.append(f"Matriz B tras multiplicar por escalar: {matriz_a_str(B)}")
-    # Realizar operación con pasos
-    if operacion == 'suma':
-        resultado, pasos_op = sumar_matrices_pasos(A, B)
-        pasos.append("Se suman las matrices A y B")
-        pasos.extend(pasos_op)
-    elif operacion == 'resta':
-        resultado, pasos_op = restar_matrices_pasos(A, B)
-        pasos.append("Se resta la matriz B de la matriz A")
-        pasos.extend(pasos_op)
-    elif operacion == 'multiplicacion':
-        resultado, pasos_op = multiplicar_matrices_pasos(A, B)
-        pasos.append("Se multiplica la matriz A por la matriz B")
+        if detalle != "ninguno":
+            pasos.append(f"Se multiplica Matriz B por escalar {matriz_a_str([[escalar_b]])[0][0]}")
+        if detalle == "completo":
+            pasos.append(f"Matriz B tras multiplicar por escalar: {matriz_a_str(B)}")
+    if operacion not in _OPERACIONES:
+        raise ValueError("Operación no soportada")
+    operar, operar_con_pasos, descripcion = _OPERACIONES[operacion]
+    if detalle == "completo":
+        resultado, pasos_op = operar_con_pasos(A, B)
+        pasos.append(descripcion)
         pasos.extend(pasos_op)
     else:
-        raise ValueError("Operación no soportada")
+        resultado = operar(A, B)
+        if detalle == "resumen":
+            pasos.append(descripcion)
     return {
         'resultado': matriz_a_str(resultado),
         'pasos': pasos
@@ -0,0 +1,146 @@
+"""
+Registro de pasos con deltas por fila.
+
+Guardar una copia completa de la matriz en cada operación elemental cuesta O(n²) por paso y
+O(n⁴) en una eliminación n×n. El registro guarda la matriz inicial (en strings) y, por cada
+paso, sólo lo que cambia: un intercambio de filas o la fila resultante de una operación. Las
+matrices de cada paso se reconstruyen al recorrerlo; las filas no cambiadas se comparten
+entre pasos (nunca se modifican, sólo se sustituyen), así que cada instantánea cuesta O(n).
+
+Se comporta como una secuencia de (descripcion, matriz en strings o None), que es lo que
+esperan las plantillas. Para los pasos que guardan la matriz completa, InstantaneasFilas
+reutiliza los strings de las filas que no cambiaron desde la instantánea anterior.
+
+Los métodos con paso a paso aceptan un nivel de detalle (NIVELES_DETALLE): "completo" (una
+entrada por operación elemental), "resumen" (una por columna pivote) o "ninguno" (sólo el
+resultado: el registro queda vacío y no se formatea ningún paso).
+"""
+from collections.abc import Sequence
+from itertools import islice
+
+_MATRIZ, _INTERCAMBIO, _FILA, _ESTADO = range(4)
+
+NIVELES_DETALLE = ("completo", "resumen", "ninguno")
+
+
+def validar_detalle(detalle):
+    if detalle not in NIVELES_DETALLE:
+        raise ValueError(f"Nivel de detalle no válido: {detalle}")
+
+
+class RegistroPasos(Sequence):
+    """Pasos (descripcion, matriz) guardados como matriz base + deltas por fila."""
+    __slots__ = ('_base', '_entradas')
+
+    def __init__(self, base=None):
+        """`base`: matriz de trabajo inicial, si los primeros deltas no parten de un paso con matriz."""
+        self._base = base
+        self._entradas = []
+
+    def iniciar(self, descripcion, matriz):
+        """Paso con la matriz completa, que pasa a ser la matriz de trabajo de los deltas siguientes."""
+        self._entradas.append((_MATRIZ, descripcion, matriz, True))
+
+    def anotar(self, descripcion, matriz=None):
+        """Paso suelto (explicación o matriz distinta de la de trabajo); no cambia la matriz de trabajo."""
+        self._entradas.append((_MATRIZ, descripcion, matriz, False))
+
+    def intercambio(self, descripcion, i, j):
+        self._entradas.append((_INTERCAMBIO, descripcion, i, j))
+
+    def fila(self, descripcion, i, valores):
+        """La fila i de la matriz de trabajo pasa a ser `valores` (lista de strings)."""
+        self._entradas.append((_FILA, descripcion, i, valores))
+
+    def estado(self, descripcion):
+        """Paso que muestra la matriz de trabajo actual (sin guardar otra copia)."""
+        self._entradas.append((_ESTADO, descripcion, None, None))
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def descripcion(self, indice):
+        """Descripción del paso `indice` sin reconstruir ninguna matriz."""
+        return self._entradas[indice][1]
+
+    def sin_paso(self, indice):
+        """
+        Copia del registro sin el paso `indice`, que no debe cambiar la matriz de trabajo (un
+        paso `estado` o `anotar`). Comparte las filas guardadas: no copia ninguna matriz.
+        """
+        if indice < 0:
+            indice += len(self)
+        tipo, _, _, cambia = self._entradas[indice]
+        if tipo in (_INTERCAMBIO, _FILA) or (tipo == _MATRIZ and cambia):
+            raise ValueError("Sólo se puede quitar un paso que no cambia la matriz de trabajo")
+        copia = RegistroPasos(self._base)
+        copia._entradas = self._entradas[:indice] + self._entradas[indice + 1:]
+        return copia
+
+    def __iter__(self):
+        return self._reproducir(0)
+
+    def _reproducir(self, desde):
+        """Pasos a partir de `desde`; los anteriores sólo aplican su delta, sin construir la matriz."""
+        trabajo = list(self._base) if self._base is not None else None
+        for indice, (tipo, descripcion, a, b) in enumerate(self._entradas):
+            if tipo == _MATRIZ:
+                if b:
+                    trabajo = list(a)
+                if indice >= desde:
+                    yield descripcion, a
+                continue
+            if tipo == _INTERCAMBIO:
+                trabajo[a], trabajo[b] = trabajo[b], trabajo[a]
+            elif tipo == _FILA:
+                trabajo[a] = b
+            if indice >= desde:
+                yield descripcion, list(trabajo)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, salto = indice.indices(len(self))
+            if salto != 1:
+                return list(islice(self, inicio, fin, salto))
+            return list(islice(self._reproducir(inicio), max(0, fin - inicio)))
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de paso fuera de rango")
+        return next(self._reproducir(indice))
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __repr__(self):
+        return f"RegistroPasos({len(self)} pasos)"
+
+
+class InstantaneasFilas:
+    """
+    Formatea las matrices de pasos consecutivos reutilizando los strings de cada fila que no
+    cambió desde la instantánea anterior: mismo objeto fila (las filas nunca se modifican en
+    su sitio, sólo se sustituyen) y misma clave (p. ej. el denominador de la fila).
+    `formatear(fila, clave)` -> lista de strings.
+    """
+    __slots__ = ('_formatear', '_anteriores')
+
+    def __init__(self, formatear):
+        self._formatear = formatear
+        self._anteriores = {}
+
+    def __call__(self, filas, claves=None):
+        actuales = {}
+        matriz = []
+        for i, fila in enumerate(filas):
+            clave = claves[i] if claves is not None else None
+            previa = self._anteriores.get(id(fila))
+            if previa is not None and previa[0] is fila and previa[1] == clave:
+                texto = previa[2]
+            else:
+                texto = self._formatear(fila, clave)
+            # se guarda la fila para que su id no se reutilice mientras siga en el diccionario
+            actuales[id(fila)] = (fila, clave, texto)
+            matriz.append(texto)
+        self._anteriores = actuales
+        return matriz
@@ -1,25 +1,11 @@
-from app.logic.utils import validar_matriz, subindice, fraccion_str
+from app.logic.cache_factorizaciones import cache_por_matriz
+from app.logic.eliminacion_dispersa import (a_filas_dispersas, dispersa_a_str, gauss_jordan_disperso,
+                                            nota_dispersa, usar_dispersa)
+from app.logic.eliminacion import eliminar, observadores_pasos
+from app.logic.matriz_racional import MatrizRacional
+from app.logic.registro_pasos import RegistroPasos, validar_detalle
+from app.logic.utils import validar_matriz
 from fractions import Fraction
-import math
-
-
-def _simplify_row(row):
-    if not row:
-        return row
-    dens = [f.denominator for f in row]
-    L = 1
-    for d in dens:
-        if d:
-            L = math.lcm(L, d)
-    Ns = [f.numerator * (L // f.denominator) for f in row]
-    g = abs(L)
-    for n in Ns:
-        g = math.gcd(g, n)
-    if g == 0:
-        return [Fraction(0, 1) for _ in row]
-    new_den = L // g
-    new_row = [Fraction(n // g, new_den) for n in Ns]
-    return new_row
 
 
 def _to_fraction(x, max_den=10**6):
@@ -38,13 +24,31 @@ def _to_fraction(x, max_den=10**6):
             return Fraction(0, 1)
 
 
-def rref(matriz):
+def _rref_disperso(matriz, m, detalle):
+    filas = a_filas_dispersas(matriz, _to_fraction)
+    pasos = RegistroPasos()
+    if detalle != "ninguno":
+        pasos.iniciar("Matriz inicial", dispersa_a_str(filas, m))
+        pasos.anotar(nota_dispersa(matriz))
+    filas, _ = gauss_jordan_disperso(filas, range(m), pasos if detalle == "completo" else None)
+    matriz_reducida = dispersa_a_str(filas, m)
+    if detalle != "ninguno":
+        pasos.anotar("Matriz reducida (RREF)", matriz_reducida)
+    return matriz_reducida, pasos
+
+
+@cache_por_matriz('rref', convertir=_to_fraction)
+def rref(matriz, metodo="auto", detalle="completo"):
     """
     Calcula la forma reducida por filas (RREF) de una matriz cualquiera.
+    metodo: "densa", "dispersa" (filas dispersas, pivote de Markowitz) o "auto", que usa la
+    dispersa en matrices grandes con pocos no nulos.
+    detalle: "completo", "resumen" (un paso por columna pivote) o "ninguno" (sin pasos).
     Devuelve: (matriz_reducida_str, pasos)
-    pasos: lista de tuplas (descripcion, matriz_en_strings)
+    pasos: RegistroPasos, secuencia de tuplas (descripcion, matriz_en_strings o None)
     """
     validar_matriz(matriz)
+    validar_detalle(detalle)
     n = len(matriz)
     if n == 0:
         return [], []
@@ -52,50 +56,16 @@ def rref(matriz):
     if any(len(fila) != m for fila in matriz):
         raise ValueError("Todas las filas deben tener la misma longitud")
 
-    A = [[_to_fraction(elem) for elem in fila] for fila in matriz]
-    pasos = [("Matriz inicial", [fila.copy() for fila in A])]
-
-    row = 0
-    for col in range(m):
-        if row >= n:
-            break
-        # buscar pivot
-        pivot_row = None
-        for r in range(row, n):
-            if A[r][col] != 0:
-                pivot_row = r
-                break
-        if pivot_row is None:
-            continue
-        # swap
-        if pivot_row != row:
-            A[row], A[pivot_row] = A[pivot_row], A[row]
-            A[row] = _simplify_row(A[row])
-            A[pivot_row] = _simplify_row(A[pivot_row])
-            pasos.append((f"F{subindice(row+1)} ↔ F{subindice(pivot_row+1)}", [fila.copy() for fila in A]))
-        # normalize pivot row
-        pivote = A[row][col]
-        A[row] = [elem / pivote for elem in A[row]]
-        A[row] = _simplify_row(A[row])
-        pasos.append((f"F{subindice(row+1)} → F{subindice(row+1)} ÷ {fraccion_str(pivote)}", [fila.copy() for fila in A]))
-        # eliminate other rows
-        for r in range(n):
-            if r != row:
-                factor = A[r][col]
-                if factor != 0:
-                    A[r] = [A[r][k] - factor * A[row][k] for k in range(m)]
-                    A[r] = _simplify_row(A[r])
-                    pasos.append((f"F{subindice(r+1)} → F{subindice(r+1)} − {fraccion_str(factor)} × F{subindice(row+1)}", [fila.copy() for fila in A]))
-        row += 1
-
-    pasos.append(("Matriz reducida (RREF)", [fila.copy() for fila in A]))
-
-    # convertir a strings
-    matriz_reducida = [[fraccion_str(A[i][j]) for j in range(m)] for i in range(n)]
-    pasos_str = []
-    for descripcion, matriz_paso in pasos:
-        matriz_paso_str = [[fraccion_str(elem) for elem in fila] for fila in matriz_paso]
-        pasos_str.append((descripcion, matriz_paso_str))
+    if usar_dispersa(matriz, metodo):
+        return _rref_disperso(matriz, m, detalle)
 
-    return matriz_reducida, pasos_str
+    A = MatrizRacional.desde_filas(matriz, _to_fraction)
+    registro = RegistroPasos()
+    if detalle != "ninguno":
+        registro.iniciar("Matriz inicial", A.a_str())
+    eliminar(A, range(m), observadores=observadores_pasos(registro, detalle))
 
+    matriz_reducida = A.a_str()
+    if detalle != "ninguno":
+        registro.anotar("Matriz reducida (RREF)", matriz_reducida)
+    return matriz_reducida, registro
@@ -0,0 +1,72 @@
+"""
+Traza de iteraciones de los métodos de raíces (bisección, falsa posición, Brent, Newton-Raphson,
+tangente).
+
+Cada columna numérica es un array('d') (8 bytes por valor, sin una lista ni strings por
+iteración) y las de texto (el tipo de paso de Brent) son listas. Registrar una iteración no
+formatea nada: la plantilla formatea las celdas al recorrer `filas_formateadas()` (macro de
+_traza_iteraciones.html) y `a_dict()` devuelve los números tal cual para JSON.
+"""
+import math
+from array import array
+
+
+def _celda(valor, formato):
+    if formato is None:
+        return str(valor)
+    if valor != valor:
+        return "NaN"
+    return format(valor, formato)
+
+
+def _numero_json(valor):
+    # NaN e infinito no existen en JSON
+    return valor if math.isfinite(valor) else None
+
+
+class TrazaIteraciones:
+    """Tabla de iteraciones guardada por columnas; la columna "Iteración" (1, 2, ...) es implícita."""
+    __slots__ = ('cabeceras', 'formatos', '_columnas')
+
+    def __init__(self, columnas):
+        """columnas: pares (cabecera, formato de format(), p. ej. ".6f", o None para una columna de texto)."""
+        self.cabeceras = tuple(cabecera for cabecera, _ in columnas)
+        self.formatos = tuple(formato for _, formato in columnas)
+        self._columnas = tuple(array('d') if formato is not None else [] for formato in self.formatos)
+
+    def registrar(self, *valores):
+        """Añade una iteración con un valor por columna, en el orden de las cabeceras."""
+        if len(valores) != len(self._columnas):
+            raise ValueError(f"Se esperaban {len(self._columnas)} valores por iteración")
+        for columna, valor in zip(self._columnas, valores):
+            columna.append(valor)
+
+    def __len__(self):
+        return len(self._columnas[0]) if self._columnas else 0
+
+    def columna(self, cabecera):
+        """Valores de una columna (array('d') o lista de strings)."""
+        return self._columnas[self.cabeceras.index(cabecera)]
+
+    def filas(self):
+        """Tuplas (iteración, valores...) sin formatear."""
+        return zip(range(1, len(self) + 1), *self._columnas)
+
+    def filas_formateadas(self):
+        """Tuplas (iteración, celdas...) con cada valor formateado según su columna."""
+        formatos = self.formatos
+        for iteracion, *valores in self.filas():
+            yield (iteracion, *(_celda(valor, formato) for valor, formato in zip(valores, formatos)))
+
+    def a_dict(self):
+        """Cabeceras y columnas (números sin formatear, NaN/inf como None) para serializar a JSON."""
+        return {
+            'cabeceras': ['Iteración', *self.cabeceras],
+            'columnas': [list(range(1, len(self) + 1))] + [
+                [_numero_json(v) for v in columna] if formato is not None else list(columna)
+                for columna, formato in zip(self._columnas, self.formatos)
+            ],
+        }
+
+    def __repr__(self):
+        return f"TrazaIteraciones({len(self)} iteraciones)"
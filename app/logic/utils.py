@@ -6,11 +6,15 @@ import unicodedata
 from fractions import Fraction
 import ast
 import math
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
-# nombres de math permitidos para evaluaciones seguras
-_NOMBRES_MATH = {name for name in dir(math) if not name.startswith("_")}
-_NOMBRES_PERMITIDOS = _NOMBRES_MATH | {"x"}
+from .multiplicacion import multiplicar
+from .registro_pasos import RegistroPasos
+
+# nombres de math permitidos para evaluaciones seguras (los entornos de compilar_lambda los definen)
+NOMBRES_MATH = frozenset(name for name in dir(math) if not name.startswith("_"))
+_NOMBRES_PERMITIDOS = NOMBRES_MATH | {"x"}
 
 # operadores permitidos para binarios y unarios
 _ALLOWED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv)
@@ -56,18 +60,82 @@ def validar_nodo(node: ast.AST) -> None:
         raise ValueError(f"Elemento de expresión {type(node).__name__} no permitido. No se permiten conjuntos (llaves) ni expresiones con llaves en la función. Por favor, ingrese una expresión matemática válida.")
 
 
-def evaluar(funcion: str, x: Any) -> float:
+# entorno de evaluación construido una sola vez: funciones y constantes de math
+_ENTORNO_MATH = {name: getattr(math, name) for name in NOMBRES_MATH}
+_ENTORNO_MATH["__builtins__"] = None
+
+# tamaño máximo de las caches de expresiones compiladas
+_MAX_EXPRESIONES = 256
+
+
+@lru_cache(maxsize=_MAX_EXPRESIONES)
+def _normalizar_expresion(funcion: str) -> str:
+    """Cache de `transformar_sintaxis` para la cadena tal como la escribe el usuario."""
+    return transformar_sintaxis(funcion)
+
+
+def _compilar_en(expr: str, entorno: dict) -> Callable[[Any], Any]:
     """
-    Evalúa la función (string) con un valor dado x de forma segura.
-    Convierte la sintaxis mediante `transformar_sintaxis`, parsea a AST, valida y evalúa
-    usando únicamente el módulo math y la variable x en el entorno.
+    Parsea, valida y compila una expresión ya normalizada a una función de una variable.
+    El cuerpo validado se envuelve en un `lambda x: ...` cuyo entorno global es `entorno`,
+    de modo que cada evaluación es una simple llamada.
     """
-    expr = transformar_sintaxis(funcion)
     tree = ast.parse(expr, mode="eval")
     validar_nodo(tree)
-    env = {name: getattr(math, name) for name in _NOMBRES_MATH}
-    env["x"] = x
-    return float(eval(compile(tree, filename="<ast>", mode="eval"), {"__builtins__": None}, env))
+    argumentos = ast.arguments(posonlyargs=[], args=[ast.arg(arg="x")], kwonlyargs=[],
+                               kw_defaults=[], defaults=[])
+    lambda_ast = ast.Expression(body=ast.Lambda(args=argumentos, body=tree.body))
+    ast.fix_missing_locations(lambda_ast)
+    return eval(compile(lambda_ast, filename="<ast>", mode="eval"), dict(entorno))
+
+
+# id(entorno) -> (entorno, compilador con cache LRU propia); se guarda el entorno para que su id no se reutilice
+_COMPILADORES = {}
+
+
+def _compilador(entorno: dict) -> Callable[[str], Callable[[Any], Any]]:
+    registrado = _COMPILADORES.get(id(entorno))
+    if registrado is None or registrado[0] is not entorno:
+        registrado = (entorno, lru_cache(maxsize=_MAX_EXPRESIONES)(lambda expr: _compilar_en(expr, entorno)))
+        _COMPILADORES[id(entorno)] = registrado
+    return registrado[1]
+
+
+def compilar_lambda(funcion: str, entorno: dict) -> Callable[[Any], Any]:
+    """
+    Compila la expresión del usuario a `lambda x: ...` con los nombres de math resueltos en
+    `entorno` (nombre de NOMBRES_MATH -> implementación; "__builtins__": None). Cada entorno
+    tiene su propia cache, así que la misma expresión se valida una sola vez por entorno.
+    Lanza SyntaxError o ValueError si la expresión no es válida.
+    """
+    return _compilador(entorno)(_normalizar_expresion(str(funcion)))
+
+
+def compilar_funcion(funcion: str) -> Callable[[Any], Any]:
+    """
+    Devuelve la función compilada (validada una sola vez por proceso) para la expresión dada.
+    Lanza SyntaxError o ValueError igual que `evaluar` si la expresión no es válida.
+    """
+    return _compilar_math(_normalizar_expresion(str(funcion)))
+
+
+# compilar_lambda(funcion, _ENTORNO_MATH) sin buscar el compilador en cada llamada (`evaluar` es ruta caliente)
+_compilar_math = _compilador(_ENTORNO_MATH)
+
+
+def estadisticas_cache_expresiones() -> dict:
+    """Aciertos/fallos de la cache de expresiones compiladas (útil para depurar)."""
+    info = _compilar_math.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "maxsize": info.maxsize, "currsize": info.currsize}
+
+
+def evaluar(funcion: str, x: Any) -> float:
+    """
+    Evalúa la función (string) con un valor dado x de forma segura.
+    La expresión se transforma, parsea, valida y compila una sola vez (ver `compilar_funcion`);
+    las llamadas siguientes reutilizan la función compilada.
+    """
+    return float(compilar_funcion(funcion)(x))
 
 
 def validar_matriz(matriz):
@@ -95,23 +163,9 @@ def agregar_multiplicacion_implicita(ecuacion, variables):
     return ecuacion
 
 
-def multiplicar_matrices(A, B):
-    filas_A = len(A)
-    columnas_A = len(A[0])
-    filas_B = len(B)
-    columnas_B = len(B[0])
-
-    if columnas_A != filas_B:
-        raise ValueError("El número de columnas de A debe ser igual al número de filas de B")
-
-    resultado = [[0 for _ in range(columnas_B)] for _ in range(filas_A)]
-
-    for i in range(filas_A):
-        for j in range(columnas_B):
-            for k in range(columnas_A):
-                resultado[i][j] += A[i][k] * B[k][j]
-
-    return resultado
+def multiplicar_matrices(A, B, metodo="auto"):
+    """A·B con el motor de multiplicacion.py (Bᵀ, bloques o Strassen según el tamaño)."""
+    return multiplicar(A, B, metodo)
 
 def multiplicar_matriz_escalar(matriz, escalar):
     filas = len(matriz)
@@ -178,16 +232,39 @@ def crear_matriz_identidad(tamanio):
 
 # fuciones auxiliares para mostrar los pasos con subindices y fracciones
 SUBS = {str(i): chr(8320 + i) for i in range(10)}
+_TABLA_SUBINDICES = str.maketrans(SUBS)
+# subíndices precalculados: los índices de filas, columnas y variables casi nunca pasan de aquí
+_MAX_SUBINDICE = 1024
+_SUBINDICES = tuple(str(i).translate(_TABLA_SUBINDICES) for i in range(_MAX_SUBINDICE))
+# valores no exactos (floats, Decimal, cadenas) formateados recientemente; Fraction e int no
+# pasan por aquí: formatearlos directamente es más barato que calcular su hash
+_MAX_FORMATOS = 4096
+
 def subindice(num):
     """Convierte un número en subíndices unicode para notación matemática."""
-    return ''.join(SUBS.get(d, d) for d in str(num))
+    if type(num) is int and 0 <= num < _MAX_SUBINDICE:
+        return _SUBINDICES[num]
+    return str(num).translate(_TABLA_SUBINDICES)
 
 def fraccion_str(frac):
     """Convierte un Fraction o número en string, mostrando fracción si es necesario y
     asegurando que la fracción esté reducida.
     """
-    from fractions import Fraction
-    # Si ya es Fraction, usarlo directamente (ya está reducido)
+    tipo = type(frac)
+    # Fraction ya está reducido
+    if tipo is Fraction:
+        if frac.denominator == 1:
+            return str(frac.numerator)
+        return f"{frac.numerator}/{frac.denominator}"
+    if tipo is int:
+        return str(frac)
+    try:
+        return _fraccion_str_memo(frac)
+    except TypeError:
+        # valor no hashable
+        return _fraccion_str(frac)
+
+def _fraccion_str(frac):
     if isinstance(frac, Fraction):
         if frac.denominator == 1:
             return str(frac.numerator)
@@ -211,6 +288,9 @@ def fraccion_str(frac):
     except Exception:
         return str(frac)
 
+# typed: 1, 1.0 y True son claves distintas (True se muestra como "True")
+_fraccion_str_memo = lru_cache(maxsize=_MAX_FORMATOS, typed=True)(_fraccion_str)
+
 def matriz_a_str(matriz):
     """
     Convierte una matriz (lista de listas) a formato string/fracción para mostrar en la web.
@@ -224,8 +304,8 @@ def sumar_matrices_pasos(A, B):
     filas_A = len(A)
     columnas_A = len(A[0])
     resultado = [[0 for _ in range(columnas_A)] for _ in range(filas_A)]
-    pasos = []
-    from fractions import Fraction
+    # cada paso completa una fila: se guarda sólo esa fila
+    pasos = RegistroPasos(base=matriz_a_str(resultado))
     for i in range(filas_A):
         fila_paso = []
         for j in range(columnas_A):
@@ -237,7 +317,7 @@ def sumar_matrices_pasos(A, B):
             fila_paso.append(f"F{subindice(i+1)}[{subindice(j+1)}] = {a_str} + {b_str} = {suma_str}")
         # Create a clean text (no HTML) and attach the current matrix as strings so templates render pills + table
         texto = f"Operación en fila {subindice(i+1)}: " + ' ; '.join(fila_paso)
-        pasos.append((texto, matriz_a_str(resultado)))
+        pasos.fila(texto, i, [fraccion_str(val) for val in resultado[i]])
     return resultado, pasos
 
 def restar_matrices_pasos(A, B):
@@ -247,8 +327,7 @@ def restar_matrices_pasos(A, B):
     filas_A = len(A)
     columnas_A = len(A[0])
     resultado = [[0 for _ in range(columnas_A)] for _ in range(filas_A)]
-    pasos = []
-    from fractions import Fraction
+    pasos = RegistroPasos(base=matriz_a_str(resultado))
     for i in range(filas_A):
         fila_paso = []
         for j in range(columnas_A):
@@ -259,35 +338,26 @@ def restar_matrices_pasos(A, B):
             resta_str = fraccion_str(resta)
             fila_paso.append(f"F{subindice(i+1)}[{subindice(j+1)}] = {a_str} - {b_str} = {resta_str}")
         texto = f"Operación en fila {subindice(i+1)}: " + ' ; '.join(fila_paso)
-        pasos.append((texto, matriz_a_str(resultado)))
+        pasos.fila(texto, i, [fraccion_str(val) for val in resultado[i]])
     return resultado, pasos
 
 def multiplicar_matrices_pasos(A, B):
     """
     Multiplica dos matrices mostrando el paso a paso y la matriz en cada paso con notación matemática unicode.
     """
-    filas_A = len(A)
-    columnas_A = len(A[0])
-    filas_B = len(B)
-    columnas_B = len(B[0])
-    resultado = [[0 for _ in range(columnas_B)] for _ in range(filas_A)]
-    pasos = []
-    from fractions import Fraction
-    for i in range(filas_A):
+    resultado = multiplicar(A, B)
+    # cada entrada de A y B se formatea una vez, no una por producto
+    A_str = matriz_a_str(A)
+    Bt_str = [list(columna) for columna in zip(*matriz_a_str(B))]
+    pasos = RegistroPasos(base=[["0"] * len(B[0]) for _ in A])
+    for i, fila_A in enumerate(A_str):
         fila_paso = []
-        for j in range(columnas_B):
-            suma = 0
-            detalle = []
-            for k in range(columnas_A):
-                a_str = fraccion_str(A[i][k])
-                b_str = fraccion_str(B[k][j])
-                detalle.append(f"{a_str}·{b_str}")
-                suma += A[i][k] * B[k][j]
-            suma_str = fraccion_str(suma)
-            resultado[i][j] = suma
-            fila_paso.append(f"F{subindice(i+1)}[{subindice(j+1)}] = " + ' + '.join(detalle) + f" = {suma_str}")
+        fila_str = [fraccion_str(valor) for valor in resultado[i]]
+        for j, columna_B in enumerate(Bt_str):
+            detalle = ' + '.join(f"{a_str}·{b_str}" for a_str, b_str in zip(fila_A, columna_B))
+            fila_paso.append(f"F{subindice(i+1)}[{subindice(j+1)}] = {detalle} = {fila_str[j]}")
         texto = f"Operación en fila {subindice(i+1)}: " + ' ; '.join(fila_paso)
-        pasos.append((texto, matriz_a_str(resultado)))
+        pasos.fila(texto, i, fila_str)
     return resultado, pasos
 
 
@@ -320,7 +390,9 @@ def transformar_sintaxis(expr: str) -> str:
     # insertar multiplicación implícita entre: número o paréntesis cerrado y paréntesis abierto/función/variable
     # ejemplos: 2x -> 2*x, 2(x+1) -> 2*(x+1), )( -> )*(
     # solamente entre número/parentesis cerrado y letra o '('
-    s = re.sub(r"(?<=[0-9\)])\s*(?=[A-Za-z\(])", "*", s)
+    # (los dígitos que forman parte de un nombre, como en log10 o atan2, no cuentan como número)
+    s = re.sub(r"(?<![A-Za-z_0-9.])(\d+(?:\.\d*)?|\.\d+)\s*(?=[A-Za-z\(])", r"\1*", s)
+    s = re.sub(r"(?<=\))\s*(?=[A-Za-z\(])", "*", s)
     # eliminar caracteres unicode invisibles y normalizar espacios
     s = unicodedata.normalize('NFKC', s)
     s = re.sub(r"\s+", " ", s)
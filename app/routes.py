@@ -1,11 +1,15 @@
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, render_template, request, jsonify, make_response
+# Sólo la lógica de matrices (Python puro) se importa aquí; los métodos numéricos y
+# todas_las_raices (SymPy) se importan dentro de su vista al primer uso.
 from app import (gauss_jordan, resolver_cramer, gauss_jordan_pasos,
-                 eliminacion_gaussiana, matriz_desde_formulario, traspuesta,
-                 calcular_determinante, biseccion, operar_matrices,
-                 falsa_posicion, generate_preview_plot_for_function, generar_grafico_por_defecto)
-from app.logic.utils import fraccion_str
+                 eliminacion_gaussiana, matriz_desde_formulario, matriz_desde_texto, traspuesta,
+                 calcular_determinante, operar_matrices, factorizar_lu,
+                 generate_preview_plot_for_function,
+                 etag_vista_previa, MuestreoFuncion, VENTANA_DETECCION, MUESTRAS_DETECCION,
+                 paginar_pasos, pagina_pasos, PASOS_POR_PAGINA)
+from app.logic.utils import fraccion_str, matriz_a_str
 from app.logic.rref import rref
-from app.logic.todas_las_raices import todas_las_raices
+import math
 import re
 
 routes_bp = Blueprint('routes_bp', __name__)
@@ -26,6 +30,111 @@ def validar_matriz(matriz):
                 raise ValueError(f"Todos los elementos deben ser números o fracciones. Valor inválido: '{val}'")
     return True
 
+def _respuesta_vista_previa(n_points=800):
+    """
+    Respuesta común de los endpoints /<metodo>/preview.
+    La vista previa sólo depende de (función normalizada, límites, resolución), así que el ETag se
+    calcula sin renderizar: si el cliente ya la tiene se responde 304 y, si no, se sirve desde la
+    cache de vistas previas compartida por todas las rutas.
+    """
+    try:
+        funcion = request.form.get('funcion', '').strip()
+        limite_inferior = request.form.get('limite_inferior', '').strip()
+        limite_superior = request.form.get('limite_superior', '').strip()
+        if not funcion:
+            return jsonify({'error': 'Función vacía'}), 400
+        etag = etag_vista_previa(funcion, limite_inferior, limite_superior, n_points)
+        if etag in request.if_none_match:
+            respuesta = make_response('', 304)
+        else:
+            plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=n_points)
+            respuesta = jsonify({'plot_data': plot_data})
+        respuesta.set_etag(etag)
+        return respuesta
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _pide_json():
+    """Si la petición a un método de raíces pide la respuesta en JSON (?formato=json)."""
+    return request.args.get('formato') == 'json'
+
+
+def _grafico_e_intervalo(funcion, limite_inferior, limite_superior):
+    """
+    Parte común de los métodos con intervalo (bisección, Brent, falsa posición, tangente): la
+    gráfica sale de un MuestreoFuncion sobre la ventana de vista previa y, si falta algún límite,
+    se empieza por el primer intervalo con cambio de signo de un muestreo en VENTANA_DETECCION
+    con MUESTRAS_DETECCION puntos. Si el cliente mandó la imagen de la vista previa
+    (preview_image) se usa tal cual. Devuelve (plot_data, limite_inferior, limite_superior,
+    intervalos detectados o None). Con ?formato=json no se genera la gráfica.
+    """
+    plot_data = request.form.get('preview_image', '')
+    if _pide_json():
+        plot_data = None
+    elif not plot_data:
+        try:
+            plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=401)
+        except Exception:
+            plot_data = None
+    intervalos = None
+    if not limite_inferior or not limite_superior:
+        try:
+            deteccion = MuestreoFuncion(funcion, limite_inferior, limite_superior, n_points=MUESTRAS_DETECCION,
+                                        a_defecto=VENTANA_DETECCION[0], b_defecto=VENTANA_DETECCION[1])
+            intervalos = deteccion.intervalos
+            limite_inferior, limite_superior = deteccion.intervalo_automatico()
+        except Exception:
+            limite_inferior, limite_superior = '-1', '1'
+    return plot_data, limite_inferior, limite_superior, intervalos
+
+
+def _respuesta_metodo_raices(plantilla, resultado, error, **contexto):
+    """
+    Página del método o, con ?formato=json, la raíz y la traza de iteraciones en JSON
+    (números sin formatear, NaN/inf como null) sin renderizar la tabla.
+    """
+    if not _pide_json():
+        return render_template(plantilla, resultado=resultado, error=error, **contexto)
+    if error or resultado is None:
+        return jsonify({'error': error or 'Envía el formulario del método (POST)'}), 400
+    datos = {clave: None if isinstance(valor, float) and not math.isfinite(valor) else valor
+             for clave, valor in resultado.items() if clave != 'traza'}
+    datos['traza'] = resultado['traza'].a_dict()
+    return jsonify(datos)
+
+@routes_bp.route('/pasos/<clave>')
+def pasos_paginados(clave):
+    """Página de un registro de pasos guardado al renderizar el resultado (?offset=&limit=)."""
+    offset = request.args.get('offset', 0, type=int)
+    limite = request.args.get('limit', PASOS_POR_PAGINA, type=int)
+    pagina = pagina_pasos(clave, offset, limite)
+    if pagina is None:
+        return jsonify({'error': 'Los pasos ya no están disponibles; vuelve a calcular el resultado.'}), 404
+    return jsonify(pagina)
+
+# modos de las rutas de matrices que leen la matriz pegada como texto y no generan pasos
+MODOS_TEXTO = ('exacto_rapido', 'numerico')
+
+def _resolver_desde_texto(matriz_texto, modo):
+    """
+    [A | b] pegada como texto y resuelta sin pasos: "exacto_rapido" por levantamiento p-ádico
+    de Dixon, "numerico" en float64 (LAPACK) con respaldo exacto. Devuelve (soluciones_str, nota).
+    """
+    matriz = matriz_desde_texto(matriz_texto)
+    validar_matriz(matriz)
+    if len(matriz[0]) != len(matriz) + 1:
+        raise ValueError("La matriz debe ser aumentada con n+1 columnas.")
+    A, b = [fila[:-1] for fila in matriz], [fila[-1] for fila in matriz]
+    if modo == 'numerico':
+        from app.logic.numerico import etiqueta_precision, numero_str, resolver_numerico
+        soluciones, info = resolver_numerico(A, b)
+        return [numero_str(x) for x in soluciones], etiqueta_precision(info)
+    from app.logic.dixon import resolver_dixon
+    soluciones, info = resolver_dixon(A, b)
+    nota = (f"Sistema {len(matriz)}×{len(matriz)} resuelto por levantamiento p-ádico (Dixon): "
+            f"{info['iteraciones']} iteración(es) módulo un primo de 62 bits y reconstrucción racional.")
+    return [fraccion_str(x) for x in soluciones], nota
+
 @routes_bp.route('/')
 def index():
     return render_template('index.html')
@@ -35,11 +144,22 @@ def cramer_view():
     resultado = None
     error = None
     pasos = None
-    if request.method == 'POST':
+    matriz_texto = ''
+    modo = request.form.get('modo')
+    detalle = request.form.get('detalle', 'completo')
+    if request.method == 'POST' and modo in MODOS_TEXTO:
+        try:
+            matriz_texto = request.form.get('matriz_texto', '')
+            soluciones, nota = _resolver_desde_texto(matriz_texto, modo)
+            resultado = {'soluciones': soluciones, 'nota': nota}
+        except Exception as e:
+            error = str(e)
+    elif request.method == 'POST':
         try:
             matriz = matriz_desde_formulario(request)
             validar_matriz(matriz)
-            soluciones, det_A, determinantes, pasos = resolver_cramer([fila[:-1] for fila in matriz], [fila[-1] for fila in matriz])
+            soluciones, det_A, determinantes, pasos = resolver_cramer([fila[:-1] for fila in matriz], [fila[-1] for fila in matriz],
+                                                                      detalle=detalle)
             resultado = {
                 'soluciones': soluciones,
                 'det_A': det_A,
@@ -47,37 +167,78 @@ def cramer_view():
             }
         except Exception as e:
             error = str(e)
-    return render_template('cramer.html', resultado=resultado, error=error, pasos=pasos)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('cramer.html', resultado=resultado, error=error, pasos=pasos, paginacion=paginacion, matriz_texto=matriz_texto,
+                           modo=modo, detalle=detalle)
 
 @routes_bp.route('/gauss_jordan', methods=['GET', 'POST'])
 def gauss_jordan_view():
     resultado = None
     error = None
     pasos = None
-    if request.method == 'POST':
+    matriz_texto = ''
+    modo = request.form.get('modo')
+    detalle = request.form.get('detalle', 'completo')
+    if request.method == 'POST' and modo in MODOS_TEXTO:
+        try:
+            matriz_texto = request.form.get('matriz_texto', '')
+            try:
+                soluciones, nota = _resolver_desde_texto(matriz_texto, modo)
+            except ValueError as e:
+                if 'solución única' not in str(e):
+                    raise
+                # sistema singular: Gauss-Jordan da la solución paramétrica (o detecta incompatibilidad)
+                _, soluciones, _ = gauss_jordan(matriz_desde_texto(matriz_texto), detalle='ninguno')
+                nota = None
+            resultado = {'matriz_reducida': None, 'soluciones': soluciones, 'nota': nota}
+        except Exception as e:
+            error = str(e)
+    elif request.method == 'POST':
         try:
             matriz = matriz_desde_formulario(request)
             validar_matriz(matriz)
-            matriz_reducida, soluciones, pasos = gauss_jordan(matriz)
+            matriz_reducida, soluciones, pasos = gauss_jordan(matriz, detalle=detalle)
             resultado = {'matriz_reducida': matriz_reducida, 'soluciones': soluciones}
         except Exception as e:
             error = str(e)
-    return render_template('gauss_jordan.html', resultado=resultado, error=error, pasos=pasos)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('gauss_jordan.html', resultado=resultado, error=error, pasos=pasos, paginacion=paginacion,
+                           matriz_texto=matriz_texto, modo=modo, detalle=detalle)
 
 @routes_bp.route('/matriz_inversa', methods=['GET', 'POST'])
 def matriz_inversa_view():
     resultado = None
     error = None
     pasos = None
-    if request.method == 'POST':
+    matriz_texto = ''
+    modo = request.form.get('modo')
+    detalle = request.form.get('detalle', 'completo')
+    if request.method == 'POST' and modo in MODOS_TEXTO:
+        try:
+            matriz_texto = request.form.get('matriz_texto', '')
+            matriz = matriz_desde_texto(matriz_texto)
+            if modo == 'numerico':
+                from app.logic.numerico import etiqueta_precision, inversa_numerica, numero_str
+                inversa, info = inversa_numerica(matriz)
+                resultado = {'inversa': [[numero_str(x) for x in fila] for fila in inversa],
+                             'nota': etiqueta_precision(info)}
+            else:
+                from app.logic.factorizacion_lu import inversa_lu
+                resultado = {'inversa': matriz_a_str(inversa_lu(matriz)),
+                             'nota': "Inversa exacta resolviendo AX = I sobre la factorización LU."}
+        except Exception as e:
+            error = str(e)
+    elif request.method == 'POST':
         try:
             matriz = matriz_desde_formulario(request)
             validar_matriz(matriz)
-            inversa, pasos = gauss_jordan_pasos(matriz)
+            inversa, pasos = gauss_jordan_pasos(matriz, detalle=detalle)
             resultado = {'inversa': inversa}
         except Exception as e:
             error = str(e)
-    return render_template('matriz_inversa.html', resultado=resultado, error=error, pasos=pasos)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('matriz_inversa.html', resultado=resultado, error=error, pasos=pasos, paginacion=paginacion,
+                           matriz_texto=matriz_texto, modo=modo, detalle=detalle)
 
 @routes_bp.route('/eliminacion_gaussiana', methods=['GET', 'POST'])
 def eliminacion_gaussiana_view():
@@ -85,15 +246,28 @@ def eliminacion_gaussiana_view():
     soluciones = None
     pasos = None
     error = None
-    if request.method == 'POST':
+    nota = None
+    matriz_texto = ''
+    modo = request.form.get('modo')
+    detalle = request.form.get('detalle', 'completo')
+    if request.method == 'POST' and modo in MODOS_TEXTO:
+        try:
+            matriz_texto = request.form.get('matriz_texto', '')
+            soluciones, nota = _resolver_desde_texto(matriz_texto, modo)
+        except Exception as e:
+            error = str(e)
+    elif request.method == 'POST':
         try:
             matriz = matriz_desde_formulario(request)
             validar_matriz(matriz)
-            matriz_triangular, soluciones, pasos = eliminacion_gaussiana(matriz)
+            matriz_triangular, soluciones, pasos = eliminacion_gaussiana(matriz, detalle=detalle)
 
         except Exception as e:
             error  = str(e)
-    return render_template('eliminacion_gaussiana.html', matriz_triangular=matriz_triangular, soluciones=soluciones, pasos=pasos, error=error)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('eliminacion_gaussiana.html', matriz_triangular=matriz_triangular, soluciones=soluciones,
+                           pasos=pasos, paginacion=paginacion, error=error, nota=nota, matriz_texto=matriz_texto, modo=modo,
+                           detalle=detalle)
 
 @routes_bp.route('/traspuesta', methods=['GET', 'POST'])
 def traspuesta_view():
@@ -114,44 +288,70 @@ def determinante_view():
     pasos = None
     det_explanation = None
     error = None
-    if request.method == 'POST':
+    matriz_texto = ''
+    modo = request.form.get('modo')
+    detalle = request.form.get('detalle', 'completo')
+    if request.method == 'POST' and modo == 'numerico':
+        # Numérico: float64 con LAPACK (slogdet), exacto si la matriz está mal condicionada
+        try:
+            matriz_texto = request.form.get('matriz_texto', '')
+            matriz = matriz_desde_texto(matriz_texto)
+            from app.logic.numerico import determinante_numerico, etiqueta_precision, numero_str
+            determinante, info = determinante_numerico(matriz)
+            resultado = {'matriz': None, 'det': numero_str(determinante)}
+            det_explanation = f"Matriz {len(matriz)}×{len(matriz)}. {etiqueta_precision(info)}"
+        except Exception as e:
+            error = str(e)
+    elif request.method == 'POST' and modo == 'exacto_rapido':
+        # Exacto rápido: sin pasos; aritmética modular + CRT si hay procesos para repartir los primos, si no Bareiss
+        try:
+            matriz_texto = request.form.get('matriz_texto', '')
+            matriz = matriz_desde_texto(matriz_texto)
+            from app.logic.determinante_modular import determinante_modular
+            determinante, info = determinante_modular(matriz)
+            n = len(matriz)
+            resultado = {'matriz': None, 'det': fraccion_str(determinante)}
+            if info['reutilizado']:
+                det_explanation = f"Matriz {n}×{n}: determinante ya calculado para esta matriz (cache de factorizaciones)"
+            elif info['motor'] == 'bareiss':
+                det_explanation = (f"Matriz {n}×{n}: determinante por eliminación de Bareiss sin pasos "
+                                   f"(con {info['procesos']} proceso(s) es más rápido que {info['primos_cota']} "
+                                   f"eliminaciones modulares)")
+            else:
+                det_explanation = (f"Matriz {n}×{n}: determinante módulo {info['primos']} primo(s) de 62 bits "
+                                   f"reconstruido con el Teorema Chino del Resto "
+                                   f"(cota de Hadamard: {info['bits_hadamard']:.0f} bits)")
+        except Exception as e:
+            error = str(e)
+    elif request.method == 'POST':
         try:
             matriz = matriz_desde_formulario(request)
             validar_matriz(matriz)
 
             # Llamar solo a calcular_determinante para evitar ejecutar eliminación dos veces
-            determinante, pasos_all = calcular_determinante(matriz)
+            determinante, pasos_all = calcular_determinante(matriz, detalle=detalle)
 
-            # Extraer la matriz triangular desde los pasos de eliminación (si está disponible)
+            # Los pasos terminan en "Matriz triangular superior" + "Determinante = ..." o, si la matriz
+            # es singular, en el paso que lo indica con la matriz tal como quedó. Sólo se reconstruyen
+            # esos dos últimos pasos; el resto del registro se pagina sin materializarlo.
             triangular = None
+            pasos = pasos_all
             if pasos_all:
-                # buscar paso que contenga la matriz triangular (etiqueta o último paso con matriz)
-                for paso in pasos_all:
-                    if isinstance(paso, (list, tuple)) and paso[1]:
-                        texto = paso[0] if isinstance(paso[0], str) else ''
-                        if 'triangular' in texto.lower() or 'matriz triangular' in texto.lower():
-                            triangular = paso[1]
-                            break
-                # fallback: usar la última matriz que aparezca en los pasos
-                if triangular is None:
-                    for paso in reversed(pasos_all):
-                        if isinstance(paso, (list, tuple)) and paso[1]:
-                            triangular = paso[1]
-                            break
+                for _, matriz_paso in reversed(pasos_all[-2:]):
+                    if matriz_paso:
+                        triangular = matriz_paso
+                        break
+                # explicación final: el último paso (el del determinante o el de matriz singular)
+                det_explanation = pasos_all.descripcion(-1)
+                # quitar el paso "Matriz triangular superior": la triangular ya se muestra en el resultado
+                if len(pasos_all) >= 2 and 'triangular' in pasos_all.descripcion(-2).lower():
+                    pasos = pasos_all.sin_paso(-2)
 
             resultado = {
                 'matriz': triangular,
                 'det': fraccion_str(determinante) if determinante is not None else None
             }
 
-            # Solo quitar el paso que indica explícitamente la "Matriz triangular" para evitar duplicado visual
-            pasos = [p for p in pasos_all if not (isinstance(p, (list, tuple)) and isinstance(p[0], str) and 'triangular' in p[0].lower())]
-
-            # explicación final: extraerla siempre desde la lista original `pasos_all` (contiene el paso determinante)
-            if pasos_all:
-                last = pasos_all[-1]
-                det_explanation = last[0] if isinstance(last, (list, tuple)) else str(last)
-
             # Asegurar que resultado['det'] contenga el valor numérico del determinante
             # Si por alguna razón no está (None o no parece numérico), intentar extraerlo de det_explanation
             import re
@@ -171,7 +371,9 @@ def determinante_view():
 
         except Exception as e:
             error = str(e)
-    return render_template('determinante.html', resultado=resultado, pasos=pasos, det_explanation=det_explanation, error=error)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('determinante.html', resultado=resultado, pasos=pasos, paginacion=paginacion, det_explanation=det_explanation,
+                           error=error, matriz_texto=matriz_texto, modo=modo, detalle=detalle)
 
 @routes_bp.route('/informacion')
 def informacion_view():
@@ -190,12 +392,37 @@ def independencia_lineal():
     resultado = None
     pasos = []
     error = None
-    if request.method == 'POST':
+    matriz_texto = ''
+    modo = request.form.get('modo')
+    detalle = request.form.get('detalle', 'completo')
+    if request.method == 'POST' and modo in MODOS_TEXTO:
+        # sin pasos: sólo el rango (exacto con la cache de factorizaciones, o float64 por SVD)
+        try:
+            matriz_texto = request.form.get('matriz_texto', '')
+            matriz = matriz_desde_texto(matriz_texto)
+            if modo == 'numerico':
+                from app.logic.numerico import etiqueta_precision, rango_numerico
+                rango, info = rango_numerico(matriz)
+                nota = etiqueta_precision(info)
+            else:
+                from app.logic.cache_factorizaciones import obtener_factorizacion
+                rango = obtener_factorizacion(matriz).rango
+                nota = "Rango exacto por forma escalonada con fracciones."
+            columnas = len(matriz[0])
+            estado = "Independientes" if rango == columnas else "Dependientes"
+            resultado = {
+                'matriz_reducida': None,
+                'resultado': [estado, f"El rango de la matriz es {rango} y hay {columnas} vector(es)."],
+                'nota': nota
+            }
+        except Exception as e:
+            error = str(e)
+    elif request.method == 'POST':
         try:
             matriz = matriz_desde_formulario(request)
             validar_matriz(matriz)
             from app.logic.independencia_lineal import comprobar_independencia_lineal
-            matriz_reducida_str, resultado_str, pasos_str = comprobar_independencia_lineal(matriz)
+            matriz_reducida_str, resultado_str, pasos_str = comprobar_independencia_lineal(matriz, detalle=detalle)
             resultado = {
                 'matriz_reducida': matriz_reducida_str,
                 'resultado': resultado_str
@@ -204,13 +431,16 @@ def independencia_lineal():
         except Exception as e:
             error = str(e)
         pass
-    return render_template('independencia_lineal.html', resultado=resultado, pasos=pasos, error=error)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('independencia_lineal.html', resultado=resultado, pasos=pasos, paginacion=paginacion, error=error,
+                           matriz_texto=matriz_texto, modo=modo, detalle=detalle)
 
 @routes_bp.route('/operaciones_matrices', methods=['GET', 'POST'])
 def operaciones_matrices_view():
     resultado = None
     pasos = []
     error = None
+    detalle = request.form.get('detalle', 'completo')
     if request.method == 'POST':
         try:
             # Leer datos del formulario
@@ -237,12 +467,12 @@ def operaciones_matrices_view():
             matriz_a = leer_matriz('matriz_a', filas_a, columnas_a)
             matriz_b = leer_matriz('matriz_b', filas_b, columnas_b)
             # Ejecutar operación
-            res = operar_matrices(matriz_a, matriz_b, escalar_a, escalar_b, operacion)
+            res = operar_matrices(matriz_a, matriz_b, escalar_a, escalar_b, operacion, detalle=detalle)
             resultado = res['resultado']
             pasos = res['pasos']
         except Exception as e:
             error = str(e)
-    return render_template('operaciones_matrices.html', resultado=resultado, pasos=pasos, error=error)
+    return render_template('operaciones_matrices.html', resultado=resultado, pasos=pasos, error=error, detalle=detalle)
 
 @routes_bp.route('/biseccion', methods=['GET', 'POST'])
 def biseccion_view():
@@ -253,55 +483,65 @@ def biseccion_view():
     funcion = ''
     limite_inferior = ''
     limite_superior = ''
+    intervalos = None
     if request.method == 'POST':
         try:
-            # If client submitted a preview image, reuse it instead of regenerating
-            preview_image_b64 = request.form.get('preview_image', '')
             funcion = request.form.get('funcion', '').strip()
             limite_inferior = request.form.get('limite_inferior', '').strip()
             limite_superior = request.form.get('limite_superior', '').strip()
 
-            if preview_image_b64:
-                # Client provided a PNG base64 for preview; use it directly
-                plot_data = preview_image_b64
-                # If limits are empty, try to detect a good interval for the algorithm by sampling
-                if not limite_inferior or not limite_superior:
-                    try:
-                        li, ls = generar_grafico_por_defecto(funcion)
-                        limite_inferior = li
-                        limite_superior = ls
-                    except Exception:
-                        limite_inferior = '-1'
-                        limite_superior = '1'
-            else:
-                # Generar la imagen en servidor reutilizando el helper genérico
-                try:
-                    plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=401)
-                except Exception:
-                    plot_data = None
+            plot_data, limite_inferior, limite_superior, intervalos = _grafico_e_intervalo(
+                funcion, limite_inferior, limite_superior)
 
             # Run bisection algorithm (uses internal parsing/evaluador)
-            raiz, tabla, iteraciones = biseccion(funcion, (limite_inferior, limite_superior))
-            resultado = {'raiz': raiz, 'tabla': tabla, 'iteraciones': iteraciones}
+            from app.logic.biseccion import biseccion
+            raiz, traza, iteraciones = biseccion(funcion, (limite_inferior, limite_superior))
+            resultado = {'raiz': raiz, 'traza': traza, 'iteraciones': iteraciones}
         except Exception as e:
             error = str(e)
-    return render_template('biseccion.html', resultado=resultado, error=error, pasos=pasos,
-                           funcion=funcion, limite_inferior=limite_inferior, limite_superior=limite_superior,
-                           plot_data=plot_data)
+    return _respuesta_metodo_raices('biseccion.html', resultado, error, pasos=pasos,
+                                    funcion=funcion, limite_inferior=limite_inferior, limite_superior=limite_superior,
+                                    plot_data=plot_data, intervalos=intervalos)
 
 
 @routes_bp.route('/biseccion/preview', methods=['POST'])
 def biseccion_preview():
-    try:
-        funcion = request.form.get('funcion', '').strip()
-        limite_inferior = request.form.get('limite_inferior', '').strip()
-        limite_superior = request.form.get('limite_superior', '').strip()
-        if not funcion:
-            return jsonify({'error': 'Función vacía'}), 400
-        plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=800)
-        return jsonify({'plot_data': plot_data})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _respuesta_vista_previa()
+
+
+@routes_bp.route('/brent', methods=['GET', 'POST'])
+def brent_view():
+    resultado = None
+    error = None
+    pasos = None
+    plot_data = None
+    funcion = ''
+    limite_inferior = ''
+    limite_superior = ''
+    intervalos = None
+    if request.method == 'POST':
+        try:
+            funcion = request.form.get('funcion', '').strip()
+            limite_inferior = request.form.get('limite_inferior', '').strip()
+            limite_superior = request.form.get('limite_superior', '').strip()
+
+            plot_data, limite_inferior, limite_superior, intervalos = _grafico_e_intervalo(
+                funcion, limite_inferior, limite_superior)
+
+            # Brent-Dekker: interpolación con respaldo de bisección
+            from app.logic.brent import brent
+            raiz, traza, iteraciones = brent(funcion, (limite_inferior, limite_superior))
+            resultado = {'raiz': raiz, 'traza': traza, 'iteraciones': iteraciones}
+        except Exception as e:
+            error = str(e)
+    return _respuesta_metodo_raices('brent.html', resultado, error, pasos=pasos,
+                                    funcion=funcion, limite_inferior=limite_inferior, limite_superior=limite_superior,
+                                    plot_data=plot_data, intervalos=intervalos)
+
+
+@routes_bp.route('/brent/preview', methods=['POST'])
+def brent_preview():
+    return _respuesta_vista_previa()
 
 
 
@@ -314,53 +554,30 @@ def falsa_posicion_view():
     funcion = ''
     limite_inferior = ''
     limite_superior = ''
+    intervalos = None
+    modo = 'clasico'
     if request.method == 'POST':
         try:
             funcion = request.form.get('funcion', '').strip()
             limite_inferior = request.form.get('limite_inferior', '').strip()
             limite_superior = request.form.get('limite_superior', '').strip()
+            modo = request.form.get('modo', 'clasico')
+            plot_data, limite_inferior, limite_superior, intervalos = _grafico_e_intervalo(
+                funcion, limite_inferior, limite_superior)
 
-            preview_image_b64 = request.form.get('preview_image', '')
-            if preview_image_b64:
-                plot_data = preview_image_b64
-                # If limits are empty, try to detect an interval to use for the algorithm like in biseccion
-                if not limite_inferior or not limite_superior:
-                    try:
-                        li, ls = generar_grafico_por_defecto(funcion)
-                        limite_inferior = li
-                        limite_superior = ls
-                    except Exception:
-                        limite_inferior = '-1'
-                        limite_superior = '1'
-            else:
-                # generate plot based on provided limits
-                try:
-                    plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=401)
-                except Exception as e:
-                    # ignore plot failures but keep going to attempt calculation
-                    plot_data = None
-
-            raiz, tabla, iteraciones = falsa_posicion(funcion, (limite_inferior, limite_superior))
-            resultado = {'raiz': raiz, 'tabla': tabla, 'iteraciones': iteraciones}
+            from app.logic.falsa_posicion import falsa_posicion
+            raiz, traza, iteraciones = falsa_posicion(funcion, (limite_inferior, limite_superior), modo=modo)
+            resultado = {'raiz': raiz, 'traza': traza, 'iteraciones': iteraciones}
         except Exception as e:
             error = str(e)
-    return render_template('falsa_posicion.html', resultado=resultado, error=error, pasos=pasos,
-                           funcion=funcion, limite_inferior=limite_inferior, limite_superior=limite_superior,
-                           plot_data=plot_data)
+    return _respuesta_metodo_raices('falsa_posicion.html', resultado, error, pasos=pasos,
+                                    funcion=funcion, limite_inferior=limite_inferior, limite_superior=limite_superior,
+                                    plot_data=plot_data, intervalos=intervalos, modo=modo)
 
 
 @routes_bp.route('/falsa_posicion/preview', methods=['POST'])
 def falsa_posicion_preview():
-    try:
-        funcion = request.form.get('funcion', '').strip()
-        limite_inferior = request.form.get('limite_inferior', '').strip()
-        limite_superior = request.form.get('limite_superior', '').strip()
-        if not funcion:
-            return jsonify({'error': 'Función vacía'}), 400
-        plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=800)
-        return jsonify({'plot_data': plot_data})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _respuesta_vista_previa()
 
 @routes_bp.route('/newton', methods=['GET', 'POST'])
 def newton_view():
@@ -372,43 +589,36 @@ def newton_view():
     x0 = ''
     limite_inferior = ''
     limite_superior = ''
+    derivada = 'automatica'
     if request.method == 'POST':
         try:
             funcion = request.form.get('funcion', '').strip()
             x0 = request.form.get('x0', '').strip()
+            derivada = request.form.get('derivada', 'automatica')
             limite_inferior = request.form.get('limite_inferior', '').strip()
             limite_superior = request.form.get('limite_superior', '').strip()
             preview_image_b64 = request.form.get('preview_image', '')
             if preview_image_b64:
                 plot_data = preview_image_b64
-            else:
+            elif not _pide_json():
                 try:
                     plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=401)
                 except Exception:
                     plot_data = None
 
             from app.logic.newton_raphson import newton_raphson as _newton
-            raiz, tabla, iteraciones, f_en_raiz = _newton(funcion, x0)
-            resultado = {'raiz': raiz, 'tabla': tabla, 'iteraciones': iteraciones, 'f_en_raiz': f_en_raiz}
+            raiz, traza, iteraciones, f_en_raiz = _newton(funcion, x0, derivada=derivada)
+            resultado = {'raiz': raiz, 'traza': traza, 'iteraciones': iteraciones, 'f_en_raiz': f_en_raiz}
         except Exception as e:
             error = str(e)
-    return render_template('newton_raphson.html', resultado=resultado, error=error, pasos=pasos,
-                           funcion=funcion, x0=x0, plot_data=plot_data,
-                           limite_inferior=limite_inferior, limite_superior=limite_superior)
+    return _respuesta_metodo_raices('newton_raphson.html', resultado, error, pasos=pasos,
+                                    funcion=funcion, x0=x0, plot_data=plot_data, derivada=derivada,
+                                    limite_inferior=limite_inferior, limite_superior=limite_superior)
 
 
 @routes_bp.route('/newton/preview', methods=['POST'])
 def newton_preview():
-    try:
-        funcion = request.form.get('funcion', '').strip()
-        limite_inferior = request.form.get('limite_inferior', '').strip()
-        limite_superior = request.form.get('limite_superior', '').strip()
-        if not funcion:
-            return jsonify({'error': 'Función vacía'}), 400
-        plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=800)
-        return jsonify({'plot_data': plot_data})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _respuesta_vista_previa()
 
 
 @routes_bp.route('/metodo_tangente', methods=['GET', 'POST'])
@@ -420,65 +630,70 @@ def metodo_tangente_view():
     funcion = ''
     limite_inferior = ''
     limite_superior = ''
+    intervalos = None
     if request.method == 'POST':
         try:
             funcion = request.form.get('funcion', '').strip()
             limite_inferior = request.form.get('limite_inferior', '').strip()
             limite_superior = request.form.get('limite_superior', '').strip()
-            preview_image_b64 = request.form.get('preview_image', '')
-
-            if preview_image_b64:
-                plot_data = preview_image_b64
-                if not limite_inferior or not limite_superior:
-                    try:
-                        li, ls = generar_grafico_por_defecto(funcion)
-                        limite_inferior = li
-                        limite_superior = ls
-                    except Exception:
-                        limite_inferior = '-1'
-                        limite_superior = '1'
-            else:
-                try:
-                    plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=401)
-                except Exception:
-                    plot_data = None
+            plot_data, limite_inferior, limite_superior, intervalos = _grafico_e_intervalo(
+                funcion, limite_inferior, limite_superior)
 
             from app.logic.metodo_tangente import metodo_tangente as _metodo_tangente
-            raiz, tabla, iteraciones, f_en_raiz = _metodo_tangente(funcion, limite_inferior, limite_superior)
-            resultado = {'raiz': raiz, 'tabla': tabla, 'iteraciones': iteraciones, 'f_en_raiz': f_en_raiz}
+            raiz, traza, iteraciones, f_en_raiz = _metodo_tangente(funcion, limite_inferior, limite_superior)
+            resultado = {'raiz': raiz, 'traza': traza, 'iteraciones': iteraciones, 'f_en_raiz': f_en_raiz}
         except Exception as e:
             error = str(e)
-    return render_template('metodo_tangente.html', resultado=resultado, error=error, pasos=pasos,
-                           funcion=funcion, limite_inferior=limite_inferior, limite_superior=limite_superior, plot_data=plot_data)
+    return _respuesta_metodo_raices('metodo_tangente.html', resultado, error, pasos=pasos,
+                                    funcion=funcion, limite_inferior=limite_inferior, limite_superior=limite_superior, plot_data=plot_data, intervalos=intervalos)
 
 
 @routes_bp.route('/metodo_tangente/preview', methods=['POST'])
 def metodo_tangente_preview():
-    try:
-        funcion = request.form.get('funcion', '').strip()
-        limite_inferior = request.form.get('limite_inferior', '').strip()
-        limite_superior = request.form.get('limite_superior', '').strip()
-        if not funcion:
-            return jsonify({'error': 'Función vacía'}), 400
-        plot_data = generate_preview_plot_for_function(funcion, limite_inferior, limite_superior, n_points=800)
-        return jsonify({'plot_data': plot_data})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _respuesta_vista_previa()
 
 @routes_bp.route('/rref', methods=['GET', 'POST'])
 def rref_view():
     resultado = None
     pasos = None
     error = None
+    detalle = request.form.get('detalle', 'completo')
     if request.method == 'POST':
         try:
             matriz = matriz_desde_formulario(request)
             validar_matriz(matriz)
-            matriz_reducida, pasos = rref(matriz)
+            matriz_reducida, pasos = rref(matriz, detalle=detalle)
             resultado = {'matriz': matriz_reducida}
         except Exception as e:
             error = str(e)
-    return render_template('rref.html', resultado=resultado, pasos=pasos, error=error)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('rref.html', resultado=resultado, pasos=pasos, paginacion=paginacion, error=error, detalle=detalle)
+
+@routes_bp.route('/lu', methods=['GET', 'POST'])
+def lu_view():
+    resultado = None
+    pasos = None
+    error = None
+    lado_derecho = ''
+    if request.method == 'POST':
+        try:
+            matriz = matriz_desde_formulario(request)
+            validar_matriz(matriz)
+            lado_derecho = request.form.get('lado_derecho', '').strip()
+            # una sola factorización sirve para B (varias columnas) y para la inversa (B = I)
+            lu, pasos = factorizar_lu(matriz, con_pasos=True)
+            resultado = {
+                'P': lu.P,
+                'L': matriz_a_str(lu.L),
+                'U': matriz_a_str(lu.U),
+                'det': fraccion_str(lu.determinante()),
+                'inversa': None if lu.es_singular else matriz_a_str(lu.inversa()),
+                'X': matriz_a_str(lu.resolver(matriz_desde_texto(lado_derecho))) if lado_derecho else None,
+            }
+        except Exception as e:
+            error = str(e)
+    pasos, paginacion = paginar_pasos(pasos)
+    return render_template('lu.html', resultado=resultado, pasos=pasos, paginacion=paginacion, error=error, lado_derecho=lado_derecho)
 
 @routes_bp.route('/todas_las_raices', methods=['GET', 'POST'])
 def todas_las_raices_view():
@@ -494,6 +709,7 @@ def todas_las_raices_view():
             if not funcion:
                 raise ValueError('Función vacía')
 
+            from app.logic.todas_las_raices import todas_las_raices
             raices, pasos_calc, fact_str, grado = todas_las_raices(funcion, solo_reales)
 
             # preparar resumen para la plantilla
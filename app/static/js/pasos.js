@@ -0,0 +1,99 @@
+// Carga por páginas los pasos que no se enviaron con el resultado (ver _pasos_paginados.html).
+// Cada paso se dibuja con el mismo marcado que la macro format_paso y las tablas de las plantillas.
+(function(){
+    function el(tag, clase, texto){
+        const n = document.createElement(tag);
+        if(clase) n.className = clase;
+        if(texto != null) n.textContent = texto;
+        return n;
+    }
+
+    function formatPaso(texto){
+        if(!texto) return null;
+        if(texto.indexOf('<') >= 0 && texto.indexOf('>') >= 0){
+            const span = el('span'); span.innerHTML = texto; return span;
+        }
+        const fila = el('div', 'pills-row');
+        const partes = texto.split(':');
+        if(partes.length > 1){
+            fila.appendChild(el('span', 'paso-prefix', partes[0] + ':'));
+            fila.appendChild(el('span', 'paso-rest', partes.slice(1).join(':')));
+        } else {
+            fila.appendChild(el('span', 'paso-rest', texto));
+        }
+        return fila;
+    }
+
+    function tabla(matriz, cabecera){
+        const t = el('table', 'matriz_resultado');
+        const columnas = matriz && matriz[0] ? matriz[0].length : 0;
+        if(cabecera === 'sistema' || cabecera === 'vacia'){
+            const tr = el('tr');
+            for(let i = 0; i < columnas; i++){
+                const esB = cabecera === 'sistema' && i === columnas - 1;
+                tr.appendChild(el('th', null, cabecera === 'vacia' ? '' : (esB ? 'b' : 'x' + (i + 1))));
+            }
+            t.appendChild(el('thead')).appendChild(tr);
+        }
+        const cuerpo = t.appendChild(el('tbody'));
+        (matriz || []).forEach(function(fila){
+            const tr = cuerpo.appendChild(el('tr'));
+            fila.forEach(function(celda){ tr.appendChild(el('td', null, celda)); });
+        });
+        return t;
+    }
+
+    function iniciar(contenedor){
+        const lista = contenedor.previousElementSibling;
+        const estado = contenedor.querySelector('.pasos-cargar-estado');
+        const boton = contenedor.querySelector('.pasos-cargar-boton');
+        const cabecera = contenedor.dataset.cabecera;
+        const limite = contenedor.dataset.limite;
+        let siguiente = Number(contenedor.dataset.siguiente);
+        let cargando = false;
+        let observador = null;
+
+        async function cargar(){
+            if(cargando || siguiente == null) return;
+            cargando = true; boton.disabled = true;
+            try{
+                const r = await fetch(contenedor.dataset.url + '?offset=' + siguiente + '&limit=' + limite);
+                const datos = await r.json();
+                if(!r.ok){ estado.textContent = datos.error || 'No se pudieron cargar los pasos.'; siguiente = null; }
+                else {
+                    datos.pasos.forEach(function(paso){
+                        const li = el('li');
+                        const texto = formatPaso(paso.descripcion);
+                        if(texto) li.appendChild(texto);
+                        // la tabla vacía de independencia lineal se dibuja igual que en la plantilla
+                        if(paso.matriz || cabecera === 'vacia') li.appendChild(tabla(paso.matriz, cabecera));
+                        lista.appendChild(li);
+                    });
+                    siguiente = datos.siguiente;
+                    const mostrados = siguiente == null ? datos.total : siguiente;
+                    estado.textContent = 'Mostrando ' + mostrados + ' de ' + datos.total + ' pasos';
+                }
+            }catch(e){
+                estado.textContent = 'No se pudieron cargar los pasos.';
+            }
+            cargando = false;
+            boton.disabled = false;
+            if(siguiente == null){
+                boton.hidden = true;
+                if(observador) observador.disconnect();
+            }
+        }
+
+        boton.addEventListener('click', cargar);
+        if('IntersectionObserver' in window){
+            observador = new IntersectionObserver(function(entradas){
+                if(entradas.some(function(e){ return e.isIntersecting; })) cargar();
+            }, {rootMargin: '400px'});
+            observador.observe(contenedor);
+        }
+    }
+
+    function todos(){ document.querySelectorAll('.pasos-cargar').forEach(iniciar); }
+    if(document.readyState === 'loading') document.addEventListener('DOMContentLoaded', todos);
+    else todos();
+})();
@@ -6,7 +6,7 @@
         if (s==null) return '';
         s = String(s).trim().replace(/\^/g,'**');
         s = s.replace(/\bsen\b/gi,'sin').replace(/\bln\b/gi,'log');
-        s = s.replace(/(?<=[0-9)])\s*(?=[A-Za-z(])/g,'*');
+        s = s.replace(/(?<![A-Za-z_0-9.])(\d+(?:\.\d*)?|\.\d+)\s*(?=[A-Za-z(])/g,'$1*').replace(/(?<=\))\s*(?=[A-Za-z(])/g,'*');
         return s;
     }
     function parseNumberString(s){ s=String(s||'').trim(); if(s==="") return NaN; if(/^[+-]?\d+\s*\/\s*[+-]?\d+$/.test(s)){const p=s.split('/');return Number(p[0])/Number(p[1]);}const v=Number(s); return isNaN(v)?NaN:v; }
@@ -39,9 +39,13 @@
         try{ const fun = new Function('x','with(Math){ return '+expr+' }'); return fun(x); }catch(e){ return NaN; }
     }
 
+    // previews already received from the server, keyed by request body; revalidated with ETag/If-None-Match
+    const serverPreviews = {};
     async function serverPreviewRequest(previewUrl){
         const form = new FormData(); form.append('funcion', by('funcion').value||''); form.append('limite_inferior', by('limite_inferior').value||''); form.append('limite_superior', by('limite_superior').value||'');
-        try{ const r = await fetch(previewUrl || '/biseccion/preview',{method:'POST', body: form}); if(!r.ok){ const d = await r.json(); console.warn('server preview error',d); return null; } const d=await r.json(); return d.plot_data; }catch(e){ console.warn('server preview fetch failed',e); return null; }
+        const key = [previewUrl, form.get('funcion'), form.get('limite_inferior'), form.get('limite_superior')].join('\u0000');
+        const known = serverPreviews[key]; const headers = known ? {'If-None-Match': known.etag} : {};
+        try{ const r = await fetch(previewUrl || '/biseccion/preview',{method:'POST', body: form, headers: headers}); if(r.status===304 && known){ return known.plot_data; } if(!r.ok){ const d = await r.json(); console.warn('server preview error',d); return null; } const d=await r.json(); const etag = r.headers.get('ETag'); if(etag){ serverPreviews[key] = {etag: etag, plot_data: d.plot_data}; } return d.plot_data; }catch(e){ console.warn('server preview fetch failed',e); return null; }
     }
 
     async function makePreview(){
@@ -66,65 +66,199 @@ def matriz_desde_formulario(request, filas_name='filas', columnas_name='columnas
 
     return matriz
 
-def generate_preview_plot_for_function(funcion: str, limite_inferior: str = '', limite_superior: str = '', n_points: int = 800):
-    """Helper: genera plot PNG base64 para la función dada, intenta detectar crossing si límites vacíos."""
+def matriz_desde_texto(texto: str):
+    """
+    Construye una matriz a partir de texto pegado: una fila por línea (o separadas por ';') y
+    valores separados por espacios o comas. Los valores se leen como Fraction exactas, sin
+    pasar por float, para que los enteros grandes no pierdan precisión.
+    """
+    import re
+    from fractions import Fraction
+
+    filas = [f for f in re.split(r'[;\n]+', str(texto or '')) if f.strip()]
+    if not filas:
+        raise ValueError('La matriz está vacía')
+    matriz = []
+    for i, fila in enumerate(filas, start=1):
+        try:
+            matriz.append([Fraction(valor) for valor in re.split(r'[\s,]+', fila.strip())])
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f'Valor inválido en la fila {i}: use enteros, decimales o fracciones a/b')
+    return matriz
+
+
+class CacheVistasPrevias:
+    """
+    Cache en memoria de vistas previas ya renderizadas (PNG en base64).
+    Acotada por número de entradas (se descarta la menos usada) y por antigüedad (TTL en segundos).
+    """
+
+    def __init__(self, max_entradas: int = 128, ttl: float = 600.0):
+        from collections import OrderedDict
+        import threading
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obtener(self, clave):
+        import time
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None or time.monotonic() - entrada[0] > self.ttl:
+                if entrada is not None:
+                    del self._datos[clave]
+                self.misses += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return entrada[1]
+
+    def guardar(self, clave, valor):
+        import time
+        with self._lock:
+            self._datos[clave] = (time.monotonic(), valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+
+_cache_vistas_previas = CacheVistasPrevias()
+
+# se incluye en el ETag para invalidar las vistas previas de los clientes si cambia el renderizado
+_VERSION_VISTA_PREVIA = '2'
+
+
+def clave_vista_previa(funcion: str, limite_inferior: str = '', limite_superior: str = '', n_points: int = 800):
+    """Clave normalizada (expresión transformada, límites como float o None, resolución)."""
+    import ast
+    from app.logic.utils import parse_input_number, transformar_sintaxis
+    expr = transformar_sintaxis(funcion)
+    try:
+        # forma canónica: 'x ^ 2-2' y 'x**2 - 2' comparten entrada
+        expr = ast.unparse(ast.parse(expr, mode='eval'))
+    except SyntaxError:
+        pass
+    a = parse_input_number(limite_inferior) if limite_inferior != '' else None
+    b = parse_input_number(limite_superior) if limite_superior != '' else None
+    return (expr, a, b, int(n_points))
+
+
+def etag_vista_previa(funcion: str, limite_inferior: str = '', limite_superior: str = '', n_points: int = 800) -> str:
+    """ETag estable para la vista previa: sólo depende de la clave normalizada."""
+    import hashlib
+    clave = clave_vista_previa(funcion, limite_inferior, limite_superior, n_points)
+    return hashlib.sha1(repr((_VERSION_VISTA_PREVIA, clave)).encode('utf-8')).hexdigest()
+
+
+# Sin límites la gráfica muestra [-5, 5] (acercándose al primer cruce) y la detección del
+# intervalo de partida recorre [-10, 10] con 800 muestras, como antes de MuestreoFuncion.
+VENTANA_GRAFICO = (-5.0, 5.0)
+VENTANA_DETECCION = (-10.0, 10.0)
+MUESTRAS_DETECCION = 800
+
+
+class MuestreoFuncion:
+    """
+    Muestreo de f(x) compartido por la detección de intervalo y la gráfica de una misma petición.
+
+    El muestreo es perezoso y se hace una sola vez (evaluación vectorizada): de él salen la
+    estimación del cruce, todos los intervalos [xᵢ, xᵢ₊₁] donde f cambia de signo y la serie a
+    graficar. Si los límites vienen vacíos se usa la ventana [a_defecto, b_defecto].
+    """
+
+    def __init__(self, funcion: str, limite_inferior: str = '', limite_superior: str = '', n_points: int = 800,
+                 a_defecto: float = VENTANA_GRAFICO[0], b_defecto: float = VENTANA_GRAFICO[1], pad: float = 2.0):
+        from app.logic.utils import parse_input_number
+        self.funcion = funcion
+        self.n_points = n_points
+        self.pad = pad
+        self.limites_vacios = limite_inferior == '' or limite_superior == ''
+        a = parse_input_number(limite_inferior) if limite_inferior != '' else None
+        b = parse_input_number(limite_superior) if limite_superior != '' else None
+        if a is None or b is None or a == b:
+            a = a_defecto if a is None else a
+            b = b_defecto if b is None else b
+        self.a = a
+        self.b = b
+        self._muestras = None
+        self._serie_zoom = None
+
+    def _muestrear(self, a, b):
+        import numpy as np
+        from app.logic.evaluacion_vectorizada import evaluar_vectorizado
+        xs = np.linspace(a, b, self.n_points)
+        return xs, evaluar_vectorizado(self.funcion, xs)
+
+    @property
+    def muestras(self):
+        """(xs, ys) sobre el intervalo de trabajo; se calcula en el primer acceso."""
+        if self._muestras is None:
+            from app.logic.evaluacion_vectorizada import cambios_de_signo
+            xs, ys = self._muestrear(self.a, self.b)
+            self._muestras = (xs, ys, cambios_de_signo(ys))
+        return self._muestras[0], self._muestras[1]
+
+    @property
+    def cruce(self):
+        """Primer cero estimado por interpolación lineal, o None si f no cambia de signo."""
+        from app.logic.evaluacion_vectorizada import estimar_cruce
+        xs, ys = self.muestras
+        indices = self._muestras[2]
+        if not indices.size:
+            return None
+        return estimar_cruce(xs, ys, int(indices[0]))
+
+    @property
+    def intervalos(self):
+        """Todos los intervalos de la malla con cambio de signo, como (a, b) en float."""
+        xs, _ = self.muestras
+        return [(float(xs[i]), float(xs[i + 1])) for i in self._muestras[2]]
+
+    def intervalo_automatico(self):
+        """Primer intervalo con cambio de signo como strings de formulario; ('-1', '1') si no hay."""
+        intervalos = self.intervalos
+        if not intervalos:
+            return '-1', '1'
+        a, b = intervalos[0]
+        return format(a, '.12g'), format(b, '.12g')
+
+    def serie_grafico(self):
+        """(xs, ys) a graficar: si no había límites se acerca a ±pad alrededor del primer cruce."""
+        if self.limites_vacios and self.cruce is not None:
+            if self._serie_zoom is None:
+                self._serie_zoom = self._muestrear(self.cruce - self.pad, self.cruce + self.pad)
+            return self._serie_zoom
+        return self.muestras
+
+
+def generate_preview_plot_for_function(funcion: str, limite_inferior: str = '', limite_superior: str = '', n_points: int = 800,
+                                       muestreo: 'MuestreoFuncion' = None):
+    """Helper: genera plot PNG base64 para la función dada, intenta detectar crossing si límites vacíos.
+    El resultado se guarda en una cache compartida por todas las rutas (ver `CacheVistasPrevias`).
+    Si se pasa `muestreo` se reutilizan sus muestras en lugar de volver a evaluar la función."""
+    clave = clave_vista_previa(funcion, limite_inferior, limite_superior, n_points)
+    plot_data = _cache_vistas_previas.obtener(clave)
+    if plot_data is None:
+        if muestreo is None:
+            muestreo = MuestreoFuncion(funcion, limite_inferior, limite_superior, n_points=n_points)
+        plot_data = _renderizar_vista_previa(*muestreo.serie_grafico())
+        _cache_vistas_previas.guardar(clave, plot_data)
+    return plot_data
+
+
+def _renderizar_vista_previa(xs, ys):
     from io import BytesIO
     import base64
-    import math
     import matplotlib
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
-    from app.logic.biseccion import evaluar
-    from app.logic.utils import parse_input_number
-
-    # parse limits if provided
-    a = None
-    b = None
-    if limite_inferior != '':
-        a = parse_input_number(limite_inferior)
-    if limite_superior != '':
-        b = parse_input_number(limite_superior)
-
-    if a is None or b is None or a == b:
-        a = -5.0 if a is None else a
-        b = 5.0 if b is None else b
-
-    xs = [a + i * (b - a) / (n_points - 1) for i in range(n_points)]
-    ys = []
-    for x in xs:
-        try:
-            ys.append(evaluar(funcion, x))
-        except Exception:
-            ys.append(float('nan'))
-
-    # detect crossing and zoom if limits were empty
-    crossing = None
-    for i in range(len(xs)-1):
-        y1 = ys[i]
-        y2 = ys[i+1]
-        if not (isinstance(y1, float) and isinstance(y2, float)):
-            continue
-        if math.isnan(y1) or math.isnan(y2):
-            continue
-        if y1 * y2 <= 0:
-            try:
-                frac = abs(y1) / (abs(y1) + abs(y2)) if (abs(y1) + abs(y2)) != 0 else 0.5
-                crossing = xs[i] + (xs[i+1] - xs[i]) * frac
-                break
-            except Exception:
-                crossing = xs[i]
-                break
-
-    if crossing is not None and (limite_inferior == '' or limite_superior == ''):
-        a = crossing - 2
-        b = crossing + 2
-        xs = [a + i * (b - a) / (n_points - 1) for i in range(n_points)]
-        ys = []
-        for x in xs:
-            try:
-                ys.append(evaluar(funcion, x))
-            except Exception:
-                ys.append(float('nan'))
 
     fig, ax = plt.subplots(figsize=(8, 3.5))
     ax.axhline(0, color='black', linewidth=0.8)
@@ -148,35 +282,89 @@ def generate_preview_plot_for_function(funcion: str, limite_inferior: str = '',
     return plot_data
 
 
-# New helper: detecta intervalos razonables cuando no vienen límites
-def generar_grafico_por_defecto(funcion: str, a: float = -10.0, b: float = 10.0, n: int = 800, pad: float = 2.0):
-    """Muestra la misma lógica de muestreo que la generación de preview pero sólo devuelve límites.
+# pasos que se envían con la página; el resto se pide a /pasos/<id> al hacer scroll
+PASOS_POR_PAGINA = 20
+_MAX_PASOS_POR_PETICION = 200
 
-    Devuelve (limite_inferior_str, limite_superior_str). Si no encuentra cruce devuelve ('-1','1').
+
+class AlmacenPasos:
     """
-    try:
-        from app.logic.biseccion import evaluar
-        import math
-        xs = [a + i * (b - a) / (n - 1) for i in range(n)]
-        ys = []
-        for x in xs:
-            try:
-                ys.append(evaluar(funcion, x))
-            except Exception:
-                ys.append(float('nan'))
-        crossing = None
-        for i in range(n - 1):
-            y1 = ys[i]; y2 = ys[i + 1]
-            if not (isinstance(y1, float) and isinstance(y2, float)):
-                continue
-            if math.isnan(y1) or math.isnan(y2):
-                continue
-            if y1 * y2 <= 0:
-                frac = abs(y1) / (abs(y1) + abs(y2)) if (abs(y1) + abs(y2)) != 0 else 0.5
-                crossing = xs[i] + (xs[i + 1] - xs[i]) * frac
-                break
-        if crossing is not None:
-            return str(crossing - pad), str(crossing + pad)
-        return '-1', '1'
-    except Exception:
-        return '-1', '1'
+    Registros de pasos ya calculados, guardados en el servidor bajo un id aleatorio para servirlos
+    por páginas. Acotado por número de entradas (LRU) y por antigüedad (TTL en segundos). Un
+    mismo objeto de pasos (p. ej. un resultado de la cache de factorizaciones) reutiliza su id.
+    """
+
+    def __init__(self, max_entradas: int = 64, ttl: float = 1800.0):
+        from collections import OrderedDict
+        import threading
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def guardar(self, pasos) -> str:
+        import secrets
+        import time
+        with self._lock:
+            clave = self._ids.get(id(pasos))
+            if clave is None:
+                clave = secrets.token_urlsafe(12)
+                self._ids[id(pasos)] = clave
+            self._datos[clave] = (time.monotonic(), pasos)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                _, (_, descartados) = self._datos.popitem(last=False)
+                self._ids.pop(id(descartados), None)
+            return clave
+
+    def obtener(self, clave):
+        import time
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            if time.monotonic() - entrada[0] > self.ttl:
+                del self._datos[clave]
+                self._ids.pop(id(entrada[1]), None)
+                return None
+            self._datos.move_to_end(clave)
+            return entrada[1]
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self._ids.clear()
+
+
+_almacen_pasos = AlmacenPasos()
+
+
+def paginar_pasos(pasos, limite: int = PASOS_POR_PAGINA):
+    """
+    Devuelve (primera_pagina, paginacion). Si hay más de `limite` pasos, el registro completo se
+    guarda en el servidor y paginacion = {'id', 'total', 'siguiente', 'limite'} para que la
+    plantilla pida el resto; si no, paginacion es None y primera_pagina son todos los pasos.
+    """
+    if not pasos or len(pasos) <= limite:
+        return pasos, None
+    clave = _almacen_pasos.guardar(pasos)
+    return list(pasos[:limite]), {'id': clave, 'total': len(pasos), 'siguiente': limite, 'limite': limite}
+
+
+def pagina_pasos(clave: str, offset: int = 0, limite: int = PASOS_POR_PAGINA):
+    """Página de pasos como dict serializable, o None si el id no existe o caducó."""
+    pasos = _almacen_pasos.obtener(clave)
+    if pasos is None:
+        return None
+    offset = max(0, offset)
+    limite = max(1, min(limite, _MAX_PASOS_POR_PETICION))
+    pagina = []
+    for paso in pasos[offset:offset + limite]:
+        if isinstance(paso, (list, tuple)):
+            pagina.append({'descripcion': paso[0], 'matriz': paso[1]})
+        else:
+            pagina.append({'descripcion': str(paso), 'matriz': None})
+    siguiente = offset + len(pagina)
+    return {'total': len(pasos), 'offset': offset, 'pasos': pagina,
+            'siguiente': siguiente if siguiente < len(pasos) else None}
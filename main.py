@@ -1,4 +1,8 @@
+import os
+import threading
+
 from flask import Flask
+from app import precargar_dependencias
 from app.routes import routes_bp
 
 app = Flask(__name__,
@@ -7,5 +11,11 @@ app = Flask(__name__,
 
 app.register_blueprint(routes_bp)
 
+# SymPy, NumPy y matplotlib se cargan al primer uso de la ruta que los necesita.
+# Con ALGEBRAX_PRECARGAR=1 se importan en segundo plano al arrancar, sin retrasar las
+# primeras peticiones a las páginas que no los usan.
+if os.environ.get('ALGEBRAX_PRECARGAR') == '1':
+    threading.Thread(target=precargar_dependencias, name='precarga', daemon=True).start()
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
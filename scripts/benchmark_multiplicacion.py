@@ -0,0 +1,61 @@
+"""
+Benchmark del motor de multiplicación: compara el triple bucle original con los métodos
+"filas", "bloques" y "strassen" de app/logic/multiplicacion.py sobre matrices cuadradas
+aleatorias enteras y racionales. Sirve para ajustar _UMBRAL_BLOQUES, _UMBRAL_STRASSEN y
+_CORTE_STRASSEN.
+
+Uso (desde la raíz del proyecto):
+    python scripts/benchmark_multiplicacion.py
+    python scripts/benchmark_multiplicacion.py 64 128 256
+"""
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from app.logic.multiplicacion import multiplicar  # noqa: E402
+
+TAMANOS = (32, 64, 128, 256)
+METODOS = ("filas", "bloques", "strassen")
+# el triple bucle se omite por encima de este tamaño (tarda minutos)
+_MAX_INGENUO = 128
+
+
+def ingenuo(A, B):
+    resultado = [[0] * len(B[0]) for _ in A]
+    for i in range(len(A)):
+        for j in range(len(B[0])):
+            for k in range(len(B)):
+                resultado[i][j] += A[i][k] * B[k][j]
+    return resultado
+
+
+def matriz_aleatoria(n, racional):
+    if racional:
+        return [[Fraction(random.randint(-9, 9), random.randint(1, 6)) for _ in range(n)] for _ in range(n)]
+    return [[random.randint(-99, 99) for _ in range(n)] for _ in range(n)]
+
+
+def medir(funcion, *args):
+    t0 = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - t0
+
+
+def main(tamanos):
+    print(f"{'Entradas':<10}{'n':>6}{'ingenuo':>11}" + "".join(f"{m:>11}" for m in METODOS))
+    for racional in (False, True):
+        for n in tamanos:
+            A, B = matriz_aleatoria(n, racional), matriz_aleatoria(n, racional)
+            tiempos = [medir(ingenuo, A, B) if n <= _MAX_INGENUO else None]
+            tiempos += [medir(multiplicar, A, B, metodo) for metodo in METODOS]
+            celdas = "".join(f"{t:>9.3f} s" if t is not None else f"{'-':>11}" for t in tiempos)
+            print(f"{'Fraction' if racional else 'int':<10}{n:>6}{celdas}")
+
+
+if __name__ == '__main__':
+    main([int(n) for n in sys.argv[1:]] or TAMANOS)
@@ -0,0 +1,65 @@
+"""
+Reporte del costo de arranque: para cada ruta, en un intérprete nuevo, mide cuánto tarda
+`import main`, cuánto tarda la primera petición y qué dependencias pesadas quedan cargadas.
+
+Uso (desde la raíz del proyecto):
+    python scripts/reporte_importacion.py
+    python scripts/reporte_importacion.py /rref /todas_las_raices
+"""
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADOS = ('sympy', 'numpy', 'matplotlib', 'tabulate')
+
+# ruta -> datos del formulario (None = GET)
+ESCENARIOS = {
+    '/': None,
+    '/traspuesta': None,
+    '/operaciones_matrices': None,
+    '/biseccion': {'funcion': 'x^3 - x - 2', 'limite_inferior': '1', 'limite_superior': '2'},
+    '/newton': {'funcion': 'x^3 - x - 2', 'x0': '1.5'},
+    '/todas_las_raices': {'funcion': 'x^3 - x - 2'},
+}
+
+_MEDICION = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+al_arrancar = [m for m in %(pesados)r if m in sys.modules]
+ruta, datos = sys.argv[1], json.loads(sys.argv[2])
+cliente = main.app.test_client()
+respuesta = cliente.post(ruta, data=datos) if datos is not None else cliente.get(ruta)
+t2 = time.perf_counter()
+print(json.dumps({
+    'import': t1 - t0,
+    'peticion': t2 - t1,
+    'estado': respuesta.status_code,
+    'arranque': al_arrancar,
+    'cargados': [m for m in %(pesados)r if m in sys.modules],
+}))
+"""
+
+
+def medir(ruta, datos):
+    codigo = _MEDICION % {'pesados': PESADOS}
+    entorno = dict(os.environ)
+    entorno.pop('ALGEBRAX_PRECARGAR', None)
+    salida = subprocess.run([sys.executable, '-c', codigo, ruta, json.dumps(datos)], cwd=RAIZ, env=entorno,
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main(rutas):
+    print(f"{'Ruta':<24}{'import main':>13}{'1ª petición':>13}{'HTTP':>6}  Cargado al arrancar / tras la petición")
+    for ruta in rutas:
+        r = medir(ruta, ESCENARIOS.get(ruta))
+        print(f"{ruta:<24}{r['import'] * 1000:>10.0f} ms{r['peticion'] * 1000:>10.0f} ms{r['estado']:>6}  "
+              f"{', '.join(r['arranque']) or '-'} / {', '.join(r['cargados']) or '-'}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or list(ESCENARIOS))
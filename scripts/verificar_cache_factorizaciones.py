@@ -0,0 +1,50 @@
+"""
+Comprobaciones de la cache de factorizaciones: la clave de cada función cacheada debe usar la
+misma conversión de elementos que la función, para que una entrada decimal (formulario de
+celdas, float) y una exacta (panel de texto, Fraction) que dan resultados distintos no
+compartan resultado.
+
+Uso (desde la raíz del proyecto):
+    python scripts/verificar_cache_factorizaciones.py
+"""
+import os
+import sys
+from fractions import Fraction
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from app.logic.cache_factorizaciones import _cache  # noqa: E402
+from app.logic.gauss_jordan import gauss_jordan  # noqa: E402
+from app.logic.independencia_lineal import comprobar_independencia_lineal  # noqa: E402
+from app.logic.rref import rref  # noqa: E402
+
+# 0.1234567891 como float se aproxima con denominador <= 10**6; como Fraction es exacto
+DECIMAL = 0.1234567891
+EXACTO = Fraction('0.1234567891')
+
+
+def comprobar(funcion, matriz, **kwargs):
+    """funcion(matriz(x)) con x decimal y exacto, en los dos órdenes: con cache debe dar lo mismo que sin ella."""
+    fallos = 0
+    for primero, segundo in ((DECIMAL, EXACTO), (EXACTO, DECIMAL)):
+        _cache.limpiar()
+        cacheados = [funcion(matriz(x), **kwargs)[0] for x in (primero, segundo)]
+        directos = [funcion.sin_cache(matriz(x), **kwargs)[0] for x in (primero, segundo)]
+        if cacheados != directos:
+            fallos += 1
+            print(f"FALLO {funcion.__name__} ({type(primero).__name__} primero): {cacheados} != {directos}")
+    return fallos
+
+
+def main():
+    sistema = lambda x: [[x, 1, 1], [1, 1, 2]]  # noqa: E731
+    fallos = comprobar(gauss_jordan, sistema, detalle="ninguno")
+    fallos += comprobar(rref, sistema, detalle="ninguno")
+    fallos += comprobar(comprobar_independencia_lineal, lambda x: [[x, 1], [1, 1]], detalle="ninguno")
+    print("cache de factorizaciones:", "con fallos" if fallos else "ok")
+    return fallos
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main() else 0)